@@ -0,0 +1,92 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from info_provider.configuration import Configuration
+from info_provider.storm_space_info_builder import SpaceInfoBuilder
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_TEMPLATE = os.path.join(SRC_DIR, "tests", "resources", "storm.def")
+
+def create_configuration(directory, num_sa, num_vo):
+    # the test configuration with num_sa storage areas shared by num_vo VOs
+    vos = ["vo%d.example.org" % i for i in range(num_vo)]
+    sas = ["sa-%d" % i for i in range(num_sa)]
+    filepath = os.path.join(directory, "storm-%d.def" % num_sa)
+    out = open(filepath, 'w')
+    for line in open(CONFIG_TEMPLATE):
+        if line.startswith("STORM_STORAGEAREA_LIST="):
+            line = "STORM_STORAGEAREA_LIST='%s'\n" % " ".join(sas)
+        elif line.startswith("VOS="):
+            line = "VOS='%s'\n" % " ".join(vos)
+        out.write(line)
+    for (i, sa) in enumerate(sas):
+        name = "STORM_SA%d_" % i
+        out.write(name + "ONLINE_SIZE=%d\n" % (i % 10 + 1))
+        out.write(name + "VONAME=%s\n" % vos[i % num_vo])
+        if i % 3 == 0:
+            out.write(name + "STORAGECLASS=T1D0\n")
+            out.write(name + "NEARLINE_SIZE=%d\n" % (i % 7 + 1))
+        if i % 5 == 0:
+            out.write(name + "ACCESSPOINT=/%s /alias-%d\n" % (sa, i))
+            out.write(name + "DN_O_REGEX=INFN\n")
+    out.close()
+    return filepath
+
+def read_getters(configuration):
+    for sa in configuration.get_storage_area_list():
+        configuration.get_sa_token(sa)
+        configuration.get_sa_vos(sa)
+        configuration.get_sa_root(sa)
+        configuration.get_sa_class(sa)
+        configuration.get_sa_accesspoints(sa)
+        configuration.get_sa_retention_policy(sa)
+        configuration.get_sa_access_latency(sa)
+        configuration.get_sa_approachable_rules(sa)
+    configuration.get_used_VOs()
+
+def load(filepath, snapshot=False):
+    # parse the file and derive the storage area records and sizes
+    configuration = Configuration(filepath, snapshot=snapshot)
+    configuration.get_sa_records()
+    configuration.get_online_size()
+    return configuration
+
+def measure(function, repeat):
+    start = time.time()
+    for _ in range(repeat):
+        function()
+    return (time.time() - start) / repeat
+
+def run(sizes, num_vo, repeat):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        print "%10s %12s %12s %12s %12s" % ("SAs", "load", "snapshot", "getters",
+            "space info")
+        for num_sa in sizes:
+            filepath = create_configuration(tmpdir, num_sa, num_vo)
+            configuration = Configuration(filepath)
+            configuration.set("STORM_SERVING_STATE", "closed")
+            parse = measure(lambda: load(filepath), repeat)
+            # the first load writes the snapshot
+            load(filepath, snapshot=True)
+            snapshot = measure(lambda: load(filepath, snapshot=True), repeat)
+            getters = measure(lambda: read_getters(configuration), repeat)
+            builder = SpaceInfoBuilder(configuration, None)
+            spaceinfo = measure(builder.build, repeat)
+            print "%10d %12.4f %12.4f %12.4f %12.4f" % (num_sa, parse, snapshot,
+                getters, spaceinfo)
+    finally:
+        shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Configuration benchmark (seconds per run)')
+    parser.add_argument('-s', action='store', dest='sizes', default="100,1000,3000",
+        help='comma separated numbers of storage areas')
+    parser.add_argument('-v', action='store', dest='num_vo', type=int, default=20)
+    parser.add_argument('-n', action='store', dest='repeat', type=int, default=3)
+    arguments = parser.parse_args()
+    run([int(size) for size in arguments.sizes.split(",")], arguments.num_vo,
+        arguments.repeat)
@@ -0,0 +1,36 @@
+import argparse
+import time
+
+from info_provider.storm_gateway import StormGateway
+from tests.mock_backend import MockBackend
+
+MODES = [
+    ("per-token, sequential", False, {"max_workers": 1}),
+    ("per-token, 4 workers", False, {"max_workers": 4}),
+    ("per-token, 4 workers, pool", False, {"max_workers": 4, "pool_size": 4}),
+    ("bulk", True, {"bulk_status": True}),
+    ("bulk, pool", True, {"bulk_status": True, "pool_size": 4}),
+]
+
+def run(latency, repeat):
+    print "%-30s %10s %10s" % ("mode", "requests", "sec/run")
+    for (label, bulk, options) in MODES:
+        backend = MockBackend(latency=latency, bulk=bulk).start()
+        try:
+            gateway = StormGateway(backend.get_endpoint(), **options)
+            start = time.time()
+            for _ in range(repeat):
+                gateway.get_vfs_list_with_status()
+            elapsed = (time.time() - start) / repeat
+            gateway.close()
+            print "%-30s %10d %10.3f" % (label, len(backend.requests) / repeat, elapsed)
+        finally:
+            backend.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='StormGateway status retrieval benchmark')
+    parser.add_argument('-l', action='store', dest='latency', type=float, default=0.2,
+        help='seconds of latency added by the mock backend to each response')
+    parser.add_argument('-n', action='store', dest='repeat', type=int, default=3)
+    arguments = parser.parse_args()
+    run(arguments.latency, arguments.repeat)
@@ -0,0 +1,74 @@
+import argparse
+import time
+
+from StringIO import StringIO
+
+from info_provider.utils.ldap_utils import LDIFStreamWriter, LDIFExporter, LDIFNode
+
+def create_exporter(num_nodes):
+    # GLUE-like nodes: a few long DNs and multi-valued attributes each
+    exporter = LDIFExporter()
+    for i in range(num_nodes):
+        dn = "GlueSALocalID=sa-%d:replica:online,GlueSEUniqueID=storm.example.org," \
+            "mds-vo-name=resource,o=grid" % i
+        node = LDIFNode(dn, {
+            "objectClass": ["GlueSETop", "GlueSA", "GlueSAAccessControlBase",
+                "GlueSchemaVersion", "GlueKey"],
+            "GlueSALocalID": ["sa-%d:replica:online" % i],
+            "GlueSAName": ["Reserved space for sa-%d" % i],
+            "GlueSAPath": ["/storage/sa-%d" % i],
+            "GlueSAAccessControlBaseRule": ["VO:vo%d.example.org" % j for j in range(5)],
+            "GlueChunkKey": ["GlueSEUniqueID=storm.example.org"],
+            "GlueSchemaVersionMajor": ["1"],
+            "GlueSchemaVersionMinor": ["3"]})
+        node.add({"GlueSATotalOnlineSize": i * 1000, "GlueSAUsedOnlineSize": i * 10,
+            "GlueSAFreeOnlineSize": i * 990})
+        exporter.add_node(node)
+    return exporter
+
+def write_python_ldap(exporter):
+    from ldif import LDIFWriter
+    stream = StringIO()
+    writer = LDIFWriter(stream, cols=512)
+    for node in exporter.nodes:
+        writer.unparse(node["dn"], node["entries"])
+    return stream.getvalue()
+
+def write_builtin(exporter):
+    stream = StringIO()
+    writer = LDIFStreamWriter(stream, cols=512)
+    for node in exporter.nodes:
+        writer.unparse(node["dn"], node["entries"])
+    writer.flush()
+    return stream.getvalue()
+
+def measure(function, exporter, repeat):
+    start = time.time()
+    for _ in range(repeat):
+        output = function(exporter)
+    return ((time.time() - start) / repeat, output)
+
+def run(sizes, repeat):
+    try:
+        import ldif
+    except ImportError:
+        ldif = None
+    print "%10s %12s %12s %10s" % ("nodes", "python-ldap", "built-in", "same")
+    for num_nodes in sizes:
+        exporter = create_exporter(num_nodes)
+        (builtin, output) = measure(write_builtin, exporter, repeat)
+        if ldif is None:
+            print "%10d %12s %12.4f %10s" % (num_nodes, "-", builtin, "-")
+            continue
+        (reference, expected) = measure(write_python_ldap, exporter, repeat)
+        # python-ldap 3 sorts the attributes of each record
+        same = sorted(output.split("\n")) == sorted(expected.split("\n"))
+        print "%10d %12.4f %12.4f %10s" % (num_nodes, reference, builtin, same)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='LDIF writers benchmark (seconds per run)')
+    parser.add_argument('-s', action='store', dest='sizes', default="1000,10000,50000",
+        help='comma separated numbers of nodes')
+    parser.add_argument('-n', action='store', dest='repeat', type=int, default=3)
+    arguments = parser.parse_args()
+    run([int(size) for size in arguments.sizes.split(",")], arguments.repeat)
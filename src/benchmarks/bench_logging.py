@@ -0,0 +1,65 @@
+import argparse
+import json
+import logging
+import time
+
+from info_provider.model.space import SpaceRecord
+from info_provider.utils.ldap_utils import LDIFNode
+from info_provider.utils.log_utils import lazy
+
+def create_node(i):
+    node = LDIFNode("GLUE2ShareID=storm.example.org/storage/share/sa-%d,o=glue" % i, {
+        "objectClass": ["GLUE2StorageShare", "GLUE2Share"],
+        "GLUE2StorageShareSharingID": ["dedicated"]})
+    node.init().add({"GLUE2StorageSharePath": "/storage/sa-%d" % i,
+        "GLUE2ShareOtherInfo": ["InfoProviderName=StoRM", "InfoProviderVersion=2"]})
+    return node
+
+def as_json(obj):
+    return json.dumps(obj, default=lambda o: o.__dict__, sort_keys=True, indent=4)
+
+def eager_node(node, space):
+    logging.debug("Added node " + str(node))
+
+def lazy_node(node, space):
+    logging.debug("Added node %s", node)
+
+def eager_json(node, space):
+    logging.debug("%s", as_json(space))
+
+def lazy_json(node, space):
+    logging.debug("%s", lazy(as_json, space))
+
+def no_logging(node, space):
+    pass
+
+CASES = [
+    ("no logging", no_logging),
+    ("eager node", eager_node),
+    ("lazy node", lazy_node),
+    ("eager json", eager_json),
+    ("lazy json", lazy_json),
+]
+
+def run(count, repeat):
+    # debug messages are dropped, as on production hosts
+    logging.getLogger().setLevel(logging.INFO)
+    nodes = [create_node(i) for i in range(count)]
+    space = SpaceRecord(total=1000, available=500, used=400, free=600,
+        unavailable=0, reserved=0, busy=0, near_line=0)
+    print "%-15s %12s" % ("case", "us/call")
+    for (name, function) in CASES:
+        start = time.time()
+        for _ in range(repeat):
+            for node in nodes:
+                function(node, space)
+        elapsed = (time.time() - start) / (repeat * count)
+        print "%-15s %12.3f" % (name, elapsed * 1000000)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Debug logging overhead at INFO level')
+    parser.add_argument('-c', action='store', dest='count', type=int, default=10000,
+        help='number of nodes')
+    parser.add_argument('-n', action='store', dest='repeat', type=int, default=5)
+    arguments = parser.parse_args()
+    run(arguments.count, arguments.repeat)
@@ -0,0 +1,61 @@
+import argparse
+import sys
+import time
+
+from info_provider.model.space import SpaceRecord, VirtualFileSystemRecord, \
+    ApproachableRule
+from info_provider.model.storage import StorageShare, StorageEndpoint
+
+def create_space():
+    return SpaceRecord(total=1000, available=500, used=400, free=600,
+        unavailable=0, reserved=0, busy=0, near_line=100)
+
+def create_rule():
+    return ApproachableRule(vo="test.vo")
+
+def create_vfs():
+    return VirtualFileSystemRecord(name="TESTVO_FS", token="TESTVO_TOKEN",
+        vos=["test.vo"], root="/storage/test.vo", storage_class="T0D1",
+        stfn_root=["/test.vo"], retention_policy="REPLICA",
+        access_latency="ONLINE", protocols=["file", "gsiftp"],
+        approachable_rules=[], space=None)
+
+def create_share():
+    return StorageShare(name="TESTVO_TOKEN", vo_list=["test.vo"], total_size=1000,
+        used_size=400, path=["/test.vo"], access_latency="online",
+        retention_policy="replica")
+
+def create_endpoint():
+    return StorageEndpoint(name="SRM_0", url="httpg://storm.example.org:8444/srm/managerv2",
+        type="srm", version="2.2", capabilities=['data.management.transfer'],
+        quality_level="production")
+
+CASES = [
+    ("SpaceRecord", create_space),
+    ("ApproachableRule", create_rule),
+    ("VirtualFileSystemRecord", create_vfs),
+    ("StorageShare", create_share),
+    ("StorageEndpoint", create_endpoint),
+]
+
+def get_size(obj):
+    # the object and its attribute dictionary, if any (values are shared)
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+def run(count):
+    print "%-25s %12s %14s" % ("class", "bytes/obj", "us/creation")
+    for (name, create) in CASES:
+        start = time.time()
+        objects = [create() for _ in xrange(count)]
+        elapsed = (time.time() - start) / count
+        print "%-25s %12d %14.3f" % (name, get_size(objects[0]), elapsed * 1000000)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Model objects memory and construction time')
+    parser.add_argument('-c', action='store', dest='count', type=int, default=100000,
+        help='number of objects per class')
+    arguments = parser.parse_args()
+    run(arguments.count)
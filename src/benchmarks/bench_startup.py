@@ -0,0 +1,78 @@
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from tests.mock_backend import MockBackend
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(SRC_DIR, "storm-info-provider")
+CONFIG_TEMPLATE = os.path.join(SRC_DIR, "tests", "resources", "storm.def")
+
+# runs the script as the BDII does, reporting how many modules were loaded
+WRAPPER = """
+import atexit, runpy, sys
+def report():
+    f = open(%r, 'w')
+    f.write(str(len(sys.modules)))
+    f.close()
+atexit.register(report)
+sys.argv = %r
+runpy.run_path(sys.argv[0], run_name='__main__')
+"""
+
+COMMANDS = [
+    ("get-update-ldif glue13", ["get-update-ldif", "-g", "glue13"]),
+    ("get-update-ldif glue2", ["get-update-ldif", "-g", "glue2"]),
+    ("get-report-json", ["get-report-json", "-o", os.devnull]),
+]
+
+def create_configuration(directory, endpoint):
+    (host, port) = endpoint[len("http://"):].split(":")
+    filepath = os.path.join(directory, "storm.def")
+    out = open(filepath, 'w')
+    for line in open(CONFIG_TEMPLATE):
+        if line.startswith("STORM_BACKEND_HOST="):
+            line = "STORM_BACKEND_HOST=%s\n" % host
+        elif line.startswith("STORM_BACKEND_REST_SERVICES_PORT="):
+            line = "STORM_BACKEND_REST_SERVICES_PORT=%s\n" % port
+        out.write(line)
+    out.write("STORM_INFO_PROVIDER_STATE_DIR=%s\n" % os.path.join(directory, "state"))
+    out.write("STORM_INFO_PROVIDER_CACHE_TTL=0\n")
+    out.close()
+    return filepath
+
+def measure(args, repeat):
+    start = time.time()
+    for _ in range(repeat):
+        devnull = open(os.devnull, 'w')
+        status = subprocess.call(args, cwd=SRC_DIR, stdout=devnull, stderr=devnull)
+        devnull.close()
+    return ((time.time() - start) / repeat, status)
+
+def run(repeat):
+    (interpreter, _) = measure([sys.executable, "-c", "pass"], repeat)
+    tmpdir = tempfile.mkdtemp()
+    backend = MockBackend().start()
+    try:
+        filepath = create_configuration(tmpdir, backend.get_endpoint())
+        counter = os.path.join(tmpdir, "modules")
+        print "%-25s %12s %10s %8s" % ("command", "ms/run", "modules", "status")
+        for (name, args) in COMMANDS:
+            argv = [SCRIPT, args[0], "-f", filepath] + args[1:]
+            (elapsed, status) = measure([sys.executable, "-c",
+                WRAPPER % (counter, argv)], repeat)
+            print "%-25s %12.1f %10s %8d" % (name, (elapsed - interpreter) * 1000,
+                open(counter).read(), status)
+    finally:
+        backend.stop()
+        shutil.rmtree(tmpdir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='storm-info-provider startup benchmark')
+    parser.add_argument('-n', action='store', dest='repeat', type=int, default=10)
+    arguments = parser.parse_args()
+    run(arguments.repeat)
@@ -1,6 +1,18 @@
+import cPickle
+import hashlib
 import logging
+import os
+from collections import namedtuple
 
 from info_provider.model.space import ApproachableRule
+from info_provider.utils.file_utils import write_file_atomically, read_file
+from info_provider.utils.log_utils import is_debug_enabled
+
+
+# per storage area settings, resolved once from the YAIM variables
+StorageAreaRecord = namedtuple("StorageAreaRecord", ["name", "short", "token",
+    "root", "storage_class", "vos", "accesspoints", "retention_policy",
+    "access_latency", "approachable_rules", "online_size", "nearline_size"])
 
 
 class Configuration:
@@ -17,12 +29,74 @@ class Configuration:
         "STORM_FRONTEND_PUBLIC_HOST", "STORM_BACKEND_REST_SERVICES_PORT",
         "VOS", "STORM_ENDPOINT_QUALITY_LEVEL"]
 
-    def __init__(self, filepath):
+    # bump when the content of the snapshot changes
+    SNAPSHOT_VERSION = 2
+
+    def __init__(self, filepath, snapshot=False):
         logging.debug("Init configuration from file %s ...", filepath)
-        self._configuration = self._load_configuration_from_file(filepath)
-        self._configuration_sanity_check()
+        self._sa_index = None
+        self._sizes = None
+        if snapshot:
+            self._load_configuration_with_snapshot(filepath)
+        else:
+            self._configuration = self._load_configuration_from_file(filepath)
+            self._configuration_sanity_check()
         return
 
+    def _get_snapshot_filepath(self, filepath):
+        (directory, filename) = os.path.split(os.path.abspath(filepath))
+        return os.path.join(directory, "." + filename + ".snapshot")
+
+    def _load_configuration_with_snapshot(self, filepath):
+        # the parsed variables and the storage area records are reused as
+        # long as the file content doesn't change
+        stat = os.stat(filepath)
+        mtime = stat.st_mtime
+        content = read_file(filepath)
+        digest = hashlib.sha1(content).hexdigest()
+        snapshot_filepath = self._get_snapshot_filepath(filepath)
+        snapshot = self._load_snapshot(snapshot_filepath)
+        if snapshot and snapshot["sha1"] == digest and snapshot["mtime"] == mtime:
+            logging.debug("Using configuration snapshot %s", snapshot_filepath)
+            self._configuration = snapshot["configuration"]
+            self._sa_index = snapshot["sa_index"]
+            self._sizes = snapshot["sizes"]
+            return
+        self._configuration = self._parse_configuration(content.splitlines(True))
+        self._configuration_sanity_check()
+        try:
+            self._get_sa_index()
+            self._get_sizes()
+        except (KeyError, ValueError), ex:
+            # raised again by the getters that need them
+            logging.debug("Unable to index storage areas: %s", ex)
+        self._save_snapshot(snapshot_filepath, {"version": self.SNAPSHOT_VERSION,
+            "sha1": digest, "mtime": mtime, "configuration": self._configuration,
+            "sa_index": self._sa_index, "sizes": self._sizes}, stat.st_mode & 0777)
+
+    def _load_snapshot(self, snapshot_filepath):
+        try:
+            snapshot = cPickle.loads(read_file(snapshot_filepath))
+        except IOError:
+            return None
+        except Exception, ex:
+            logging.warning("Ignoring invalid configuration snapshot %s: %s",
+                snapshot_filepath, ex)
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("version") != self.SNAPSHOT_VERSION:
+            return None
+        return snapshot
+
+    def _save_snapshot(self, snapshot_filepath, snapshot, mode):
+        # readable by the same users of the configuration file
+        try:
+            write_file_atomically(snapshot_filepath,
+                cPickle.dumps(snapshot, cPickle.HIGHEST_PROTOCOL), mode)
+        except (IOError, OSError), ex:
+            # e.g. the directory is not writable by the current user
+            logging.debug("Unable to save configuration snapshot %s: %s",
+                snapshot_filepath, ex)
+
     def _clear_quotes(self, s):
         return s.replace('\"', '').replace("\'", '')
 
@@ -30,14 +104,17 @@ class Configuration:
         return s.replace("\n", '')
 
     def _load_configuration_from_file(self, filepath):
-        out = {}
         try:
             f = open(filepath, 'r')
-            for line in f:
-                (key, val) = line.split('=', 1)
-                out[key] = self._clear_quotes(self._clear_newlines(val.strip()))
+            return self._parse_configuration(f)
         finally:
             f.close()
+
+    def _parse_configuration(self, lines):
+        out = {}
+        for line in lines:
+            (key, val) = line.split('=', 1)
+            out[key] = self._clear_quotes(self._clear_newlines(val.strip()))
         return out
 
     def _configuration_sanity_check(self):
@@ -47,6 +124,8 @@ class Configuration:
                 raise ValueError("Configuration error: Missing mandatory %s variable!" % key)
 
     def print_configuration(self):
+        if not is_debug_enabled():
+            return
         logging.debug("##############################################")
         logging.debug("##             CONFIGURATION                ##")
         logging.debug("##############################################")
@@ -57,8 +136,96 @@ class Configuration:
     def get(self, key):
         return self._configuration[key]
 
+    def _get_or_default(self, key, default):
+        if key in self._configuration:
+            return self.get(key)
+        return default
+
     def set(self, key, value):
         self._configuration[key] = value
+        # storage area records and sizes may depend on the changed variable
+        if self._sa_index is None or key in ("VOS", "STORM_STORAGEAREA_LIST",
+            "STORM_DEFAULT_ROOT") or key.startswith(self._sa_index["prefixes"]):
+            self._sa_index = None
+            self._sizes = None
+
+    def _get_sa_index(self):
+        if self._sa_index is None:
+            self._sa_index = self._build_sa_index()
+        return self._sa_index
+
+    def _build_sa_index(self):
+        supported_vos = tuple(self.get("VOS").split(' '))
+        names = tuple(self.get("STORM_STORAGEAREA_LIST").split(' '))
+        records = {}
+        for sa in names:
+            records[sa] = self._build_sa_record(sa, supported_vos)
+        prefixes = tuple("STORM_" + records[sa].short + "_" for sa in names)
+        return {"supported_vos": supported_vos, "names": names, "records": records,
+            "prefixes": prefixes}
+
+    def _get_sa_record(self, sa):
+        index = self._get_sa_index()
+        record = index["records"].get(sa)
+        if record is None:
+            # not a configured storage area
+            record = self._build_sa_record(sa, index["supported_vos"])
+        return record
+
+    def _build_sa_record(self, sa, supported_vos):
+        short = self.get_sa_short(sa)
+        prefix = "STORM_" + short + "_"
+        c = self._configuration
+        if prefix + "VONAME" in c:
+            vos = tuple(c[prefix + "VONAME"].split(','))
+        elif sa in supported_vos:
+            vos = (sa,)
+        else:
+            vos = ()
+        storage_class = c.get(prefix + "STORAGECLASS", "T0D1")
+        if prefix + "ACCESSPOINT" in c:
+            accesspoints = tuple(c[prefix + "ACCESSPOINT"].split(" "))
+        else:
+            accesspoints = ("/" + sa,)
+        return StorageAreaRecord(
+            name=sa,
+            short=short,
+            token=c.get(prefix + "TOKEN", short + "_TOKEN"),
+            root=c[prefix + "ROOT"] if prefix + "ROOT" in c else self.get("STORM_DEFAULT_ROOT"),
+            storage_class=storage_class,
+            vos=vos,
+            accesspoints=accesspoints,
+            retention_policy="custodial" if "T1" in storage_class else "replica",
+            access_latency="nearline" if "D0" in storage_class else "online",
+            approachable_rules=self._build_sa_approachable_rules(prefix, vos),
+            online_size=c.get(prefix + "ONLINE_SIZE"),
+            nearline_size=c.get(prefix + "NEARLINE_SIZE"))
+
+    def _build_sa_approachable_rules(self, prefix, vos):
+        # compute dn regex if present
+        dn = []
+        for field in ["C", "O", "OU", "L", "CN"]:
+            if prefix + "DN_" + field + "_REGEX" in self._configuration:
+                dn.append("/" + field + "=" + self.get(prefix + "DN_" + field + "_REGEX"))
+        # compute list of ar, one for each supported vo
+        out = []
+        for vo_name in vos:
+            if len(dn) > 0:
+                out.append(ApproachableRule(**{
+                    "dn": dn,
+                    "vo": vo_name,
+                }))
+            else:
+                out.append(ApproachableRule(**{
+                    "dn": "*",
+                    "vo": vo_name,
+                }))
+        if len(out) == 0:
+            out.append(ApproachableRule(**{
+                "dn": "*",
+                "vo": "*",
+            }))
+        return tuple(out)
 
     def get_enabled_access_protocols(self):
         enabled = []
@@ -78,6 +245,64 @@ class Configuration:
             enabled.append("webdav")
         return enabled
 
+    def get_state_dir(self):
+        return self._get_or_default("STORM_INFO_PROVIDER_STATE_DIR",
+            "/var/cache/storm/info-provider")
+
+    def get_space_info_wait_timeout(self):
+        return float(self._get_or_default("STORM_INFO_PROVIDER_WAIT_TIMEOUT", 60))
+
+    def get_space_info_fallback(self):
+        return self._get_or_default("STORM_INFO_PROVIDER_FALLBACK", "merge").lower()
+
+    def get_daemon_socket(self):
+        return self._get_or_default("STORM_INFO_PROVIDER_DAEMON_SOCKET",
+            os.path.join(self.get_state_dir(), "daemon.sock"))
+
+    def get_daemon_refresh_interval(self):
+        return float(self._get_or_default(
+            "STORM_INFO_PROVIDER_DAEMON_REFRESH_INTERVAL", 60))
+
+    def get_delta_refresh_interval(self):
+        return float(self._get_or_default(
+            "STORM_INFO_PROVIDER_DELTA_REFRESH_INTERVAL", 3600))
+
+    def get_publish_dir(self):
+        return self._get_or_default("STORM_INFO_PROVIDER_PUBLISH_DIR",
+            os.path.join(self.get_state_dir(), "publish"))
+
+    def get_gateway_options(self):
+        options = {
+            "max_workers": int(self._get_or_default(
+                "STORM_INFO_PROVIDER_MAX_PARALLEL_REQUESTS", 4)),
+            "pool_size": int(self._get_or_default(
+                "STORM_INFO_PROVIDER_CONNECTION_POOL_SIZE", 4)),
+            "bulk_status": self._get_or_default(
+                "STORM_INFO_PROVIDER_BULK_STATUS", "true").lower() == "true",
+            "timeout": float(self._get_or_default(
+                "STORM_INFO_PROVIDER_REQUEST_TIMEOUT", 10)),
+            "time_budget": float(self._get_or_default(
+                "STORM_INFO_PROVIDER_TIME_BUDGET", 60))
+        }
+        if options["bulk_status"]:
+            options["bulk_status_file"] = os.path.join(self.get_state_dir(),
+                "bulk-status.json")
+        threshold = int(self._get_or_default(
+            "STORM_INFO_PROVIDER_CIRCUIT_BREAKER_THRESHOLD", 3))
+        if threshold > 0:
+            options["circuit_breaker_file"] = os.path.join(self.get_state_dir(),
+                "circuit-breaker.json")
+            options["circuit_breaker_threshold"] = threshold
+            options["circuit_breaker_reset_timeout"] = float(self._get_or_default(
+                "STORM_INFO_PROVIDER_CIRCUIT_BREAKER_RESET_TIMEOUT", 300))
+        cache_ttl = float(self._get_or_default("STORM_INFO_PROVIDER_CACHE_TTL", 30))
+        if cache_ttl > 0:
+            options["cache_dir"] = os.path.join(self.get_state_dir(), "cache")
+            options["cache_ttl"] = cache_ttl
+            options["cache_stale_ttl"] = float(self._get_or_default(
+                "STORM_INFO_PROVIDER_CACHE_STALE_TTL", 60))
+        return options
+
     def get_backend_rest_endpoint(self):
         host = self.get("STORM_BACKEND_HOST")
         port = self.get("STORM_BACKEND_REST_SERVICES_PORT")
@@ -121,20 +346,19 @@ class Configuration:
 
     def get_webdav_endpoints(self):
         endpoints = filter(None, self.get("STORM_WEBDAV_POOL_LIST").split(','))
-        logging.debug("webdav endpoints: " + str(endpoints))
+        logging.debug("webdav endpoints: %s", endpoints)
         return endpoints
 
     def vfs_has_custom_token(self, vfs_name):
         return "STORM_" + vfs_name[:-3] + "_TOKEN" in self._configuration
 
     def get_supported_VOs(self):
-        return self.get("VOS").split(' ')
+        return list(self._get_sa_index()["supported_vos"])
 
     def get_used_VOs(self):
         vo_list = []
-        for sa in self.get_storage_area_list():
-            vos = self.get_sa_vos(sa)
-            for vo_name in vos:
+        for sa in self._get_sa_index()["names"]:
+            for vo_name in self._get_sa_record(sa).vos:
                 if vo_name == "*":
                     continue
                 if not vo_name in vo_list:
@@ -143,32 +367,77 @@ class Configuration:
         return vo_list
 
     def get_storage_area_list(self):
-        return self.get("STORM_STORAGEAREA_LIST").split(' ')
+        return list(self._get_sa_index()["names"])
+
+    def get_sa_records(self):
+        index = self._get_sa_index()
+        return [index["records"][sa] for sa in index["names"]]
 
     def get_sa_short(self, sa):
         return sa.replace(".", "").replace("-", "").replace("_", "").upper()
 
     def get_sa_vos(self, sa):
-        sa_name = self.get_sa_short(sa)
-        if "STORM_" + sa_name + "_VONAME" in self._configuration:
-            return self.get("STORM_" + sa_name + "_VONAME").split(',')
-        if sa in self.get_supported_VOs():
-            return [sa]
-        return []
+        return list(self._get_sa_record(sa).vos)
+
+    def _get_sizes(self):
+        if self._sizes is None:
+            self._sizes = self._aggregate_sizes()
+        return self._sizes
+
+    def _aggregate_sizes(self):
+        # a single pass computing the (online, nearline) sizes of each storage
+        # area, of the storage areas serving each VO and of all of them
+        online = 0
+        nearline = 0
+        sa_sizes = {}
+        vo_sizes = {}
+        missing = []
+        for record in self.get_sa_records():
+            if record.online_size is None:
+                missing.append(record)
+                sa_online = 0
+            else:
+                sa_online = int(record.online_size)
+            sa_nearline = 0
+            if record.nearline_size is not None:
+                sa_nearline = int(record.nearline_size)
+            sa_sizes[record.name] = (sa_online, sa_nearline)
+            online += sa_online
+            nearline += sa_nearline
+            for vo in set(record.vos):
+                (vo_online, vo_nearline) = vo_sizes.get(vo, (0, 0))
+                vo_sizes[vo] = (vo_online + sa_online, vo_nearline + sa_nearline)
+        return {"summary": (online, nearline), "sa": sa_sizes, "vo": vo_sizes,
+            "missing": missing}
+
+    def _get_size(self, position, options):
+        sizes = self._get_sizes()
+        sa = options.get("sa")
+        vo = options.get("vo")
+        # storage areas serving the given VO are not counted
+        if sa:
+            # only configured storage areas are counted
+            if not sa in sizes["sa"]:
+                return (0, [])
+            record = self._get_sa_index()["records"][sa]
+            if vo and vo in record.vos:
+                return (0, [])
+            return (sizes["sa"][sa][position], [r for r in sizes["missing"] if r is record])
+        tot = sizes["summary"][position]
+        missing = sizes["missing"]
+        if vo:
+            tot -= sizes["vo"].get(vo, (0, 0))[position]
+            missing = [r for r in missing if not vo in r.vos]
+        return (tot, missing)
 
     def get_online_size(self, **options):
         if options.get("sa"):
             logging.debug("configuration.get_online_size %s started", options.get("sa"))
         if options.get("vo"):
             logging.debug("configuration.get_online_size %s started", options.get("vo"))
-        tot = 0
-        for sa in self.get_storage_area_list():
-            if options.get("sa") and sa != options.get("sa"):
-                continue
-            if options.get("vo") and options.get("vo") in self.get_sa_vos(sa):
-                continue
-            sa_name = self.get_sa_short(sa)
-            tot += int(self.get("STORM_" + sa_name + "_ONLINE_SIZE"))
+        (tot, missing) = self._get_size(0, options)
+        if missing:
+            raise KeyError("STORM_" + missing[0].short + "_ONLINE_SIZE")
         logging.debug("online_size: %d", tot)
         return tot*1000000000
 
@@ -177,85 +446,30 @@ class Configuration:
             logging.debug("configuration.get_nearline_size %s started", options.get("sa"))
         if options.get("vo"):
             logging.debug("configuration.get_nearline_size %s started", options.get("vo"))
-        tot = 0
-        for sa in self.get_storage_area_list():
-            if options.get("sa") and sa != options.get("sa"):
-                continue
-            if options.get("vo") and options.get("vo") in self.get_sa_vos(sa):
-                continue
-            sa_name = self.get_sa_short(sa)
-            if "STORM_" + sa_name + "_NEARLINE_SIZE" in self._configuration:
-                tot += int(self.get("STORM_" + sa_name + "_NEARLINE_SIZE"))
+        (tot, _) = self._get_size(1, options)
         logging.debug("nearline_size: %d", tot)
         return tot*1000000000
 
     def get_sa_token(self, sa):
-        sa_name = self.get_sa_short(sa)
-        if "STORM_" + sa_name + "_TOKEN" in self._configuration:
-            return self.get("STORM_" + sa_name + "_TOKEN")
-        return sa_name + "_TOKEN"
+        return self._get_sa_record(sa).token
 
     def get_sa_root(self, sa):
-        sa_name = self.get_sa_short(sa)
-        if "STORM_" + sa_name + "_ROOT" in self._configuration:
-            return self.get("STORM_" + sa_name + "_ROOT")
-        return self.get("STORM_DEFAULT_ROOT")
+        return self._get_sa_record(sa).root
 
     def get_sa_class(self, sa):
-        sa_name = self.get_sa_short(sa)
-        if "STORM_" + sa_name + "_STORAGECLASS" in self._configuration:
-            return self.get("STORM_" + sa_name + "_STORAGECLASS")
-        return "T0D1"
+        return self._get_sa_record(sa).storage_class
 
     def get_sa_accesspoints(self, sa):
-        sa_name = self.get_sa_short(sa)
-        if "STORM_" + sa_name + "_ACCESSPOINT" in self._configuration:
-            return self.get("STORM_" + sa_name + "_ACCESSPOINT").split(" ")
-        return [ "/" + sa ]
+        return list(self._get_sa_record(sa).accesspoints)
 
     def get_sa_retention_policy(self, sa):
-        if "T1" in self.get_sa_class(sa):
-            return "custodial"
-        return "replica"
+        return self._get_sa_record(sa).retention_policy
 
     def get_sa_access_latency(self, sa):
-        if "D0" in self.get_sa_class(sa):
-            return "nearline"
-        return "online"
+        return self._get_sa_record(sa).access_latency
 
     def get_sa_approachable_rules(self, sa):
-        # compute dn regex if present
-        sa_name = self.get_sa_short(sa)
-        dn = []
-        if "STORM_" + sa_name + "_DN_C_REGEX" in self._configuration:
-            dn.append("/C=" + self.get("STORM_" + sa_name + "_DN_C_REGEX"))
-        if "STORM_" + sa_name + "_DN_O_REGEX" in self._configuration:
-            dn.append("/O=" + self.get("STORM_" + sa_name + "_DN_O_REGEX"))
-        if "STORM_" + sa_name + "_DN_OU_REGEX" in self._configuration:
-            dn.append("/OU=" + self.get("STORM_" + sa_name + "_DN_OU_REGEX"))
-        if "STORM_" + sa_name + "_DN_L_REGEX" in self._configuration:
-            dn.append("/L=" + self.get("STORM_" + sa_name + "_DN_L_REGEX"))
-        if "STORM_" + sa_name + "_DN_CN_REGEX" in self._configuration:
-            dn.append("/CN=" + self.get("STORM_" + sa_name + "_DN_CN_REGEX"))
-        # compute list of ar, one for each supported vo
-        out = []
-        for vo_name in self.get_sa_vos(sa):
-            if len(dn) > 0:
-                out.append(ApproachableRule(**{
-                    "dn": dn,
-                    "vo": vo_name,
-                }))
-            else:
-                out.append(ApproachableRule(**{
-                    "dn": "*",
-                    "vo": vo_name,
-                }))
-        if len(out) == 0:
-            out.append(ApproachableRule(**{
-                "dn": "*",
-                "vo": "*",
-            }))
-        return out
+        return list(self._get_sa_record(sa).approachable_rules)
 
     def get_sitename(self):
         return self.get("SITE_NAME")
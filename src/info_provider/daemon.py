@@ -0,0 +1,156 @@
+import errno
+import logging
+import os
+import socket
+import SocketServer
+import threading
+import time
+
+from info_provider.utils.file_utils import make_dirs
+
+
+class DaemonError(Exception):
+    pass
+
+
+class _RequestHandler(SocketServer.StreamRequestHandler):
+
+    def handle(self):
+        request = self.rfile.readline().strip()
+        if not request:
+            return
+        logging.debug("Daemon request: %s", request)
+        try:
+            content = self.server.info_daemon.get_output(request)
+        except DaemonError, ex:
+            self.wfile.write("ERROR %s\n" % ex)
+            return
+        self.wfile.write("OK\n")
+        self.wfile.write(content)
+
+
+class _UnixStreamServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+
+    daemon_threads = True
+
+
+class InfoProviderDaemon:
+
+    def __init__(self, socket_path, info_provider, refresh_interval=60,
+        before_refresh=None):
+        self._socket_path = socket_path
+        self._info_provider = info_provider
+        self._refresh_interval = refresh_interval
+        self._before_refresh = before_refresh
+        # outputs older than this are not served: clients compute their own
+        self._max_age = 3 * refresh_interval
+        self._outputs = None
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = None
+
+    def get_socket_path(self):
+        return self._socket_path
+
+    def refresh(self):
+        logging.debug("Refreshing daemon outputs ...")
+        start = time.time()
+        # with a new time budget for the backend requests
+        self._info_provider.start_run()
+        if self._before_refresh:
+            self._before_refresh()
+        outputs = self._info_provider.get_outputs()
+        with self._lock:
+            self._outputs = outputs
+            self._refreshed_at = time.time()
+        logging.info("Daemon outputs refreshed in %.3f sec", time.time() - start)
+
+    def get_output(self, request):
+        with self._lock:
+            outputs = self._outputs
+            refreshed_at = self._refreshed_at
+        if outputs is None:
+            raise DaemonError("No data available yet")
+        if time.time() - refreshed_at > self._max_age:
+            raise DaemonError("Data is older than %s sec" % self._max_age)
+        if request not in outputs:
+            raise DaemonError("Unknown request '%s'" % request)
+        return outputs[request]
+
+    def serve_forever(self):
+        self._bind()
+        refresher = threading.Thread(target=self._refresh_periodically)
+        refresher.daemon = True
+        refresher.start()
+        logging.info("Listening on %s", self._socket_path)
+        try:
+            # shutdown may have been requested while binding
+            if not self._stopped.is_set():
+                self._server.serve_forever()
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            os.remove(self._socket_path)
+
+    def shutdown(self):
+        self._stopped.set()
+        if self._server:
+            self._server.shutdown()
+
+    def _bind(self):
+        if os.path.exists(self._socket_path):
+            if _is_listening(self._socket_path):
+                raise DaemonError("Another daemon is listening on %s" % self._socket_path)
+            # left behind by a daemon that has not been stopped cleanly
+            os.remove(self._socket_path)
+        directory = os.path.dirname(os.path.abspath(self._socket_path))
+        if not os.path.isdir(directory):
+            make_dirs(directory)
+        self._server = _UnixStreamServer(self._socket_path, _RequestHandler)
+        self._server.info_daemon = self
+        # the BDII plugins run as a different user
+        os.chmod(self._socket_path, 0666)
+
+    def _refresh_periodically(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception, ex:
+                logging.error("Unable to refresh daemon outputs: %s", ex)
+            self._stopped.wait(self._refresh_interval)
+
+
+def _is_listening(socket_path):
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(socket_path)
+        return True
+    except socket.error:
+        return False
+    finally:
+        s.close()
+
+def query_daemon(socket_path, request, timeout=5):
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.settimeout(timeout)
+    try:
+        try:
+            s.connect(socket_path)
+            s.sendall(request + "\n")
+            chunks = []
+            while True:
+                chunk = s.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        except socket.error, ex:
+            if ex.errno in (errno.ENOENT, errno.ECONNREFUSED):
+                raise DaemonError("No daemon listening on %s" % socket_path)
+            raise DaemonError("Daemon request failed: %s" % ex)
+    finally:
+        s.close()
+    (status, _, content) = "".join(chunks).partition("\n")
+    if status != "OK":
+        raise DaemonError("Daemon replied: %s" % status)
+    return content
@@ -5,6 +5,10 @@ INFO_PROVIDER_TEMPLATES_DIR = "/etc/storm/info-provider/templates"
 INFO_PROVIDER_SCRIPT = "/usr/libexec/storm-info-provider"
 INPUT_YAIM_CONFIGURATION = "/etc/storm/info-provider/storm-yaim-variables.conf"
 
+# host
+HOST_CERTIFICATE_FILE = "/etc/grid-security/hostcert.pem"
+RPM_DATABASE_PATH = "/var/lib/rpm"
+
 # bdii
 BDII_PROVIDER_PATH = "/var/lib/bdii/gip/provider"
 BDII_LDIF_PATH = "/var/lib/bdii/gip/ldif"
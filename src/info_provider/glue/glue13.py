@@ -11,8 +11,10 @@ from info_provider.glue.glue13_constants import GLUE13_INFO_SERVICE_CONFIG_FILE,
 from info_provider.glue.glue13_schema import GlueSE, GlueSALocal, \
     GlueSAVOInfoLocal, GlueSEControlProtocol, GlueSEAccessProtocol
 from info_provider.glue.utils import set_owner, create_file_from_template, \
-    as_gigabytes, as_kilobytes
-from info_provider.utils.ldap_utils import LDIFExporter
+    create_files
+from info_provider.model.publication import get_publication
+from info_provider.utils.file_utils import write_file_if_changed
+from info_provider.utils.ldap_utils import save_nodes_to_file
 
 
 class Glue13:
@@ -38,9 +40,10 @@ class Glue13:
     def _get_se_control_protocol_id(self):
         return 'srm_v2.2'
 
-    def _get_sa_vo_info_id(self, sa_name, sa_vos, sa_token):
-        sa_vos_as_str = ":".join(sa_vos)
-        if self._configuration.vfs_has_custom_token(sa_name): 
+    def _get_sa_vo_info_id(self, share):
+        sa_vos_as_str = ":".join(share.get_vfs().get_vos())
+        sa_token = share.get_vfs().get_token()
+        if share.has_custom_token(): 
             # reserved space
             return ":".join((str(sa_vos_as_str), str(sa_token)))                    
         # unreserved space
@@ -49,36 +52,25 @@ class Glue13:
     def configure(self, spaceinfo):
         # remove old static LDIF backup files
         self._delete_backup_files()
-        # create Glue13 service configuration file
-        logging.debug("Creating %s ...", GLUE13_INFO_SERVICE_CONFIG_FILE)
-        self._create_service_config_file()
-        logging.info("Successfully created %s !", GLUE13_INFO_SERVICE_CONFIG_FILE)
-        # create Glue13 service provider file
-        logging.debug("Creating %s ...", GLUE13_INFO_PROVIDER_FILE)
-        self._create_service_provider_file()
-        logging.info("Successfully created %s !", GLUE13_INFO_PROVIDER_FILE)
-        # create Glue13 service plug-in file
-        logging.debug("Creating %s ...", GLUE13_INFO_PLUGIN_FILE)
-        self._create_plugin_file()
-        logging.info("Successfully created %s !", GLUE13_INFO_PLUGIN_FILE)
-        # create Glue13 static LDIF file
-        logging.debug("Creating %s ...", GLUE13_INFO_STATIC_LDIF_FILE)
-        self._create_static_ldif_file(spaceinfo)
-        logging.info("Successfully created %s !", GLUE13_INFO_STATIC_LDIF_FILE)
-        return
+        # create Glue13 service configuration, service provider, service
+        # plug-in and static LDIF files, leaving the unchanged ones untouched
+        return create_files([
+            (GLUE13_INFO_SERVICE_CONFIG_FILE, self._create_service_config_file),
+            (GLUE13_INFO_PROVIDER_FILE, self._create_service_provider_file),
+            (GLUE13_INFO_PLUGIN_FILE, self._create_plugin_file),
+            (GLUE13_INFO_STATIC_LDIF_FILE,
+                lambda: self._create_static_ldif_file(spaceinfo))])
 
     def _create_service_provider_file(self):
-        # create (overwrite) provider file
-        f = open(GLUE13_INFO_PROVIDER_FILE, "w")
-        f.write("#!/bin/sh\n")
-        f.write("glite-info-service %s " % (GLUE13_INFO_SERVICE_CONFIG_FILE))
-        f.write("%s %s" % (self._get_site_id(),
-            self._configuration.get_public_srm_endpoint()))
-        f.close()
-        # set ldap as owner and chmod +x
+        # create (overwrite) provider file, chmod +x
+        written = write_file_if_changed(GLUE13_INFO_PROVIDER_FILE,
+            "#!/bin/sh\n" +
+            "glite-info-service %s " % (GLUE13_INFO_SERVICE_CONFIG_FILE) +
+            "%s %s" % (self._get_site_id(),
+                self._configuration.get_public_srm_endpoint()), 0755)
+        # set ldap as owner
         set_owner("ldap", GLUE13_INFO_PROVIDER_FILE)
-        os.chmod(GLUE13_INFO_PROVIDER_FILE, 0755)
-        return
+        return written
 
     def _create_service_config_file(self):
         vos = self._configuration.get_used_VOs()
@@ -87,81 +79,83 @@ class Glue13:
             'ACBR': "VO:" + "\\nVO:".join(vos),
             'OWNER': "\\n".join(vos)
         }
-        create_file_from_template(
+        return create_file_from_template(
             GLUE13_INFO_SERVICE_CONFIG_FILE,
             GLUE13_INFO_SERVICE_CONFIG_FILE_TEMPLATE,
             params)
-        return
 
     def _create_static_ldif_file(self, spaceinfo):
-        exporter = LDIFExporter()
-        exporter.add_nodes(self.get_static_ldif_nodes(spaceinfo))
-        exporter.save_to_file(GLUE13_INFO_STATIC_LDIF_FILE)
-        # set ldap as owner and chmod +x
+        written = save_nodes_to_file(self.get_static_ldif_nodes(spaceinfo),
+            GLUE13_INFO_STATIC_LDIF_FILE)
+        # set ldap as owner
         set_owner("ldap", GLUE13_INFO_STATIC_LDIF_FILE)
-        return
+        return written
 
     def _create_plugin_file(self):
-        f = open(GLUE13_INFO_PLUGIN_FILE, "w")
-        f.write("#!/bin/sh\n")
-        f.write("%s get-update-ldif -f %s -g glue13" % (
-            INFO_PROVIDER_SCRIPT, INPUT_YAIM_CONFIGURATION))
-        f.close()
-        # set ldap as owner and chmod +x
+        content = "#!/bin/sh\n"
+        content += "%s get-update-ldif -f %s -g glue13" % (
+            INFO_PROVIDER_SCRIPT, INPUT_YAIM_CONFIGURATION)
+        # ask the daemon first, if running
+        if self._configuration.get_daemon_socket():
+            content += " -s %s" % self._configuration.get_daemon_socket()
+        # chmod +x
+        written = write_file_if_changed(GLUE13_INFO_PLUGIN_FILE, content, 0755)
+        # set ldap as owner
         set_owner("ldap", GLUE13_INFO_PLUGIN_FILE)
-        os.chmod(GLUE13_INFO_PLUGIN_FILE, 0755)
-        return
+        return written
 
     def get_static_ldif_nodes(self, spaceinfo):
-        # list of (dn, entries)
-        nodes = []
         
         # Commons
         GlueSEUniqueID = self._get_se_id()
+        publication = get_publication(self._configuration, spaceinfo)
+        summary = publication.get_summary_gigabytes()
 
         # GlueSE
         node = GlueSE(GlueSEUniqueID)
         node.init().add({
             'GlueSEName': self._configuration.get_sitename() + ":srm_v2",
-            'GlueSESizeTotal': 
-                as_gigabytes(spaceinfo.get_summary().get_total()) + 
-                as_gigabytes(spaceinfo.get_summary().get_nearline()),
-            'GlueSESizeFree': as_gigabytes(spaceinfo.get_summary().get_free()),
-            'GlueSETotalOnlineSize': as_gigabytes(spaceinfo.get_summary().get_total()),
-            'GlueSEUsedOnlineSize': as_gigabytes(spaceinfo.get_summary().get_used()),
-            'GlueSETotalNearlineSize': as_gigabytes(spaceinfo.get_summary().get_nearline()),
+            'GlueSESizeTotal': summary["total"] + summary["nearline"],
+            'GlueSESizeFree': summary["free"],
+            'GlueSETotalOnlineSize': summary["total"],
+            'GlueSEUsedOnlineSize': summary["used"],
+            'GlueSETotalNearlineSize': summary["nearline"],
             'GlueSEImplementationVersion': self._get_implementation_version(),
             'GlueInformationServiceURL': "ldap://" + 
                 self._configuration.get_backend_hostname() + ":2170/" + 
                 GLUE13_BASEDN,
             'GlueForeignKey':  "GlueSiteUniqueID=" + self._get_site_id()
         })
-        nodes.append(node)
+        yield node
         logging.debug(node)
 
         # for each storage area / virtual file system
-        for n, d in spaceinfo.get_vfs().iteritems():
+        for share in publication.get_shares():
+            d = share.get_vfs()
+            gb = share.get_gigabytes()
+            kb = share.get_kilobytes()
             # GlueSA
-            GlueSALocalID = self._get_sa_local_id(n, d.get_retentionpolicy(), d.get_accesslatency())
+            GlueSALocalID = self._get_sa_local_id(share.get_name(),
+                d.get_retentionpolicy(), d.get_accesslatency())
             node = GlueSALocal(GlueSALocalID, GlueSEUniqueID)
             node.init().add({
                 'GlueSAPath': str(d.get_root()),
-                'GlueSATotalOnlineSize': as_gigabytes(d.get_space().get_total()),
-                'GlueSAUsedOnlineSize': as_gigabytes(d.get_space().get_used()),
-                'GlueSAFreeOnlineSize': as_gigabytes(d.get_space().get_free()),
+                'GlueSATotalOnlineSize': gb["total"],
+                'GlueSAUsedOnlineSize': gb["used"],
+                'GlueSAFreeOnlineSize': gb["free"],
                 # reserved-space = total-space in prev bash script for Glue1.3
-                'GlueSAReservedOnlineSize': as_gigabytes(d.get_space().get_total()),
-                'GlueSATotalNearlineSize': as_gigabytes(d.get_space().get_nearline()),
-                'GlueSAFreeNearlineSize': as_gigabytes(d.get_space().get_nearline()),
-                'GlueSARetentionPolicy': str(d.get_retentionpolicy()).lower(),
-                'GlueSAStateAvailableSpace': as_kilobytes(d.get_space().get_available()),
-                'GlueSAStateUsedSpace': as_kilobytes(d.get_space().get_used()),
-                'GlueSAAccessControlBaseRule': "VO:" + ",VO:".join(d.get_vos()),
+                'GlueSAReservedOnlineSize': gb["total"],
+                'GlueSATotalNearlineSize': gb["nearline"],
+                'GlueSAFreeNearlineSize': gb["nearline"],
+                'GlueSARetentionPolicy': share.get_retention_policy(),
+                'GlueSAStateAvailableSpace': kb["available"],
+                'GlueSAStateUsedSpace': kb["used"],
+                'GlueSAAccessControlBaseRule': share.get_access_control_rule(),
                 'GlueSACapability': [
                     "InstalledOnlineCapacity=" + 
-                        str(as_gigabytes(d.get_space().get_total())),
+                        str(gb["total"]),
                     "InstalledNearlineCapacity=" + 
-                        str(as_gigabytes(d.get_space().get_nearline()))
+                        str(gb["nearline"])
                     ]
                 })
             vos = d.get_vos()
@@ -173,21 +167,21 @@ class Glue13:
                 node.add({ 
                     'GlueSAName': "Custom space for non-VO users" 
                 })
-            nodes.append(node)
+            yield node
 
             if self.is_VO(vos):
                 # GlueVOInfoLocal
-                GlueSAVOInfoLocalID = self._get_sa_vo_info_id(n, vos, d.get_token())
+                GlueSAVOInfoLocalID = self._get_sa_vo_info_id(share)
                 node = GlueSAVOInfoLocal(GlueSAVOInfoLocalID, GlueSALocalID, GlueSEUniqueID)
                 node.init().add({
                     'GlueVOInfoPath': d.get_stfnroot()[0],
-                    'GlueVOInfoAccessControlBaseRule': "VO:" + ",VO:".join(vos)
+                    'GlueVOInfoAccessControlBaseRule': share.get_access_control_rule()
                     })
-                if self._configuration.vfs_has_custom_token(n):
+                if share.has_custom_token():
                     node.add({ 
                         'GlueVOInfoTag': d.get_token()
                     })
-                nodes.append(node)
+                yield node
 
         # GlueSEControlProtocol
         GlueSEControlProtocolID = self._get_se_control_protocol_id()
@@ -196,7 +190,7 @@ class Glue13:
             'GlueSEControlProtocolEndpoint': 
                 self._configuration.get_public_srm_endpoint()
         })
-        nodes.append(node)
+        yield node
 
         # GlueSEAccessProtocol for each enabled protocol
         for protocol in self._configuration.get_enabled_access_protocols():
@@ -207,62 +201,55 @@ class Glue13:
                 'GlueSEAccessProtocolMaxStreams': 
                     GLUE13_ACCESS_PROTOCOLS[protocol]['maxstreams']
             })
-            nodes.append(node)
-
-        return nodes
+            yield node
 
     def get_update_ldif_nodes(self, spaceinfo):
-        # node list
-        nodes = []
         # commons
         GlueSEUniqueID = self._get_se_id()
+        publication = get_publication(self._configuration, spaceinfo)
+        summary = publication.get_summary_gigabytes()
 
         # GlueSE
         node = GlueSE(GlueSEUniqueID)
         node.add({
-            'GlueSESizeTotal': 
-                as_gigabytes(spaceinfo.get_summary().get_total()) + 
-                    as_gigabytes(spaceinfo.get_summary().get_nearline()),
-            'GlueSESizeFree':
-                as_gigabytes(spaceinfo.get_summary().get_free()),
-            'GlueSETotalOnlineSize': 
-                as_gigabytes(spaceinfo.get_summary().get_total()),
-            'GlueSEUsedOnlineSize': 
-                as_gigabytes(spaceinfo.get_summary().get_used()),
-            'GlueSETotalNearlineSize': 
-                as_gigabytes(spaceinfo.get_summary().get_nearline()),
+            'GlueSESizeTotal': summary["total"] + summary["nearline"],
+            'GlueSESizeFree': summary["free"],
+            'GlueSETotalOnlineSize': summary["total"],
+            'GlueSEUsedOnlineSize': summary["used"],
+            'GlueSETotalNearlineSize': summary["nearline"],
             'GlueSEUsedNearlineSize': "0"
         })
-        nodes.append(node)
+        yield node
 
-        for sa_name, sa_data in spaceinfo.vfs.iteritems():
+        for share in publication.get_shares():
+            sa_data = share.get_vfs()
+            gb = share.get_gigabytes()
+            kb = share.get_kilobytes()
             # GlueSA
-            GlueSALocalID = self._get_sa_local_id(sa_name, sa_data.get_retentionpolicy(), sa_data.get_accesslatency())
+            GlueSALocalID = self._get_sa_local_id(share.get_name(), sa_data.get_retentionpolicy(), sa_data.get_accesslatency())
             node = GlueSALocal(GlueSALocalID, GlueSEUniqueID)
             node.add({
                 'GlueSATotalOnlineSize':
-                    as_gigabytes(sa_data.get_space().get_total()),
+                    gb["total"],
                 'GlueSAUsedOnlineSize': 
-                    as_gigabytes(sa_data.get_space().get_used()),
+                    gb["used"],
                 'GlueSAFreeOnlineSize':
-                    as_gigabytes(sa_data.get_space().get_free()),
+                    gb["free"],
                 # reserved = total in prev bash script for Glue1.3
                 'GlueSAReservedOnlineSize': 
-                    as_gigabytes(sa_data.get_space().get_total()),
+                    gb["total"],
                 'GlueSATotalNearlineSize':
-                    as_gigabytes(sa_data.get_space().get_nearline()),
+                    gb["nearline"],
                 'GlueSAFreeNearlineSize':
-                    as_gigabytes(sa_data.get_space().get_nearline()),
+                    gb["nearline"],
                 'GlueSAUsedNearlineSize': '0',
                 'GlueSAReservedNearlineSize': '0',
                 'GlueSAStateAvailableSpace':
-                    as_kilobytes(sa_data.get_space().get_available()),
+                    kb["available"],
                 'GlueSAStateUsedSpace':
-                    as_kilobytes(sa_data.get_space().get_used())
+                    kb["used"]
             })
-            nodes.append(node)
-
-        return nodes
+            yield node
 
     def _delete_backup_files(self):
         parent_directory = os.path.dirname(GLUE13_INFO_STATIC_LDIF_FILE)
@@ -15,8 +15,12 @@ from info_provider.glue.glue2_schema import GLUE2StorageService, \
     GLUE2DataStore, GLUE2StorageShare, GLUE2MappingPolicy, \
     GLUE2StorageShareCapacity, GLUE2WebDAVStorageEndpoint, GLUE2AccessPolicy, \
     GLUE2StorageEndpoint
-from info_provider.glue.utils import create_file_from_template, set_owner, as_gigabytes
-from info_provider.utils.ldap_utils import LDIFExporter
+from info_provider.glue.utils import create_file_from_template, create_files, \
+    set_owner
+from info_provider.model.publication import get_publication
+from info_provider.utils.file_utils import write_file_if_changed
+from info_provider.utils.ldap_utils import save_nodes_to_file
+from info_provider.utils.run_context import RunContext
 
 
 class Glue2:
@@ -70,33 +74,28 @@ class Glue2:
     def _get_share_capacity_id(self, vfs_name, capacity_type):
         return self._get_share_id(vfs_name) + "/capacity/" + capacity_type
 
+    def _get_creation_time(self, context):
+        # all the nodes of a run share the clock read by the run context
+        if context is None:
+            context = RunContext()
+        return context.get_creation_time()
+
     def _is_anonymous(self, vos):
         return len(vos) == 0
 
-    def configure(self, spaceinfo):
+    def configure(self, spaceinfo, context=None):
         # remove old static ldif backup files
         self._delete_backup_files()
-        # create Glue2 service configuration file
-        logging.debug("Creating %s ...", GLUE2_INFO_SERVICE_CONFIG_FILE)
-        self._create_service_config_file()
-        logging.info("Successfully created %s !", GLUE2_INFO_SERVICE_CONFIG_FILE)
-        # create Glue2 srm endpoint configuration file
-        logging.debug("Creating %s ...", GLUE2_INFO_SERVICE_SRM_CONFIG_FILE)
-        self._create_srm_endpoint_config_file()
-        logging.info("Successfully created %s !", GLUE2_INFO_SERVICE_SRM_CONFIG_FILE)
-        # create Glue2 service provider file
-        logging.debug("Creating %s ...", GLUE2_INFO_PROVIDER_FILE)
-        self._create_service_provider_file()
-        logging.info("Successfully created %s !", GLUE2_INFO_PROVIDER_FILE)
-        # create Glue2 service plugin file
-        logging.debug("Creating %s ...", GLUE2_INFO_PLUGIN_FILE)
-        self._create_plugin_file()
-        logging.info("Successfully created %s !", GLUE2_INFO_PLUGIN_FILE)
-        # create Glue2 static ldif file
-        logging.debug("Creating %s ...", GLUE2_INFO_STATIC_LDIF_FILE)
-        self._create_static_ldif_file(spaceinfo)
-        logging.info("Successfully created %s !", GLUE2_INFO_STATIC_LDIF_FILE)
-        return
+        # create Glue2 service configuration, srm endpoint configuration,
+        # service provider, service plugin and static ldif files, leaving
+        # the unchanged ones untouched
+        return create_files([
+            (GLUE2_INFO_SERVICE_CONFIG_FILE, self._create_service_config_file),
+            (GLUE2_INFO_SERVICE_SRM_CONFIG_FILE, self._create_srm_endpoint_config_file),
+            (GLUE2_INFO_PROVIDER_FILE, self._create_service_provider_file),
+            (GLUE2_INFO_PLUGIN_FILE, self._create_plugin_file),
+            (GLUE2_INFO_STATIC_LDIF_FILE,
+                lambda: self._create_static_ldif_file(spaceinfo, context))])
 
     def _create_service_config_file(self):
         params = {
@@ -104,11 +103,10 @@ class Glue2:
             'SERVICEID': self._get_service_id(),
             'QUALITY_LEVEL': self._configuration.get_quality_level()
         }
-        create_file_from_template(
+        return create_file_from_template(
             GLUE2_INFO_SERVICE_CONFIG_FILE,
             GLUE2_INFO_SERVICE_CONFIG_FILE_TEMPLATE,
             params)
-        return
 
     def _create_srm_endpoint_config_file(self):
         vos = self._configuration.get_used_VOs()
@@ -120,152 +118,151 @@ class Glue2:
             'ACBR': "VO:" + "\\nVO:".join(vos),
             'OWNER': "\\n".join(vos)
         }
-        create_file_from_template(
+        return create_file_from_template(
             GLUE2_INFO_SERVICE_SRM_CONFIG_FILE,
             GLUE2_INFO_SERVICE_SRM_CONFIG_FILE_TEMPLATE,
             params)
-        return
 
     def _create_service_provider_file(self):
-        # create (overwrite) provider file
-        f = open(GLUE2_INFO_PROVIDER_FILE, "w")
-        f.write("#!/bin/sh\n")
-        f.write("glite-info-glue2-simple ")
-        f.write("%s,%s " % (GLUE2_INFO_SERVICE_SRM_CONFIG_FILE, GLUE2_INFO_SERVICE_CONFIG_FILE))
-        f.write("%s " % (self._get_site_id()))
-        f.write("%s " % (self._get_service_id()))
-        f.write("%s\n" % (self._get_srm_endpoint_id()))
-        f.close()
-        # set ldap as owner and chmod +x
+        # create (overwrite) provider file, chmod +x
+        content = "#!/bin/sh\n"
+        content += "glite-info-glue2-simple "
+        content += "%s,%s " % (GLUE2_INFO_SERVICE_SRM_CONFIG_FILE, GLUE2_INFO_SERVICE_CONFIG_FILE)
+        content += "%s " % (self._get_site_id())
+        content += "%s " % (self._get_service_id())
+        content += "%s\n" % (self._get_srm_endpoint_id())
+        written = write_file_if_changed(GLUE2_INFO_PROVIDER_FILE, content, 0755)
+        # set ldap as owner
         set_owner("ldap", GLUE2_INFO_PROVIDER_FILE)
-        os.chmod(GLUE2_INFO_PROVIDER_FILE, 0755)
-        return
+        return written
 
     def _create_plugin_file(self):
-        f = open(GLUE2_INFO_PLUGIN_FILE, "w")
-        f.write("#!/bin/sh\n")
-        f.write("%s get-update-ldif -f %s -g glue2" % (INFO_PROVIDER_SCRIPT, INPUT_YAIM_CONFIGURATION))
-        f.close()
-        # set ldap as owner and chmod +x
+        content = "#!/bin/sh\n"
+        content += "%s get-update-ldif -f %s -g glue2" % (INFO_PROVIDER_SCRIPT, INPUT_YAIM_CONFIGURATION)
+        # ask the daemon first, if running
+        if self._configuration.get_daemon_socket():
+            content += " -s %s" % self._configuration.get_daemon_socket()
+        # chmod +x
+        written = write_file_if_changed(GLUE2_INFO_PLUGIN_FILE, content, 0755)
+        # set ldap as owner
         set_owner("ldap", GLUE2_INFO_PLUGIN_FILE)
-        os.chmod(GLUE2_INFO_PLUGIN_FILE, 0755)
-        return
-
-    def _create_static_ldif_file(self, spaceinfo):
-        exporter = LDIFExporter()
-        exporter.add_nodes(self.get_static_ldif_nodes(spaceinfo))
-        exporter.save_to_file(GLUE2_INFO_STATIC_LDIF_FILE)
-        # set ldap as owner and chmod +x
-        set_owner("ldap", GLUE2_INFO_STATIC_LDIF_FILE)
-        return
+        return written
 
-    def get_static_ldif_nodes(self, spaceinfo):
+    def _create_static_ldif_file(self, spaceinfo, context=None):
+        # a new creation time alone doesn't make the BDII reload the file
+        written = save_nodes_to_file(self.get_static_ldif_nodes(spaceinfo, context),
+            GLUE2_INFO_STATIC_LDIF_FILE, ['GLUE2EntityCreationTime'])
+        # set ldap as owner
+        set_owner("ldap", GLUE2_INFO_STATIC_LDIF_FILE)
+        return written
 
-        nodes = []
+    def get_static_ldif_nodes(self, spaceinfo, context=None):
         # Commons
+        creation_time = self._get_creation_time(context)
         service_id = self._get_service_id()
         storm_version = self._configuration.get_implementation_version()
         issuer_ca = self._configuration.get_issuer_ca()
+        publication = get_publication(self._configuration, spaceinfo)
+        summary = publication.get_summary_gigabytes()
 
         # Glue2StorageService
         # NOTE: It must be removed when 'storm' type will be added
-        node = GLUE2StorageService(service_id)
+        node = GLUE2StorageService(service_id, creation_time)
         node.init().add({
             'GLUE2ServiceQualityLevel': self._configuration.get_quality_level(),
             'GLUE2ServiceAdminDomainForeignKey': self._get_site_id()
             })
-        nodes.append(node)
-        logging.debug("Added node " + str(node))
+        yield node
+        logging.debug("Added node %s", node)
 
 
         # Glue2StorageServiceCapacity online
         if spaceinfo.get_summary().has_online_capacity():
             sc_id = self._get_service_capacity_id("online")
-            node = GLUE2StorageServiceCapacity(sc_id, service_id)
+            node = GLUE2StorageServiceCapacity(sc_id, service_id, creation_time)
             node.init().add({
                 'GLUE2StorageServiceCapacityType': "online",
-                'GLUE2StorageServiceCapacityTotalSize':
-                    as_gigabytes(spaceinfo.get_summary().get_total()),
-                'GLUE2StorageServiceCapacityFreeSize':
-                    as_gigabytes(spaceinfo.get_summary().get_free()),
-                'GLUE2StorageServiceCapacityUsedSize':
-                    as_gigabytes(spaceinfo.get_summary().get_used()),
-                'GLUE2StorageServiceCapacityReservedSize':
-                    as_gigabytes(spaceinfo.get_summary().get_reserved())
+                'GLUE2StorageServiceCapacityTotalSize': summary["total"],
+                'GLUE2StorageServiceCapacityFreeSize': summary["free"],
+                'GLUE2StorageServiceCapacityUsedSize': summary["used"],
+                'GLUE2StorageServiceCapacityReservedSize': summary["reserved"]
             })
-            nodes.append(node)
-            logging.debug("Added node " + str(node))
+            yield node
+            logging.debug("Added node %s", node)
 
         # Glue2StorageServiceCapacity near-line
         if spaceinfo.get_summary().has_nearline_capacity():
             sc_id = self._get_service_capacity_id("nearline")
-            node = GLUE2StorageServiceCapacity(sc_id, service_id)
+            node = GLUE2StorageServiceCapacity(sc_id, service_id, creation_time)
             node.init().add({
                 'GLUE2StorageServiceCapacityType': "nearline",
-                'GLUE2StorageServiceCapacityTotalSize':
-                    as_gigabytes(spaceinfo.get_summary().get_nearline()),
-                'GLUE2StorageServiceCapacityFreeSize':
-                    as_gigabytes(spaceinfo.get_summary().get_nearline()),
+                'GLUE2StorageServiceCapacityTotalSize': summary["nearline"],
+                'GLUE2StorageServiceCapacityFreeSize': summary["nearline"],
                 'GLUE2StorageServiceCapacityUsedSize': 0,
                 'GLUE2StorageServiceCapacityReservedSize': 0
             })
-            nodes.append(node)
-            logging.debug("Added node " + str(node))
+            yield node
+            logging.debug("Added node %s", node)
 
 
         # GLUE2StorageAccessProtocol for each protocol
         for protocol in self._configuration.get_enabled_access_protocols():
             p_ver = self._get_access_protocol_version(protocol)
             ap_id = self._get_access_protocol_id(protocol, p_ver)
-            node = GLUE2StorageAccessProtocol(ap_id, service_id)
+            node = GLUE2StorageAccessProtocol(ap_id, service_id, creation_time)
             node.init().add({
                 'GLUE2StorageAccessProtocolType': protocol,
                 'GLUE2StorageAccessProtocolVersion': p_ver
                 })
-            nodes.append(node)
-            logging.debug("Added node " + str(node))
+            yield node
+            logging.debug("Added node %s", node)
 
         # Glue2StorageManager
         manager_id = self._get_manager_id()
-        node = GLUE2StorageManager(manager_id, service_id)
+        node = GLUE2StorageManager(manager_id, service_id, creation_time)
         node.init().add({
             'GLUE2ManagerProductVersion': storm_version
         })
-        nodes.append(node)
-        logging.debug("Added node " + str(node))
+        yield node
+        logging.debug("Added node %s", node)
 
         # Glue2DataStore disk online
         if spaceinfo.get_summary().has_online_capacity():
-            node = GLUE2DataStore(self._get_data_store_id("disk"), manager_id, service_id)
+            node = GLUE2DataStore(self._get_data_store_id("disk"), manager_id,
+                service_id, creation_time)
             node.init().add({
                 'GLUE2DataStoreType': "disk",
                 'GLUE2DataStoreLatency': "online",
-                'GLUE2DataStoreTotalSize': as_gigabytes(spaceinfo.get_summary().get_total())
+                'GLUE2DataStoreTotalSize': summary["total"]
             })
-            nodes.append(node)
-            logging.debug("Added node " + str(node))
+            yield node
+            logging.debug("Added node %s", node)
 
         # Glue2DataStore tape near-line
         if spaceinfo.get_summary().has_nearline_capacity():
-            node = GLUE2DataStore(self._get_data_store_id("tape"), manager_id, service_id)
+            node = GLUE2DataStore(self._get_data_store_id("tape"), manager_id,
+                service_id, creation_time)
             node.init().add({
                 'GLUE2DataStoreType': "tape",
                 'GLUE2DataStoreLatency': "nearline",
-                'GLUE2DataStoreTotalSize': as_gigabytes(spaceinfo.get_summary().get_nearline())
+                'GLUE2DataStoreTotalSize': summary["nearline"]
             })
-            nodes.append(node)
-            logging.debug("Added node " + str(node))
+            yield node
+            logging.debug("Added node %s", node)
 
         # Glue2Share, GLUE2MappingPolicy and Glue2StorageShareCapacity for each
         # VFS
-        for name, data in spaceinfo.get_vfs().items():
+        for share in publication.get_shares():
+            name = share.get_name()
+            data = share.get_vfs()
+            gb = share.get_gigabytes()
 
             # GLUE2Share
             share_id = self._get_share_id(name)
-            node = GLUE2StorageShare(share_id, service_id)
+            node = GLUE2StorageShare(share_id, service_id, creation_time)
             node.init().add({
-                'GLUE2StorageShareAccessLatency': data.get_accesslatency().lower(),
-                'GLUE2StorageShareRetentionPolicy': data.get_retentionpolicy().lower(),
+                'GLUE2StorageShareAccessLatency': share.get_access_latency(),
+                'GLUE2StorageShareRetentionPolicy': share.get_retention_policy(),
                 'GLUE2StorageShareServingState': "production",
                 # Path: A default namespace where files are logically placed when they are store
                 # into this Share. This will typically be used as a prefix when generating
@@ -277,20 +274,13 @@ class Glue2:
                 # Shares.). Expected: 1
                 'GLUE2StorageShareSharingID': data.get_token() if data.get_token() else "dedicated"
             })
-            nodes.append(node)
-            logging.debug("Added node " + str(node))
+            yield node
+            logging.debug("Added node %s", node)
 
             # GLUE2MappingPolicy
             policy_id = self._get_share_policy_id(name)
-            node = GLUE2MappingPolicy(policy_id, share_id, service_id).init()
-            vo_rules = []
-            dn_rules = []
-            for ar in data.get_approachablerules():
-                logging.debug(ar)
-                if ar.startswith('dn') and not ar in dn_rules:
-                    dn_rules.append(ar)
-                if ar.startswith('vo') and not ar in vo_rules:
-                    vo_rules.append(ar)
+            node = GLUE2MappingPolicy(policy_id, share_id, service_id, creation_time).init()
+            (dn_rules, vo_rules) = share.get_policy_rules()
             for dn_rule in dn_rules:
                 node.add({
                     'GLUE2PolicyRule': 'dn:' + dn_rule
@@ -299,47 +289,50 @@ class Glue2:
                 node.add({
                     'GLUE2PolicyRule': 'vo:' + vo_rule
                 })
-            nodes.append(node)
-            logging.debug("Added node " + str(node))
+            yield node
+            logging.debug("Added node %s", node)
 
             # Glue2StorageShareCapacities
 
             if data.get_space().has_online_capacity():
                 # Glue2StorageShareCapacity online
                 capacity_id = self._get_share_capacity_id(name, "online")
-                node = GLUE2StorageShareCapacity(capacity_id, share_id, service_id)
+                node = GLUE2StorageShareCapacity(capacity_id, share_id,
+                    service_id, creation_time)
                 node.init().add({
                     'GLUE2StorageShareCapacityType': "online",
                     'GLUE2StorageShareCapacityTotalSize':
-                        as_gigabytes(data.get_space().get_total()),
+                        gb["total"],
                     'GLUE2StorageShareCapacityFreeSize':
-                        as_gigabytes(data.get_space().get_free()),
+                        gb["free"],
                     'GLUE2StorageShareCapacityUsedSize':
-                        as_gigabytes(data.get_space().get_used()),
+                        gb["used"],
                     'GLUE2StorageShareCapacityReservedSize':
-                        as_gigabytes(data.get_space().get_reserved())
+                        gb["reserved"]
                     })
-                nodes.append(node)
-                logging.debug("Added node " + str(node))
+                yield node
+                logging.debug("Added node %s", node)
 
             if data.get_space().has_nearline_capacity():
                 # Glue2StorageShareCapacity near-line
                 capacity_id = self._get_share_capacity_id(name, "nearline")
-                node = GLUE2StorageShareCapacity(capacity_id, share_id, service_id)
+                node = GLUE2StorageShareCapacity(capacity_id, share_id,
+                    service_id, creation_time)
                 node.init().add({
                     'GLUE2StorageShareCapacityType': "nearline",
                     'GLUE2StorageShareCapacityTotalSize':
-                        as_gigabytes(data.get_space().get_nearline()),
+                        gb["nearline"],
                     'GLUE2StorageShareCapacityFreeSize':
-                        as_gigabytes(data.get_space().get_nearline()),
+                        gb["nearline"],
                     'GLUE2StorageShareCapacityUsedSize': 0,
                     'GLUE2StorageShareCapacityReservedSize': 0
                 })
-                nodes.append(node)
-                logging.debug("Added node " + str(node))
+                yield node
+                logging.debug("Added node %s", node)
 
+        used_vos = publication.get_used_VOs()
         access_policy_rules = []
-        for vo in self._configuration.get_used_VOs():
+        for vo in used_vos:
             access_policy_rules.append("vo:" + vo)
 
         # NEW LOGIC
@@ -358,7 +351,7 @@ class Glue2:
                     https_i += 1
                 else:
                     raise ValueError("unable to read a valid protocol from " + endpoint)
-                node = GLUE2WebDAVStorageEndpoint(endpoint_id, service_id)
+                node = GLUE2WebDAVStorageEndpoint(endpoint_id, service_id, creation_time)
                 node.init().add({
                     'GLUE2EndpointURL': endpoint,
                     'GLUE2EndpointImplementationVersion': storm_version,
@@ -366,32 +359,27 @@ class Glue2:
                     'GLUE2EndpointServingState': self._configuration.get_serving_state(),
                     'GLUE2EndpointIssuerCA': issuer_ca
                     })
-                nodes.append(node)
-                logging.debug("Added node " + str(node))
+                yield node
+                logging.debug("Added node %s", node)
                 # Add Endpoint Policy
                 policy_id = self._get_endpoint_policy_id(endpoint_id)
-                node = GLUE2AccessPolicy(policy_id, endpoint_id, service_id)
+                node = GLUE2AccessPolicy(policy_id, endpoint_id, service_id, creation_time)
                 node.init().add({
                     'GLUE2PolicyRule': access_policy_rules,
-                    'GLUE2PolicyUserDomainForeignKey': self._configuration.get_used_VOs()
+                    'GLUE2PolicyUserDomainForeignKey': used_vos
                     })
-                nodes.append(node)
-                logging.debug("Added node " + str(node))
-
-        return nodes
-
-    def get_update_ldif_endpoints(self, serving_state_value):
-
-        # Output
-        nodes = []
+                yield node
+                logging.debug("Added node %s", node)
 
+    def get_update_ldif_endpoints(self, serving_state_value, context=None):
         # Commons
+        creation_time = self._get_creation_time(context)
         service_ID = self._get_service_id()
 
         # Glue2StorageEndpoint SRM serving_state_value
-        node = GLUE2StorageEndpoint(self._get_srm_endpoint_id(), service_ID)
+        node = GLUE2StorageEndpoint(self._get_srm_endpoint_id(), service_ID, creation_time)
         node.add({ 'GLUE2EndpointServingState': serving_state_value })
-        nodes.append(node)
+        yield node
 
         if self._configuration.has_webdav():
 
@@ -405,104 +393,98 @@ class Glue2:
                 else:
                     raise ValueError("unable to read a valid protocol from " + endpoint)
                 # Glue2StorageEndpoint http webdav serving_state_value
-                node = GLUE2StorageEndpoint(endpoint_id, service_ID)
+                node = GLUE2StorageEndpoint(endpoint_id, service_ID, creation_time)
                 node.add({ 'GLUE2EndpointServingState': serving_state_value })
-                nodes.append(node)
+                yield node
                 i += 1
 
         elif self._configuration.has_gridhttps():
 
             # Glue2StorageEndpoint http webdav serving_state_value
             node = GLUE2StorageEndpoint(self._get_http_endpoint_id(),
-                service_ID)
+                service_ID, creation_time)
             node.add({ 'GLUE2EndpointServingState': serving_state_value })
-            nodes.append(node)
+            yield node
 
             # Glue2StorageEndpoint https webdav serving_state_value
             node = GLUE2StorageEndpoint(self._get_https_endpoint_id(),
-                service_ID)
+                service_ID, creation_time)
             node.add({ 'GLUE2EndpointServingState': serving_state_value })
-            nodes.append(node)
-
-        return nodes
-
-    def get_update_ldif_spaceinfo(self, spaceinfo, serving_state_value):
-
-        # Output
-        nodes = []
+            yield node
 
+    def get_update_ldif_spaceinfo(self, spaceinfo, serving_state_value, context=None):
         # Commons
+        creation_time = self._get_creation_time(context)
         service_ID = self._get_service_id()
+        publication = get_publication(self._configuration, spaceinfo)
+        summary = publication.get_summary_gigabytes()
 
         # Glue2StorageServiceCapacity online
         if spaceinfo.get_summary().has_online_capacity():
             sc_id = self._get_service_capacity_id("online")
-            node = GLUE2StorageServiceCapacity(sc_id, service_ID)
+            node = GLUE2StorageServiceCapacity(sc_id, service_ID, creation_time)
             node.add({
-                'GLUE2StorageServiceCapacityTotalSize':
-                    as_gigabytes(spaceinfo.get_summary().get_total()),
-                'GLUE2StorageServiceCapacityFreeSize':
-                    as_gigabytes(spaceinfo.get_summary().get_free()),
-                'GLUE2StorageServiceCapacityUsedSize':
-                    as_gigabytes(spaceinfo.get_summary().get_used()),
-                'GLUE2StorageServiceCapacityReservedSize':
-                    as_gigabytes(spaceinfo.get_summary().get_reserved())
+                'GLUE2StorageServiceCapacityTotalSize': summary["total"],
+                'GLUE2StorageServiceCapacityFreeSize': summary["free"],
+                'GLUE2StorageServiceCapacityUsedSize': summary["used"],
+                'GLUE2StorageServiceCapacityReservedSize': summary["reserved"]
             })
-            nodes.append(node)
+            yield node
 
         # Glue2StorageServiceCapacity near-line
         if spaceinfo.get_summary().has_nearline_capacity():
             sc_id = self._get_service_capacity_id("nearline")
-            node = GLUE2StorageServiceCapacity(sc_id, service_ID)
+            node = GLUE2StorageServiceCapacity(sc_id, service_ID, creation_time)
             node.add({
-                'GLUE2StorageServiceCapacityTotalSize':
-                    as_gigabytes(spaceinfo.get_summary().get_nearline()),
-                'GLUE2StorageServiceCapacityFreeSize':
-                    as_gigabytes(spaceinfo.get_summary().get_nearline()),
+                'GLUE2StorageServiceCapacityTotalSize': summary["nearline"],
+                'GLUE2StorageServiceCapacityFreeSize': summary["nearline"],
                 'GLUE2StorageServiceCapacityUsedSize': 0,
                 'GLUE2StorageServiceCapacityReservedSize': 0
             })
-            nodes.append(node)
+            yield node
 
         # Glue2Share, GLUE2MappingPolicy and Glue2StorageShareCapacity for each
         # VFS
-        for name, data in spaceinfo.get_vfs().iteritems():
+        for share in publication.get_shares():
+            name = share.get_name()
+            data = share.get_vfs()
+            gb = share.get_gigabytes()
 
             # GLUE2Share
             share_id = self._get_share_id(name)
-            node = GLUE2StorageShare(share_id, service_ID)
+            node = GLUE2StorageShare(share_id, service_ID, creation_time)
             node.add({ 'GLUE2StorageShareServingState': serving_state_value })
-            nodes.append(node)
+            yield node
 
             # Glue2StorageShareCapacity
             if data.get_space().has_online_capacity():
                 capacity_id = self._get_share_capacity_id(name, "online")
-                node = GLUE2StorageShareCapacity(capacity_id, share_id, service_ID)
+                node = GLUE2StorageShareCapacity(capacity_id, share_id,
+                    service_ID, creation_time)
                 node.add({
                     'GLUE2StorageShareCapacityTotalSize':
-                        as_gigabytes(data.get_space().get_total()),
+                        gb["total"],
                     'GLUE2StorageShareCapacityFreeSize':
-                        as_gigabytes(data.get_space().get_free()),
+                        gb["free"],
                     'GLUE2StorageShareCapacityUsedSize':
-                        as_gigabytes(data.get_space().get_used()),
+                        gb["used"],
                     'GLUE2StorageShareCapacityReservedSize':
-                        as_gigabytes(data.get_space().get_reserved())
+                        gb["reserved"]
                 })
-                nodes.append(node)
+                yield node
             if data.get_space().has_nearline_capacity():
                 capacity_id = self._get_share_capacity_id(name, "nearline")
-                node = GLUE2StorageShareCapacity(capacity_id, share_id, service_ID)
+                node = GLUE2StorageShareCapacity(capacity_id, share_id,
+                    service_ID, creation_time)
                 node.add({
                     'GLUE2StorageShareCapacityTotalSize':
-                        as_gigabytes(data.get_space().get_nearline()),
+                        gb["nearline"],
                     'GLUE2StorageShareCapacityFreeSize':
-                        as_gigabytes(data.get_space().get_nearline()),
+                        gb["nearline"],
                     'GLUE2StorageShareCapacityUsedSize': 0,
                     'GLUE2StorageShareCapacityReservedSize': 0
                 })
-                nodes.append(node)
-
-        return nodes
+                yield node
 
     def _delete_backup_files(self):
         parent_directory = os.path.dirname(GLUE2_INFO_STATIC_LDIF_FILE)
@@ -4,25 +4,34 @@ import os
 import pwd
 import string
 
+from info_provider.glue.commons import HOST_CERTIFICATE_FILE
+from info_provider.utils.file_utils import read_file, write_file_if_changed
+
 
 def create_file_from_template(dest_file, template_file, params):
     logging.debug("Creating file %s from template %s with parameters %s", dest_file, template_file, params)
-    # open files
-    ftemplate = open(template_file)
-    fconfig = open(dest_file, "w")
     # read from template ...
     logging.debug("Reading from template ...")
-    src = string.Template(ftemplate.read())
-    # ... substitute values ...       
+    src = string.Template(read_file(template_file))
+    # ... substitute values ...
     logging.debug("Substitute parameters ...")
     out = src.substitute(params)
-    # ... and write to the configuration file
+    # ... and write to the configuration file, if changed
     logging.debug("Writing on target file ...")
-    fconfig.write(out)
-    # close files
-    ftemplate.close()
-    fconfig.close()
-    return dest_file
+    return write_file_if_changed(dest_file, out)
+
+def create_files(files):
+    # files is a list of (filepath, function): each function creates its
+    # file and returns False if it was left untouched because unchanged
+    skipped = []
+    for (filepath, create) in files:
+        logging.debug("Creating %s ...", filepath)
+        if create():
+            logging.info("Successfully created %s !", filepath)
+        else:
+            logging.info("%s is unchanged, skipped", filepath)
+            skipped.append(filepath)
+    return skipped
 
 def set_owner(user, filepath):
     logging.debug("chown %s:%s %s", user, user, filepath)
@@ -36,4 +45,4 @@ def as_kilobytes(numbytes):
     return int(round(1.0 * numbytes / 1000))
 
 def get_issuer_ca():
-    return str(os.popen("openssl x509 -issuer -noout -in /etc/grid-security/hostcert.pem").read())[8:-1]
\ No newline at end of file
+    return str(os.popen("openssl x509 -issuer -noout -in %s" % HOST_CERTIFICATE_FILE).read())[8:-1]
\ No newline at end of file
@@ -0,0 +1,81 @@
+from array import array
+
+from info_provider.model.space import SpaceRecord
+
+# the SpaceRecord attributes, one column each
+METRICS = ("total", "available", "used", "free", "unavailable", "reserved", "busy",
+    "nearline")
+
+GIGABYTE = 1000000000
+KILOBYTE = 1000
+
+# sizes in bytes need 64 bit integers
+_TYPECODE = 'l' if array('l').itemsize >= 8 else 'd'
+
+
+def convert(value, unit):
+    # rounded as glue.utils.as_gigabytes and as_kilobytes do
+    return int(round(value / float(unit)))
+
+
+class CapacityTable:
+
+    # Space of the virtual file systems stored by column: one row per VFS,
+    # one array per metric, so that totals and unit conversions are
+    # computed column by column
+
+    def __init__(self):
+        self._names = []
+        self._rows = {}
+        self._columns = dict((metric, array(_TYPECODE)) for metric in METRICS)
+        self._converted = {}
+
+    def add(self, name, space):
+        self._rows[name] = len(self._names)
+        self._names.append(name)
+        for metric in METRICS:
+            self._columns[metric].append(getattr(space, metric))
+        self._converted = {}
+        return self
+
+    def get_names(self):
+        return list(self._names)
+
+    def get_row(self, name):
+        return self._rows[name]
+
+    def get_sum(self, names=None):
+        # a SpaceRecord with the totals of the given rows, all by default
+        record = SpaceRecord()
+        if names is None:
+            for metric in METRICS:
+                setattr(record, metric, long(sum(self._columns[metric])))
+            return record
+        rows = [self._rows[name] for name in names]
+        for metric in METRICS:
+            column = self._columns[metric]
+            setattr(record, metric, long(sum(column[row] for row in rows)))
+        return record
+
+    def get_converted(self, name, unit):
+        # {metric: value} of a row in the given unit, rounded as
+        # glue.utils.as_gigabytes and as_kilobytes do
+        columns = self._converted.get(unit)
+        if columns is None:
+            columns = self._convert(unit)
+            self._converted[unit] = columns
+        row = self._rows[name]
+        return dict((metric, columns[metric][row]) for metric in METRICS)
+
+    def _convert(self, unit):
+        columns = {}
+        for metric in METRICS:
+            columns[metric] = [convert(value, unit) for value in self._columns[metric]]
+        return columns
+
+
+def build_capacity_table(vfs):
+    table = CapacityTable()
+    for name, data in vfs.iteritems():
+        table.add(name, data.get_space())
+    return table
@@ -0,0 +1,115 @@
+from info_provider.model.capacity import GIGABYTE, KILOBYTE, convert
+from info_provider.model.record import Record
+
+
+class PublishedShare(Record):
+
+    # The values of a virtual file system published by GLUE1.3, GLUE2 and
+    # the JSON report, derived once
+
+    __slots__ = ("name", "vfs", "custom_token", "retention_policy", "access_latency",
+        "access_control_rule", "gigabytes", "kilobytes", "policy_rules")
+
+    def __init__(self, name, vfs, capacity, custom_token=False):
+        self.name = name
+        self.vfs = vfs
+        self.custom_token = custom_token
+        self.retention_policy = str(vfs.get_retentionpolicy()).lower()
+        self.access_latency = str(vfs.get_accesslatency()).lower()
+        self.access_control_rule = "VO:" + ",VO:".join(vfs.get_vos())
+        self.gigabytes = capacity.get_converted(name, GIGABYTE)
+        self.kilobytes = capacity.get_converted(name, KILOBYTE)
+        self.policy_rules = None
+
+    def get_name(self):
+        return self.name
+
+    def get_vfs(self):
+        return self.vfs
+
+    def has_custom_token(self):
+        return self.custom_token
+
+    def get_retention_policy(self):
+        return self.retention_policy
+
+    def get_access_latency(self):
+        return self.access_latency
+
+    def get_access_control_rule(self):
+        return self.access_control_rule
+
+    def get_gigabytes(self):
+        return self.gigabytes
+
+    def get_kilobytes(self):
+        return self.kilobytes
+
+    def get_policy_rules(self):
+        # the distinct DN and VO approachable rules, derived when first
+        # needed (by GLUE2 static nodes only): any DN is not a rule
+        if self.policy_rules is None:
+            dn_rules = []
+            vo_rules = []
+            for ar in self.vfs.get_approachablerules():
+                (dn, vo) = get_approachable_rule_fields(ar)
+                if dn and dn != "*" and not dn in dn_rules:
+                    dn_rules.append(dn)
+                if vo and not vo in vo_rules:
+                    vo_rules.append(vo)
+            self.policy_rules = (dn_rules, vo_rules)
+        return self.policy_rules
+
+
+class Publication:
+
+    # What the outputs publish of a space info: the summary sizes and the
+    # shares in the order of the virtual file systems
+
+    def __init__(self, configuration, spaceinfo):
+        summary = spaceinfo.get_summary()
+        self.summary = summary
+        self.summary_gigabytes = {
+            "total": convert(summary.get_total(), GIGABYTE),
+            "free": convert(summary.get_free(), GIGABYTE),
+            "used": convert(summary.get_used(), GIGABYTE),
+            "reserved": convert(summary.get_reserved(), GIGABYTE),
+            "nearline": convert(summary.get_nearline(), GIGABYTE)
+        }
+        capacity = spaceinfo.get_capacity()
+        self.shares = [PublishedShare(name, vfs, capacity,
+            configuration.vfs_has_custom_token(name))
+            for name, vfs in spaceinfo.get_vfs().iteritems()]
+        self.used_vos = configuration.get_used_VOs()
+
+    def get_summary(self):
+        return self.summary
+
+    def get_summary_gigabytes(self):
+        return self.summary_gigabytes
+
+    def get_shares(self):
+        return self.shares
+
+    def get_used_VOs(self):
+        return self.used_vos
+
+
+def get_approachable_rule_fields(ar):
+    # (dn, vo) of an approachable rule returned by the backend (a dict) or
+    # read from the configuration (an ApproachableRule with the DN regex
+    # split by field)
+    if isinstance(ar, dict):
+        (dn, vo) = (ar.get("dn"), ar.get("vo"))
+    else:
+        (dn, vo) = (ar.get_dn(), ar.get_vo())
+    if isinstance(dn, (list, tuple)):
+        dn = "".join(dn)
+    return (dn, vo)
+
+def get_publication(configuration, spaceinfo):
+    # built when first needed and kept by the space info, so that all the
+    # outputs rendered from the same space info share it
+    if spaceinfo.publication is None:
+        spaceinfo.publication = Publication(configuration, spaceinfo)
+    return spaceinfo.publication
@@ -0,0 +1,38 @@
+import json
+
+
+class Record(object):
+
+    # Base class of the model objects: subclasses declare their attributes
+    # in __slots__, so that instances don't carry a __dict__
+
+    __slots__ = ()
+
+    def to_dict(self):
+        # the attributes that have been set, the same json.dumps found in
+        # __dict__ when the models were plain classes
+        out = {}
+        for name in self.__slots__:
+            try:
+                out[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return out
+
+    @classmethod
+    def from_dict(cls, data):
+        # the record with the attributes returned by to_dict
+        record = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(record, name, data[name])
+        return record
+
+
+def to_json(obj):
+    return json.dumps(obj, default=_to_dict, sort_keys=True, indent=4)
+
+def _to_dict(obj):
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError("%r is not JSON serializable" % obj)
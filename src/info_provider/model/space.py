@@ -1,10 +1,21 @@
 
+from info_provider.model.record import Record
+
+# where the space of a virtual file system comes from
+SOURCE_BACKEND = "backend"
+SOURCE_LAST_KNOWN = "last-known"
+SOURCE_CONFIGURATION = "configuration"
+
+
 class SpaceInfo:
 
     def __init__(self, **data):
         self.summary = data.get("summary") if data.get("summary") else SpaceRecord()
         self.vos = data.get("vo_lists") if data.get("vo_list") else {}
         self.vfs = data.get("vfs_list") if data.get("vfs_list") else {}
+        self.capacity = data.get("capacity")
+        # the Publication rendered by all the outputs, see get_publication
+        self.publication = None
 
     def get_summary(self):
         return self.summary
@@ -15,6 +26,13 @@ class SpaceInfo:
     def get_vfs(self):
         return self.vfs
 
+    def get_capacity(self):
+        # the space of each VFS as a CapacityTable
+        if self.capacity is None:
+            from info_provider.model.capacity import build_capacity_table
+            self.capacity = build_capacity_table(self.vfs)
+        return self.capacity
+
     def __str__(self):
         str_list = []
         str_list.append("summary: %s" % self.summary)
@@ -22,41 +40,52 @@ class SpaceInfo:
         str_list.append("vfs: %s" % self.vfs)
         return "[" + ", ".join(str_list) + "]"
 
-class SpaceRecord:
+def space_info_to_dict(spaceinfo):
+    # the space info as JSON serializable data, see space_info_from_dict
+    vfs = {}
+    for name, record in spaceinfo.get_vfs().items():
+        vfs[name] = record.to_dict()
+        vfs[name]["space"] = record.get_space().to_dict()
+        # the rules read from the configuration are records, the ones
+        # returned by the backend dicts
+        vfs[name]["approachablerules"] = [ar.to_dict() if isinstance(ar, Record)
+            else ar for ar in record.get_approachablerules()]
+    return {"summary": spaceinfo.get_summary().to_dict(), "vfs": vfs}
+
+def space_info_from_dict(data):
+    vfs = {}
+    for name, vfs_data in data["vfs"].items():
+        vfs[name] = VirtualFileSystemRecord.from_dict(vfs_data)
+        vfs[name].space = SpaceRecord.from_dict(vfs_data["space"])
+    return SpaceInfo(**{
+        "summary": SpaceRecord.from_dict(data["summary"]),
+        "vfs_list": vfs
+        })
+
+class SpaceRecord(Record):
+
+    __slots__ = ("total", "available", "used", "free", "unavailable", "reserved",
+        "busy", "nearline")
 
     def __init__(self, **data):
-        self._init_as_empty()
+        get = data.get
         # initialize with default value:
-        if data.get("total"):
-            self.total = long(data.get("total"))
-        if data.get("available"):
-            self.available = long(data.get("available"))
-        else:
-            self.available = self.total
-        if data.get("used"):
-            self.used = long(data.get("used"))
-        if data.get("free"):
-            self.free = long(data.get("free"))
-        else:
-            self.free = self.total
-        if data.get("unavailable"):
-            self.unavailable = long(data.get("unavailable"))
-        if data.get("reserved"):
-            self.reserved = long(data.get("reserved"))
-        if data.get("busy"):
-            self.busy = long(data.get("busy"))
-        if data.get("near_line"):
-            self.nearline = long(data.get("near_line"))
-
-    def _init_as_empty(self):
-        self.total = 0
-        self.available = 0
-        self.used = 0
-        self.free = 0
-        self.unavailable = 0
-        self.reserved = 0
-        self.busy = 0
-        self.nearline = 0
+        value = get("total")
+        self.total = long(value) if value else 0
+        value = get("available")
+        self.available = long(value) if value else self.total
+        value = get("used")
+        self.used = long(value) if value else 0
+        value = get("free")
+        self.free = long(value) if value else self.total
+        value = get("unavailable")
+        self.unavailable = long(value) if value else 0
+        value = get("reserved")
+        self.reserved = long(value) if value else 0
+        value = get("busy")
+        self.busy = long(value) if value else 0
+        value = get("near_line")
+        self.nearline = long(value) if value else 0
 
     def get_total(self):
         return self.total
@@ -110,11 +139,13 @@ class SpaceRecord:
         str_list.append("near_line: %d" % self.nearline)
         return "[" + ", ".join(str_list) + "]"
 
-class ApproachableRule:
+class ApproachableRule(Record):
+
+    __slots__ = ("dn", "vo")
 
     def __init__(self, **data):
-        self.dn = data.get("dn") if data.get("dn") else ""
-        self.vo = data.get("vo") if data.get("vo") else ""
+        self.dn = data.get("dn") or ""
+        self.vo = data.get("vo") or ""
 
     def get_dn(self):
         return self.dn
@@ -128,20 +159,26 @@ class ApproachableRule:
         str_list.append("vo: %s" % self.vo)
         return "{" + ", ".join(str_list) + "}"
 
-class VirtualFileSystemRecord:
+class VirtualFileSystemRecord(Record):
+
+    __slots__ = ("name", "token", "vos", "root", "storageclass", "stfnroot",
+        "retentionpolicy", "accesslatency", "protocols", "space", "approachablerules",
+        "source")
 
     def __init__(self, **data):
-        self.name = data.get("name") if data.get("name") else ""
-        self.token = data.get("token") if data.get("token") else ""
-        self.vos = data.get("vos") if data.get("vos") else []
-        self.root = data.get("root") if data.get("root") else ""
-        self.storageclass = data.get("storage_class") if data.get("storage_class") else ""
-        self.stfnroot = data.get("stfn_root") if data.get("stfn_root") else []
-        self.retentionpolicy = data.get("retention_policy") if data.get("retention_policy") else ""
-        self.accesslatency = data.get("access_latency") if data.get("access_latency") else ""
-        self.protocols = data.get("protocols") if data.get("protocols") else []
-        self.space = data.get("space") if data.get("space") else SpaceRecord()
-        self.approachablerules = data.get("approachable_rules") if data.get("approachable_rules") else []
+        get = data.get
+        self.name = get("name") or ""
+        self.token = get("token") or ""
+        self.vos = get("vos") or []
+        self.root = get("root") or ""
+        self.storageclass = get("storage_class") or ""
+        self.stfnroot = get("stfn_root") or []
+        self.retentionpolicy = get("retention_policy") or ""
+        self.accesslatency = get("access_latency") or ""
+        self.protocols = get("protocols") or []
+        self.space = get("space") or SpaceRecord()
+        self.approachablerules = get("approachable_rules") or []
+        self.source = get("source") or SOURCE_BACKEND
 
     def get_name(self):
         return self.name
@@ -176,6 +213,9 @@ class VirtualFileSystemRecord:
     def get_space(self):
         return self.space
 
+    def get_source(self):
+        return self.source
+
     def __str__(self):
         str_list = []
         str_list.append("name: %s" % self.name)
@@ -193,4 +233,5 @@ class VirtualFileSystemRecord:
             ar_list.append(ar.__str__())
         str_list.append("approachable_rules: [ %s ]" % ", ".join(ar_list))
         str_list.append("space: %s" % self.space.__str__())
+        str_list.append("source: %s" % self.source)
         return "[" + ", ".join(str_list) + "]"
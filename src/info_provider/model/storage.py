@@ -3,7 +3,13 @@ import json
 import logging
 import time
 
-class StorageService:
+from info_provider.model.record import Record
+
+
+class StorageService(Record):
+
+    __slots__ = ("name", "implementationversion", "qualitylevel", "storageendpoints",
+        "storageshares", "implementation", "capabilities", "latestupdate")
 
     def __init__(self, **data):
         # required:
@@ -20,12 +26,12 @@ class StorageService:
         else:
             raise ValueError("quality_level not found")
         # initialize with default value:
-        self.storageendpoints = data.get("storage_endpoints") if data.get("storage_endpoints") else []
-        self.storageshares = data.get("storage_shares") if data.get("storage_shares") else []
+        self.storageendpoints = data.get("storage_endpoints") or []
+        self.storageshares = data.get("storage_shares") or []
         # automatic values:
         self.implementation = "storm"
         self.capabilities = ['data.management.transfer', 'data.management.storage']
-        self.latestupdate = calendar.timegm(time.gmtime())
+        self.latestupdate = data.get("timestamp") or calendar.timegm(time.gmtime())
 
     def get_name(self):
         return self.name
@@ -64,7 +70,10 @@ class StorageService:
             raise ValueError("value is not a StorageShare")
 
 
-class StorageShare:
+class StorageShare(Record):
+
+    __slots__ = ("name", "vos", "totalsize", "path", "accesslatency", "retentionpolicy",
+        "usedsize", "servingstate", "timestamp", "assignedendpoints")
 
     def __init__(self, **data):
         # required:
@@ -85,12 +94,12 @@ class StorageShare:
         else:
             raise ValueError("path not found")
         # initialize with default value:
-        self.accesslatency = data.get("access_latency") if data.get("access_latency") else AccessLatency.online()
-        self.retentionpolicy = data.get("retention_policy") if data.get("retention_policy") else RetentionPolicy.NONE
-        self.usedsize = data.get("used_size") if data.get("used_size") else 0
+        self.accesslatency = data.get("access_latency") or AccessLatency.online()
+        self.retentionpolicy = data.get("retention_policy") or RetentionPolicy.NONE
+        self.usedsize = data.get("used_size") or 0
         # automatic values:
         self.servingstate = ServingState.OPEN
-        self.timestamp = calendar.timegm(time.gmtime())
+        self.timestamp = data.get("timestamp") or calendar.timegm(time.gmtime())
         self.assignedendpoints = ["all"]
 
     def get_name(self):
@@ -126,7 +135,10 @@ class StorageShare:
     def add_vo(self,vo_name):
         self.vos.append(vo_name)
 
-class StorageEndpoint:
+class StorageEndpoint(Record):
+
+    __slots__ = ("name", "endpointurl", "interfacetype", "interfaceversion",
+        "capabilities", "qualitylevel", "assignedshares")
 
     def __init__(self, **data):
         # required:
@@ -1,7 +1,9 @@
-import logging
-import json
+from info_provider.model.record import Record, to_json
 
-class Report:
+
+class Report(Record):
+
+    __slots__ = ("storageservice",)
 
     def __init__(self, **data):
       # required:
@@ -12,4 +14,4 @@ class Report:
       return self.storageservice
 
     def to_json(self):
-      return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
+      return to_json(self)
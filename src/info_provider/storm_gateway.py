@@ -2,82 +2,410 @@ from httplib import HTTPException
 import httplib
 import json
 import logging
+import math
+import Queue
+import socket
+import threading
 import time
 from urllib2 import HTTPError, URLError
 import urllib2
 
+from info_provider.utils.cache import ResponseCache
+from info_provider.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from info_provider.utils.deadline import Deadline, DeadlineExceeded
+from info_provider.utils.file_utils import write_file_atomically, read_file
+from info_provider.utils.http_utils import HTTPConnectionPool
+
+
+class StorageAreaStatusError(Exception):
+
+    def __init__(self, failures, vfs_list=None):
+        Exception.__init__(self, "Unable to retrieve status of storage areas: %s"
+            % ", ".join(sorted(failures.keys())))
+        self.failures = failures
+        # the VFS list with the status of the other storage areas, if known
+        self.vfs_list = vfs_list
+
 
 class StormGateway:
 
-    def __init__(self, endpoint):
+    # seconds after which a backend found without bulk status support is
+    # checked again
+    BULK_STATUS_RECHECK_INTERVAL = 86400
+
+    # seconds a stale cache entry revalidation may take: the request timeout
+    # and the longest close waits for the running revalidations
+    REVALIDATION_TIMEOUT = 2
+
+    def __init__(self, endpoint, **options):
         self._endpoint = endpoint
         self._max_attempts = 5
+        self._max_workers = int(options.get("max_workers", 1))
+        # None means that bulk support has still to be detected
+        self._bulk_status = None if options.get("bulk_status", False) else False
+        # detection result shared by subsequent runs
+        self._bulk_status_file = options.get("bulk_status_file")
+        if self._bulk_status is None and self._bulk_status_file:
+            self._load_bulk_status()
+        pool_size = int(options.get("pool_size", 0))
+        self._pool = HTTPConnectionPool(endpoint, pool_size) if pool_size > 0 else None
+        # per-request socket timeout and overall time budget (seconds)
+        self._timeout = options.get("timeout")
+        self._time_budget = options.get("time_budget")
+        self.start_run()
+        # circuit breaker state shared by subsequent runs
+        self._breaker = None
+        if options.get("circuit_breaker_file"):
+            self._breaker = CircuitBreaker(options.get("circuit_breaker_file"),
+                options.get("circuit_breaker_threshold", 3),
+                options.get("circuit_breaker_reset_timeout", 300))
+        # on-disk cache of the backend responses
+        self._cache = None
+        if options.get("cache_dir"):
+            self._cache = ResponseCache(options.get("cache_dir"),
+                options.get("cache_ttl", 0), options.get("cache_stale_ttl", 0))
+        self._revalidating = set()
+        self._revalidations = []
+        self._revalidation_slots = threading.BoundedSemaphore(max(1, self._max_workers))
+        self._lock = threading.Lock()
+
+    def start_run(self):
+        # the time budget covers a single run: a long-lived gateway, like the
+        # daemon's one, starts a new run at each refresh
+        self._deadline = Deadline(self._time_budget)
+        # number of sequential calls the remaining time budget is split across
+        self._pending_calls = 1
 
     def get_endpoint(self):
         return self._endpoint
 
+    def get_deadline(self):
+        return self._deadline
+
+    def get_circuit_breaker(self):
+        return self._breaker
+
+    def get_connection_stats(self):
+        if self._pool:
+            return self._pool.get_stats()
+        return {}
+
+    def close(self):
+        # wait a little for the stale cache entries being revalidated: the
+        # stale data has been served already and a slow or unreachable
+        # backend mustn't delay the exit
+        deadline = Deadline(self.REVALIDATION_TIMEOUT)
+        for revalidation in self._revalidations:
+            revalidation.join(deadline.remaining())
+        if self._pool:
+            self._pool.close()
+
     def get_vfs_space_info(self, sa_token):
         logging.debug("Getting space info for storage area %s ...", sa_token)
         url = self._endpoint + "/info/status/" + sa_token
         response = self._get_json(url)
         return response["sa-status"]
 
+    def get_last_known_vfs_space_info(self, sa_token):
+        # the most recent status of a storage area kept by the cache, whatever
+        # its age: None if the cache is disabled or has no status for it
+        if not self._cache:
+            return None
+        status = None
+        entry = self._cache.get(self._endpoint + "/info/status/" + sa_token)
+        if entry:
+            status = entry.get_data()["sa-status"]
+        bulk_entry = self._cache.get(self._endpoint + "/info/status")
+        if bulk_entry and (not entry or bulk_entry.get_age() < entry.get_age()):
+            for bulk_status in bulk_entry.get_data()["sa-status-list"]:
+                if bulk_status["alias"] == sa_token:
+                    status = bulk_status
+        return status
+
     def get_vfs_list(self):
         logging.debug("Retrieving backend configuration from %s ...", self._endpoint)
         url = self._endpoint + "/configuration/1.4/VirtualFSList"
         response = self._get_json(url)
         return response
 
+    def get_vfs_list_space_info(self):
+        logging.debug("Getting space info of all the storage areas ...")
+        url = self._endpoint + "/info/status"
+        response = self._get_json(url, max_attempts=1)
+        out = {}
+        for status in response["sa-status-list"]:
+            out[status["alias"]] = status
+        return out
+
+    def has_bulk_status_support(self):
+        return self._bulk_status is True
+
     def get_vfs_list_with_status(self):
+        if self._breaker and not self._breaker.allow_request():
+            raise CircuitOpenError("Circuit breaker is open: backend not contacted")
+        try:
+            vfs_list = self._get_vfs_list_with_status()
+        except StorageAreaStatusError, ex:
+            # the backend is reachable if it returned the list and the status
+            # of some storage areas: the failed ones fall back one by one
+            self._record_outcome(ex.vfs_list is not None
+                and len(ex.failures) < len(ex.vfs_list))
+            raise
+        except Exception:
+            self._record_outcome(False)
+            raise
+        self._record_outcome(True)
+        return vfs_list
+
+    def _get_vfs_list_with_status(self):
+        # the list and the status retrieval
+        self._pending_calls = 2
         vfs_list = self.get_vfs_list()
+        missing = {}
+        statuses = self._fetch_bulk_status()
         for name, data in vfs_list.iteritems():
+            if data["token"] in statuses:
+                vfs_list[name]["space"] = statuses[data["token"]]
+            else:
+                missing[name] = data
+        if self._max_workers > 1 and len(missing) > 1:
+            try:
+                self._fetch_vfs_status_concurrently(missing)
+            except StorageAreaStatusError, ex:
+                # with the status of all the other storage areas
+                raise StorageAreaStatusError(ex.failures, vfs_list)
+            return vfs_list
+        self._pending_calls = len(missing)
+        failures = {}
+        for name, data in missing.iteritems():
             logging.debug("retrieving space info data for %s", name)
-            vfs_list[name]["space"] = self.get_vfs_space_info(data["token"])
+            try:
+                vfs_list[name]["space"] = self.get_vfs_space_info(data["token"])
+            except Exception, ex:
+                logging.error("Unable to retrieve space info for %s: %s", name, ex)
+                failures[name] = ex
+            self._pending_calls -= 1
+        if failures:
+            raise StorageAreaStatusError(failures, vfs_list)
+        return vfs_list
+
+    def _fetch_bulk_status(self):
+        if self._bulk_status is False:
+            return {}
+        try:
+            statuses = self.get_vfs_list_space_info()
+            self._set_bulk_status(True)
+            return statuses
+        except HTTPError as e:
+            if e.code in [400, 404, 405, 501]:
+                logging.debug("Bulk status retrieval not supported by backend (HTTP %d)", e.code)
+                self._set_bulk_status(False)
+            else:
+                logging.warning("Bulk status retrieval failed: HTTPError = %d", e.code)
+        except Exception, ex:
+            logging.warning("Bulk status retrieval failed: %s", ex)
+        logging.debug("Falling back to per storage area status retrieval ...")
+        return {}
+
+    def _set_bulk_status(self, supported):
+        changed = self._bulk_status is not supported
+        self._bulk_status = supported
+        if changed and self._bulk_status_file:
+            self._save_bulk_status()
+
+    def _load_bulk_status(self):
+        try:
+            state = json.loads(read_file(self._bulk_status_file))
+            if state["endpoint"] != self._endpoint:
+                return
+            if state["supported"]:
+                self._bulk_status = True
+            elif time.time() - float(state["detected_at"]) < self.BULK_STATUS_RECHECK_INTERVAL:
+                self._bulk_status = False
+        except IOError:
+            logging.debug("No bulk status support state found in %s", self._bulk_status_file)
+        except (ValueError, KeyError, TypeError), ex:
+            logging.warning("Ignoring invalid bulk status support state %s: %s",
+                self._bulk_status_file, ex)
+
+    def _save_bulk_status(self):
+        state = {"endpoint": self._endpoint, "supported": self._bulk_status,
+            "detected_at": time.time()}
+        try:
+            write_file_atomically(self._bulk_status_file, json.dumps(state))
+        except (IOError, OSError), ex:
+            logging.warning("Unable to save bulk status support state to %s: %s",
+                self._bulk_status_file, ex)
+
+    def _fetch_vfs_status_concurrently(self, vfs_list):
+        tasks = Queue.Queue()
+        for name, data in vfs_list.iteritems():
+            tasks.put((name, data["token"]))
+        results = {}
+        failures = {}
+
+        def worker():
+            while True:
+                try:
+                    (name, token) = tasks.get_nowait()
+                except Queue.Empty:
+                    return
+                self._pending_calls = int(math.ceil(
+                    (tasks.qsize() + 1.0) / num_workers))
+                logging.debug("retrieving space info data for %s", name)
+                try:
+                    results[name] = self.get_vfs_space_info(token)
+                except Exception, ex:
+                    logging.error("Unable to retrieve space info for %s: %s", name, ex)
+                    failures[name] = ex
+
+        num_workers = min(self._max_workers, len(vfs_list))
+        logging.debug("Retrieving space info of %d storage areas with %d workers ...",
+            len(vfs_list), num_workers)
+        workers = [threading.Thread(target=worker) for _ in range(num_workers)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        for name in results:
+            vfs_list[name]["space"] = results[name]
+        if failures:
+            raise StorageAreaStatusError(failures, vfs_list)
         return vfs_list
 
     def is_online(self):
+        if self._breaker and not self._breaker.allow_request():
+            logging.debug("Circuit breaker is open: backend considered offline")
+            return False
+        online = self._probe()
+        # a backend answering the probe may still fail to return the status:
+        # only the status retrieval closes the circuit
+        if not online:
+            self._record_outcome(False)
+        return online
+
+    def _record_outcome(self, success):
+        if not self._breaker:
+            return
+        if success:
+            self._breaker.record_success()
+        else:
+            self._breaker.record_failure()
+
+    def _probe(self):
         url = self._endpoint + "/configuration/1.3/VirtualFSList"
-        request = urllib2.Request(url)
-        request.get_method = lambda : 'HEAD'
         try:
-            response = urllib2.urlopen(request)
+            self._deadline.check("checking if backend is online")
+            response = self._urlopen(url, method='HEAD',
+                timeout=self._deadline.get_timeout(self._timeout))
             return response.code == 200
+        except DeadlineExceeded as e:
+            logging.debug("%s", e)
+            return False
         except HTTPError as e:
-            logging.debug("HTTPError = " + str(e.code))
+            logging.debug("HTTPError = %s", e.code)
             return False
         except URLError as e:
-            logging.debug("URLError = " + str(e.reason))
+            logging.debug("URLError = %s", e.reason)
             return False
         except HTTPException as e:
             logging.debug("HTTPException")
             return False
+        except socket.error as e:
+            logging.debug("socket error = %s", e)
+            return False
+
+    def _get_json(self, url, max_attempts=None):
+        if not self._cache:
+            return self._fetch_json(url, max_attempts)
+        entry = self._cache.get(url)
+        if entry and self._cache.is_fresh(entry):
+            logging.debug("Using cached response for %s (age %.1f sec)", url, entry.get_age())
+            return entry.get_data()
+        if entry and self._cache.is_stale(entry):
+            logging.debug("Using stale cached response for %s (age %.1f sec)", url, entry.get_age())
+            self._revalidate_in_background(url)
+            return entry.get_data()
+        data = self._fetch_json(url, max_attempts)
+        self._cache.put(url, data)
+        return data
+
+    def _revalidate_in_background(self, url):
+        with self._lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+        revalidation = threading.Thread(target=self._revalidate, args=(url,))
+        # not waited for at exit
+        revalidation.daemon = True
+        self._revalidations.append(revalidation)
+        revalidation.start()
 
-    def _get_json(self, url):
-        logging.debug("Getting JSON from URL: " + url)
-        max_attempts = 5
+    def _revalidate(self, url):
+        with self._revalidation_slots:
+            lock = self._cache.try_lock(url)
+            if not lock:
+                logging.debug("%s is already being revalidated", url)
+                return
+            try:
+                self._cache.put(url, self._fetch_json(url, 1,
+                    self.REVALIDATION_TIMEOUT))
+                logging.debug("Revalidated cached response for %s", url)
+            except Exception, ex:
+                logging.warning("Unable to revalidate cached response for %s: %s", url, ex)
+            finally:
+                self._cache.unlock(lock)
+
+    def _fetch_json(self, url, max_attempts=None, timeout=None):
+        logging.debug("Getting JSON from URL: %s", url)
+        max_attempts = max_attempts or self._max_attempts
         delay = 1  # sec
         attempt = 0
         while attempt <= max_attempts:
             attempt += 1
             logging.debug("Attempt %d/%d ...", attempt, max_attempts)
+            self._deadline.check("getting " + url)
             try:
-                response = urllib2.urlopen(url)
+                response = self._urlopen(url, timeout=self._get_timeout(timeout))
                 logging.debug("Response: %s", response)
                 return json.load(response)
             except HTTPError as e:
                 logging.error("HTTPError = " + str(e.code))
-                self._retry_or_fail(e, url, attempt, delay)
+                self._retry_or_fail(e, url, attempt, max_attempts, delay)
             except URLError as e:
                 logging.error("URLError = " + str(e.reason))
-                self._retry_or_fail(e, url, attempt, delay)
+                self._retry_or_fail(e, url, attempt, max_attempts, delay)
             except HTTPException as e:
                 logging.error("HTTPException")
-                self._retry_or_fail(e, url, attempt, delay)
+                self._retry_or_fail(e, url, attempt, max_attempts, delay)
+            except socket.error as e:
+                logging.error("socket error = " + str(e))
+                self._retry_or_fail(e, url, attempt, max_attempts, delay)
             delay *= 2
 
-    def _retry_or_fail(self, ex, url, attempt, delay):
-        if attempt == self._max_attempts:
+    def _get_timeout(self, timeout=None):
+        if timeout is None or (self._timeout is not None and self._timeout < timeout):
+            timeout = self._timeout
+        return self._deadline.get_timeout(timeout, self._pending_calls)
+
+    def _urlopen(self, url, method='GET', timeout=None):
+        if self._pool:
+            return self._pool.urlopen(url, method, timeout)
+        request = url
+        if method != 'GET':
+            request = urllib2.Request(url)
+            request.get_method = lambda : method
+        if timeout is None:
+            return urllib2.urlopen(request)
+        return urllib2.urlopen(request, timeout=timeout)
+
+    def _retry_or_fail(self, ex, url, attempt, max_attempts, delay):
+        if attempt == max_attempts:
             logging.error("Unable to contact %s after %d attempts", url, attempt)
             raise ex
+        remaining = self._deadline.remaining()
+        if remaining is not None and remaining <= delay:
+            logging.error("Unable to contact %s - no time left for another attempt", url)
+            raise ex
         logging.warning("Unable to contact %s - %s seconds to the next attempt ...", url, delay)
         time.sleep(delay)
\ No newline at end of file
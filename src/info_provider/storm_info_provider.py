@@ -1,20 +1,21 @@
 import logging
 import os
 import sys
+from StringIO import StringIO
 
-from info_provider.glue.glue13 import Glue13
-from info_provider.glue.glue2 import Glue2
 from info_provider.storm_gateway import StormGateway
 from info_provider.storm_space_info_builder import SpaceInfoBuilder
-from info_provider.storm_storage_service_builder import StorageServiceBuilder
+from info_provider.utils.file_utils import write_file_atomically
 from info_provider.utils.ldap_utils import LDIFExporter
-from info_provider.report import Report
+from info_provider.utils.run_context import RunContext
 
 
 class StormInfoProvider:
 
     GET_IMPLEMENTATION_VERSION_CMD = "rpm -q --queryformat='%{VERSION}' storm-backend-server"
 
+    UPDATE_LDIF_FILENAME = "storm-%s-update.ldif"
+
     def __init__(self, **args):
         logging.debug("StormInfoProvider initialization ...")
         # set configuration
@@ -23,96 +24,195 @@ class StormInfoProvider:
         self._configuration = args["configuration"]
         # set gateway
         if not args.get("gateway"):
-            self._gateway = StormGateway(self._configuration.get_backend_rest_endpoint())
+            self._gateway = StormGateway(
+                self._configuration.get_backend_rest_endpoint(),
+                **self._configuration.get_gateway_options())
         else:
             self._gateway = args["gateway"]
-        # set Glue13
-        if not args.get("glue13"):
+        # set Glue13 and Glue2 (created when first needed if not provided)
+        self._glue13 = args.get("glue13")
+        self._glue2 = args.get("glue2")
+        # set space info single-flight coordination (optional)
+        self._single_flight = args.get("single_flight")
+
+    def start_run(self):
+        self._gateway.start_run()
+
+    def _get_glue13(self):
+        if not self._glue13:
+            from info_provider.glue.glue13 import Glue13
             self._glue13 = Glue13(self._configuration)
-        else:
-            self._glue13 = args["glue13"]
-        # set Glue2
-        if not args.get("glue2"):
+        return self._glue13
+
+    def _get_glue2(self):
+        if not self._glue2:
+            from info_provider.glue.glue2 import Glue2
             self._glue2 = Glue2(self._configuration)
-        else:
-            self._glue2 = args["glue2"]
+        return self._glue2
+
+    def _build_space_info(self):
+        builder = SpaceInfoBuilder(self._configuration, self._gateway)
+        if self._single_flight:
+            return self._single_flight.run(builder.build)
+        return builder.build()
 
-    def _create_json_report(self, spaceinfo, outputfilepath):
+    def _create_json_report(self, spaceinfo, outputfilepath, context=None):
         # create report JSON
-        storage_service = StorageServiceBuilder(self._configuration, spaceinfo).build()
-        report = Report(storage_service=storage_service)
-        self._save_string_to_file(outputfilepath, report.to_json())
+        self._save_string_to_file(outputfilepath,
+            self._get_json_report(spaceinfo, context))
+
+    def _get_json_report(self, spaceinfo, context=None):
+        from info_provider.storm_storage_service_builder import StorageServiceBuilder
+        from info_provider.report import Report
+        storage_service = StorageServiceBuilder(self._configuration, spaceinfo,
+            context).build()
+        return Report(storage_service=storage_service).to_json()
 
     def configure(self, glue_protocol, exported_json_file_path):
         logging.debug("Configure ...")
+        context = RunContext()
         # load space info
-        spaceinfo = SpaceInfoBuilder(self._configuration, self._gateway).build()
+        spaceinfo = self._build_space_info()
+        skipped = []
         # configure Glue13 info
         if glue_protocol in ['glue13', 'all']:
-            self._glue13.configure(spaceinfo)
+            skipped.extend(self._get_glue13().configure(spaceinfo))
         # configure Glue2 info
         if glue_protocol in ['glue2', 'all']:
-            self._glue2.configure(spaceinfo)
+            skipped.extend(self._get_glue2().configure(spaceinfo, context))
+        if skipped:
+            logging.info("Skipped %d unchanged files: %s", len(skipped),
+                ", ".join(skipped))
         # create report json
-        self._create_json_report(spaceinfo, exported_json_file_path)
-        return
+        self._create_json_report(spaceinfo, exported_json_file_path, context)
+        return skipped
 
     def get_static_ldif(self, glue_protocol):
         logging.debug("Get static LDIF ...")
+        context = RunContext()
 
         # load space info
-        spaceinfo = SpaceInfoBuilder(self._configuration, self._gateway).build()
+        spaceinfo = self._build_space_info()
 
-        exporter = LDIFExporter()
+        # written only once complete, so that a failure leaves no partial LDIF
+        stream = StringIO()
+        exporter = LDIFExporter(stream)
 
         # get Glue13 static LDIF info
         if glue_protocol in ['glue13']:
-            exporter.add_nodes(self._glue13.get_static_ldif_nodes(spaceinfo))
+            exporter.add_nodes(self._get_glue13().get_static_ldif_nodes(spaceinfo))
 
         # get Glue2 static LDIF info
         if glue_protocol in ['glue2']:
-            exporter.add_nodes(self._glue2.get_static_ldif_nodes(spaceinfo))
+            exporter.add_nodes(self._get_glue2().get_static_ldif_nodes(spaceinfo,
+                context))
 
-        exporter.print_nodes(sys.stdout)
+        exporter.flush()
+        sys.stdout.write(stream.getvalue())
         return
 
-    def get_update_ldif(self, glue_protocol):
+    def get_update_ldif(self, glue_protocol, delta_state=None):
         logging.debug("Get update LDIF ...")
 
+        # nodes published last time, if only the changed ones are written
+        published = None
+        if delta_state:
+            published = delta_state.load()
+            if published is None:
+                published = {}
+
         # check serving state
         serving_state = self._configuration.get_serving_state()
         if serving_state == "closed":
             # Backend is declared not running
             logging.debug("StoRM Backend is not running")
-            # update endpoints serving state
-            if glue_protocol in ['glue2']:
-                exporter = LDIFExporter()
-                exporter.add_nodes(self._glue2.get_update_ldif_endpoints(serving_state))
-                exporter.print_nodes(sys.stdout)
-                return
-            return
-
-        # load space info
-        spaceinfo = SpaceInfoBuilder(self._configuration, self._gateway).build()
+            spaceinfo = None
+        else:
+            # load space info
+            spaceinfo = self._build_space_info()
+
+        # written only once complete, so that a failure leaves no partial LDIF
+        stream = StringIO()
+        exporter = self._export_update_ldif(glue_protocol, spaceinfo, stream,
+            published)
+        sys.stdout.write(stream.getvalue())
+        if delta_state:
+            logging.debug("Skipped %d unchanged nodes", exporter.skipped)
+            delta_state.save(exporter.get_digests())
+        return
 
-        exporter = LDIFExporter()
+    def _export_update_ldif(self, glue_protocol, spaceinfo, stream, published=None,
+        context=None):
+        serving_state = self._configuration.get_serving_state()
+        if context is None:
+            context = RunContext()
+        exporter = LDIFExporter(stream, published)
+        if serving_state == "closed":
+            # update endpoints serving state
+            if glue_protocol in ['glue2', 'all']:
+                exporter.add_nodes(self._get_glue2().get_update_ldif_endpoints(
+                    serving_state, context))
+                exporter.flush()
+            return exporter
 
         # get Glue13 update LDIF info
-        if glue_protocol in ['glue13']:
-            exporter.add_nodes(self._glue13.get_update_ldif_nodes(spaceinfo))
+        if glue_protocol in ['glue13', 'all']:
+            exporter.add_nodes(self._get_glue13().get_update_ldif_nodes(spaceinfo))
 
         # get Glue2 update LDIF info
-        if glue_protocol in ['glue2']:
-            exporter.add_nodes(self._glue2.get_update_ldif_endpoints(serving_state))
-            exporter.add_nodes(self._glue2.get_update_ldif_spaceinfo(spaceinfo, serving_state))
-
-        exporter.print_nodes(sys.stdout)
-        return
+        if glue_protocol in ['glue2', 'all']:
+            exporter.add_nodes(self._get_glue2().get_update_ldif_endpoints(
+                serving_state, context))
+            exporter.add_nodes(self._get_glue2().get_update_ldif_spaceinfo(
+                spaceinfo, serving_state, context))
+
+        exporter.flush()
+        return exporter
+
+    def get_outputs(self):
+        logging.debug("Get outputs ...")
+        # render all the outputs served by the daemon from a single space info
+        spaceinfo = self._build_space_info()
+        # and the same clock
+        context = RunContext()
+        outputs = {}
+        for glue_protocol in ['glue13', 'glue2']:
+            stream = StringIO()
+            self._export_update_ldif(glue_protocol, spaceinfo, stream, context=context)
+            outputs["get-update-ldif " + glue_protocol] = stream.getvalue()
+        outputs["get-update-ldif all"] = outputs["get-update-ldif glue13"] + \
+            outputs["get-update-ldif glue2"]
+        try:
+            outputs["get-report-json"] = self._get_json_report(spaceinfo, context)
+        except Exception, ex:
+            # the LDIF outputs are still served
+            logging.error("Unable to build JSON report: %s", ex)
+        return outputs
+
+    def publish(self, output_dir, exported_json_file_path):
+        logging.debug("Publish ...")
+        # write the outputs rendered from a single space info, each of them
+        # atomically, so that readers never see a partial file
+        outputs = self.get_outputs()
+        published = []
+        for glue_protocol in ['glue13', 'glue2']:
+            filepath = os.path.join(output_dir,
+                self.UPDATE_LDIF_FILENAME % glue_protocol)
+            write_file_atomically(filepath,
+                outputs["get-update-ldif " + glue_protocol])
+            published.append(filepath)
+        # the previous report is kept if it couldn't be built
+        if "get-report-json" in outputs:
+            write_file_atomically(exported_json_file_path,
+                outputs["get-report-json"])
+            published.append(exported_json_file_path)
+        logging.info("Published %s", ", ".join(published))
+        return published
 
     def get_report_json(self, exported_json_file_path):
         logging.debug("Get report JSON ...")
         # load space info
-        spaceinfo = SpaceInfoBuilder(self._configuration, self._gateway).build()
+        spaceinfo = self._build_space_info()
         # create report JSON
         self._create_json_report(spaceinfo, exported_json_file_path)
         logging.info("Exported JSON report to %s", exported_json_file_path)
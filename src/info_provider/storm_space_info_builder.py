@@ -1,7 +1,11 @@
 import logging
-import json
 
-from info_provider.model.space import SpaceInfo, SpaceRecord, VirtualFileSystemRecord
+from info_provider.model.capacity import CapacityTable
+from info_provider.model.record import to_json
+from info_provider.model.space import SpaceInfo, SpaceRecord, VirtualFileSystemRecord, \
+    SOURCE_BACKEND, SOURCE_LAST_KNOWN, SOURCE_CONFIGURATION
+from info_provider.storm_gateway import StorageAreaStatusError
+from info_provider.utils.log_utils import lazy
 
 class SpaceInfoBuilder:
 
@@ -13,7 +17,7 @@ class SpaceInfoBuilder:
         return self._load_space_info()
 
     def _as_JSON(self, obj):
-        return json.dumps(obj, default=lambda o: o.__dict__, sort_keys=True, indent=4)
+        return to_json(obj)
 
     def _load_space_info(self):
         serving_state = self._configuration.get_serving_state()
@@ -22,6 +26,12 @@ class SpaceInfoBuilder:
             return self._build_from_configuration()
         try:
             return self._build_from_remote_response()
+        except StorageAreaStatusError, ex:
+            logging.error('%s', ex)
+            if ex.vfs_list is None or \
+                self._configuration.get_space_info_fallback() != "merge":
+                return self._build_from_configuration()
+            return self._build_from_partial_response(ex.vfs_list, ex.failures)
         except Exception, ex:
             logging.error('%s', ex)
             return self._build_from_configuration()
@@ -55,42 +65,65 @@ class SpaceInfoBuilder:
                 "access_latency": self._configuration.get_sa_access_latency(sa),
                 "protocols": self._configuration.get_enabled_access_protocols(),
                 "approachable_rules": self._configuration.get_sa_approachable_rules(sa),
-                "space": SpaceRecord(**{
-                    "total": self._configuration.get_online_size(sa=sa),
-                    "near_line": self._configuration.get_nearline_size(sa=sa)
-                    }),
+                "space": self._get_configured_space(sa),
+                "source": SOURCE_CONFIGURATION
                 })
-        logging.debug("Summary: %s", summary.__str__())
-        logging.debug("VOs: %s", vos.__str__())
-        logging.debug("VFS-list: %s", vfs.__str__())
+        logging.debug("Summary: %s", summary)
+        logging.debug("VOs: %s", vos)
+        logging.debug("VFS-list: %s", vfs)
         return SpaceInfo(**{
             "summary": summary,
             "vo_list": vos,
             "vfs_list": vfs
             })
 
+    def _get_configured_space(self, sa):
+        return SpaceRecord(**{
+            "total": self._configuration.get_online_size(sa=sa),
+            "near_line": self._configuration.get_nearline_size(sa=sa)
+            })
+
+    def _get_configured_vfs_space(self, name):
+        # the configured sizes of a VFS returned by the backend, if any
+        for sa in self._configuration.get_storage_area_list():
+            if self._configuration.get_sa_short(sa) + "-FS" == name:
+                return self._get_configured_space(sa)
+        return SpaceRecord()
+
     def _build_from_remote_response(self):
         logging.debug("Initializing space info from remote storm response ...")
-        response = self._gateway.get_vfs_list_with_status()
-        summary = SpaceRecord(**{
-            "total": 0,
-            "near_line": 0
-            })
+        return self._build_from_response(self._gateway.get_vfs_list_with_status())
+
+    def _build_from_partial_response(self, response, failures):
+        # keep the retrieved storage areas, the others get their last known
+        # status or, if none, their configured sizes
+        logging.debug("Merging space info of the storage areas not retrieved ...")
+        sources = {}
+        for name in failures:
+            status = self._gateway.get_last_known_vfs_space_info(response[name]["token"])
+            if status is not None:
+                response[name]["space"] = status
+                sources[name] = SOURCE_LAST_KNOWN
+            else:
+                sources[name] = SOURCE_CONFIGURATION
+            logging.warning("Using %s space info for %s", sources[name], name)
+        return self._build_from_response(response, sources)
+
+    def _build_from_response(self, response, sources=None):
+        # sources maps the names of the VFS not retrieved from the backend
+        # to the source of their space
+        sources = sources or {}
+        capacity = CapacityTable()
         vfs = {}
-        vos = {}
+        vo_vfs = {}
         for name, data in response.items():
 
-            space = SpaceRecord(**{
-                "total": long(data["space"]["total-space"]),
-                "available": long(data["space"]["available-space"]),
-                "used": long(data["space"]["used-space"]),
-                "free": long(data["space"]["free-space"]),
-                "unavailable": long(data["space"]["unavailable-space"]),
-                "reserved": long(data["space"]["reserved-space"]),
-                "busy": long(data["space"]["busy-space"]),
-                "near_line": long(data["availableNearlineSpace"])
-                })
-            logging.debug("%s", self._as_JSON(space))
+            source = sources.get(name, SOURCE_BACKEND)
+            if source == SOURCE_CONFIGURATION:
+                space = self._get_configured_vfs_space(name)
+            else:
+                space = self._get_space(data)
+            logging.debug("%s", lazy(self._as_JSON, space))
             vfs[name] = VirtualFileSystemRecord(**{
                 "name": name,
                 "token": data["token"],
@@ -102,34 +135,40 @@ class SpaceInfoBuilder:
                 "access_latency": data["accessLatency"],
                 "protocols": data["protocols"],
                 "approachable_rules": data["approachableRules"],
-                "space": space
+                "space": space,
+                "source": source
                 })
-            logging.debug("%s", self._as_JSON(vfs[name]))
+            logging.debug("%s", lazy(self._as_JSON, vfs[name]))
+            capacity.add(name, space)
 
-            # add/update VO space info
+            # VFS accounted in the VO space info
             if not "*" in data["vos"]:
                 for vo_name in data["vos"]:
-                    if not vo_name in vos:
-                        vos[vo_name] = SpaceRecord(**{
-                            "total": long(data["space"]["total-space"]),
-                            "available": long(data["space"]["available-space"]),
-                            "used": long(data["space"]["used-space"]),
-                            "free": long(data["space"]["free-space"]),
-                            "unavailable": long(data["space"]["unavailable-space"]),
-                            "reserved": long(data["space"]["reserved-space"]),
-                            "busy": long(data["space"]["busy-space"]),
-                            "near_line": long(data["availableNearlineSpace"])
-                            })
-                    else:
-                        vos[vo_name].sum(space)
-
-            # update summary
-            summary.sum(space)
-
-        logging.debug("%s", self._as_JSON(summary))
+                    vo_vfs.setdefault(vo_name, []).append(name)
+
+        # summary and VO space info are column totals
+        summary = capacity.get_sum()
+        vos = {}
+        for vo_name, names in vo_vfs.iteritems():
+            vos[vo_name] = capacity.get_sum(names)
+
+        logging.debug("%s", lazy(self._as_JSON, summary))
 
         return SpaceInfo(**{
             "summary": summary,
             "vo_list": vos,
-            "vfs_list": vfs
+            "vfs_list": vfs,
+            "capacity": capacity
+            })
+
+    def _get_space(self, data):
+        return SpaceRecord(**{
+            "total": long(data["space"]["total-space"]),
+            "available": long(data["space"]["available-space"]),
+            "used": long(data["space"]["used-space"]),
+            "free": long(data["space"]["free-space"]),
+            "unavailable": long(data["space"]["unavailable-space"]),
+            "reserved": long(data["space"]["reserved-space"]),
+            "busy": long(data["space"]["busy-space"]),
+            "near_line": long(data["availableNearlineSpace"])
             })
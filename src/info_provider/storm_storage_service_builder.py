@@ -2,32 +2,38 @@ import logging
 
 from urlparse import urlparse
 
+from info_provider.model.publication import get_publication
 from info_provider.model.storage import StorageShare, StorageEndpoint, \
     StorageService
+from info_provider.utils.run_context import RunContext
 
 
 class StorageServiceBuilder:
 
-    def __init__(self, configuration, space_info):
+    def __init__(self, configuration, space_info, context=None):
         self._configuration = configuration
         self._spaceinfo = space_info
+        self._context = context or RunContext()
 
     def build(self):
         sitename = self._configuration.get_sitename()
         version = self._configuration.get_implementation_version()
         quality_level = self._configuration.get_quality_level()
+        timestamp = self._context.get_timestamp()
 
-        service = StorageService(name=sitename, version=version, quality_level=quality_level)
+        service = StorageService(name=sitename, version=version, quality_level=quality_level, timestamp=timestamp)
 
-        for name, vfs in self._spaceinfo.get_vfs().items():
-            access_latency = vfs.get_accesslatency().lower()
-            retention_policy = vfs.get_retentionpolicy().lower()
+        publication = get_publication(self._configuration, self._spaceinfo)
+        for share in publication.get_shares():
+            vfs = share.get_vfs()
+            access_latency = share.get_access_latency()
+            retention_policy = share.get_retention_policy()
             total_size = vfs.get_space().get_total()
             used_size = vfs.get_space().get_used()
             paths = vfs.get_stfnroot()
             vos = vfs.get_vos()
             token = vfs.get_token()
-            sa = StorageShare(name=token, access_latency=access_latency, retention_policy=retention_policy, total_size=total_size, used_size=used_size, path=paths, vo_list=vos)
+            sa = StorageShare(name=token, access_latency=access_latency, retention_policy=retention_policy, total_size=total_size, used_size=used_size, path=paths, vo_list=vos, timestamp=timestamp)
             service.add_share(sa)
 
         srm_endpoint_url = self._configuration.get_public_srm_endpoint()
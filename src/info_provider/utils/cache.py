@@ -0,0 +1,87 @@
+import errno
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import time
+
+from info_provider.utils.file_utils import write_file_atomically, read_file, \
+    make_dirs
+
+
+class CacheEntry:
+
+    def __init__(self, data, timestamp):
+        self._data = data
+        self._timestamp = timestamp
+
+    def get_data(self):
+        return self._data
+
+    def get_age(self):
+        return time.time() - self._timestamp
+
+
+class ResponseCache:
+
+    def __init__(self, directory, ttl, stale_ttl=0):
+        self._directory = directory
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+
+    def get_directory(self):
+        return self._directory
+
+    def get(self, key):
+        filepath = self._get_filepath(key)
+        try:
+            entry = json.loads(read_file(filepath))
+        except IOError:
+            return None
+        except ValueError, ex:
+            logging.warning("Ignoring invalid cache entry %s: %s", filepath, ex)
+            return None
+        if entry.get("key") != key:
+            return None
+        return CacheEntry(entry["data"], entry["timestamp"])
+
+    def put(self, key, data):
+        entry = {"key": key, "timestamp": time.time(), "data": data}
+        try:
+            write_file_atomically(self._get_filepath(key), json.dumps(entry))
+        except (IOError, OSError), ex:
+            logging.warning("Unable to cache response for %s: %s", key, ex)
+
+    def is_fresh(self, entry):
+        return entry.get_age() <= self._ttl
+
+    def is_stale(self, entry):
+        # expired but still usable while it is revalidated
+        return not self.is_fresh(entry) and entry.get_age() <= self._ttl + self._stale_ttl
+
+    def try_lock(self, key):
+        # non-blocking exclusive lock, used to revalidate an entry only once
+        # among concurrent processes; returns None if it is already taken
+        try:
+            if not os.path.isdir(self._directory):
+                make_dirs(self._directory)
+            f = open(self._get_filepath(key) + ".lock", 'a')
+        except (IOError, OSError), ex:
+            logging.warning("Unable to lock cache entry for %s: %s", key, ex)
+            return None
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except IOError, ex:
+            f.close()
+            if ex.errno in (errno.EAGAIN, errno.EACCES):
+                return None
+            raise
+        return f
+
+    def unlock(self, lock):
+        fcntl.flock(lock, fcntl.LOCK_UN)
+        lock.close()
+
+    def _get_filepath(self, key):
+        return os.path.join(self._directory, hashlib.sha1(key).hexdigest() + ".json")
@@ -0,0 +1,77 @@
+import json
+import logging
+import time
+
+from info_provider.utils.file_utils import write_file_atomically, read_file
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, state_file, failure_threshold=3, reset_timeout=300):
+        self._state_file = state_file
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._open_until = 0
+        self._load()
+
+    def get_state(self):
+        if self._failures < self._failure_threshold:
+            return self.CLOSED
+        if time.time() < self._open_until:
+            return self.OPEN
+        # reset timeout elapsed: let a probe request through
+        return self.HALF_OPEN
+
+    def get_failures(self):
+        return self._failures
+
+    def get_open_until(self):
+        return self._open_until
+
+    def allow_request(self):
+        return self.get_state() != self.OPEN
+
+    def record_success(self):
+        if self._failures == 0:
+            return
+        if self.get_state() == self.HALF_OPEN:
+            logging.info("Backend is reachable again: closing circuit breaker")
+        self._failures = 0
+        self._open_until = 0
+        self._save()
+
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self._failure_threshold:
+            self._open_until = time.time() + self._reset_timeout
+            logging.warning("Backend failed %d consecutive times: circuit breaker "
+                "open for %d seconds", self._failures, self._reset_timeout)
+        self._save()
+
+    def _load(self):
+        try:
+            state = json.loads(read_file(self._state_file))
+            self._failures = int(state["failures"])
+            self._open_until = float(state["open_until"])
+        except IOError:
+            logging.debug("No circuit breaker state found in %s", self._state_file)
+        except (ValueError, KeyError, TypeError), ex:
+            logging.warning("Ignoring invalid circuit breaker state %s: %s",
+                self._state_file, ex)
+
+    def _save(self):
+        state = {"failures": self._failures, "open_until": self._open_until}
+        try:
+            write_file_atomically(self._state_file, json.dumps(state))
+        except (IOError, OSError), ex:
+            logging.warning("Unable to save circuit breaker state to %s: %s",
+                self._state_file, ex)
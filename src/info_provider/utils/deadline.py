@@ -0,0 +1,38 @@
+import time
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+
+    def __init__(self, budget=None):
+        self._budget = budget
+        self._expires_at = time.time() + budget if budget is not None else None
+
+    def get_budget(self):
+        return self._budget
+
+    def remaining(self):
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.time())
+
+    def expired(self):
+        return self._expires_at is not None and self.remaining() <= 0
+
+    def check(self, what):
+        if self.expired():
+            raise DeadlineExceeded("Time budget of %s sec exhausted before %s"
+                % (self._budget, what))
+
+    def get_timeout(self, timeout=None, calls=1):
+        # split the remaining time between the calls that still have to be done
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        share = remaining / max(1, calls)
+        if timeout is None:
+            return share
+        return min(timeout, share)
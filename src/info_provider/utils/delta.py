@@ -0,0 +1,52 @@
+import json
+import logging
+import time
+
+from info_provider.utils.file_utils import write_file_atomically, read_file
+
+
+class DeltaState:
+
+    # The nodes published by the last update LDIF, as {dn: digest}, used to
+    # write only the nodes that changed since then. A complete output is
+    # written when forced, when there is no valid state and at least every
+    # refresh_interval seconds
+
+    def __init__(self, state_file, refresh_interval=3600, force=False):
+        self._state_file = state_file
+        self._refresh_interval = refresh_interval
+        self._force = force
+        self._published_at = None
+
+    def load(self):
+        # the published nodes, None if a complete output must be written
+        self._published_at = None
+        if self._force:
+            logging.debug("Complete update LDIF forced")
+            return None
+        try:
+            state = json.loads(read_file(self._state_file))
+        except IOError:
+            logging.debug("No published nodes found in %s", self._state_file)
+            return None
+        except ValueError, ex:
+            logging.warning("Ignoring invalid published nodes %s: %s",
+                self._state_file, ex)
+            return None
+        if not isinstance(state, dict) or not isinstance(state.get("nodes"), dict):
+            return None
+        published_at = state.get("published_at")
+        if not published_at or time.time() - published_at > self._refresh_interval:
+            logging.debug("Published nodes older than %s sec", self._refresh_interval)
+            return None
+        self._published_at = published_at
+        return state["nodes"]
+
+    def save(self, published):
+        # the refresh interval counts from the last complete output
+        state = {"published_at": self._published_at or time.time(), "nodes": published}
+        try:
+            write_file_atomically(self._state_file, json.dumps(state))
+        except (IOError, OSError), ex:
+            logging.warning("Unable to save published nodes to %s: %s",
+                self._state_file, ex)
@@ -0,0 +1,68 @@
+import hashlib
+import os
+import stat
+import tempfile
+
+
+def make_dirs(directory):
+    try:
+        os.makedirs(directory)
+    except OSError:
+        # it may have been created by a concurrent process
+        if not os.path.isdir(directory):
+            raise
+    return directory
+
+def write_file_atomically(filepath, content, mode=0644):
+    directory = os.path.dirname(os.path.abspath(filepath))
+    if not os.path.isdir(directory):
+        make_dirs(directory)
+    # write a temporary file in the same directory and rename it over the
+    # destination, so readers see either the old or the new content
+    (fd, tmp_filepath) = tempfile.mkstemp(dir=directory,
+        prefix="." + os.path.basename(filepath) + ".")
+    try:
+        f = os.fdopen(fd, 'w')
+        try:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+        os.chmod(tmp_filepath, mode)
+        os.rename(tmp_filepath, filepath)
+    except:
+        os.remove(tmp_filepath)
+        raise
+    return filepath
+
+def write_file_if_changed(filepath, content, mode=0644):
+    # the file is replaced only if its content differs, so that its
+    # modification time changes only when needed: returns True if written
+    if get_file_digest(filepath) == hashlib.sha1(content).hexdigest():
+        if stat.S_IMODE(os.stat(filepath).st_mode) != mode:
+            os.chmod(filepath, mode)
+        return False
+    write_file_atomically(filepath, content, mode)
+    return True
+
+def get_file_digest(filepath):
+    # SHA-1 of the file content, None if it can't be read
+    try:
+        f = open(filepath, 'rb')
+    except IOError:
+        return None
+    try:
+        digest = hashlib.sha1()
+        for chunk in iter(lambda: f.read(65536), ""):
+            digest.update(chunk)
+        return digest.hexdigest()
+    finally:
+        f.close()
+
+def read_file(filepath):
+    f = open(filepath, 'r')
+    try:
+        return f.read()
+    finally:
+        f.close()
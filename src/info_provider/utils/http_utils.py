@@ -0,0 +1,107 @@
+import httplib
+import logging
+import Queue
+import socket
+import threading
+from StringIO import StringIO
+from urllib import addinfourl
+from urllib2 import HTTPError, URLError
+from urlparse import urlparse
+
+
+class HTTPConnectionPool:
+
+    def __init__(self, endpoint, size):
+        url = urlparse(endpoint)
+        self._host = url.hostname
+        self._port = url.port
+        self._connections = Queue.LifoQueue(size)
+        self._lock = threading.Lock()
+        self._new_connections = 0
+        self._reused_connections = 0
+
+    def get_stats(self):
+        return {
+            "new_connections": self._new_connections,
+            "reused_connections": self._reused_connections
+        }
+
+    def urlopen(self, url, method="GET", timeout=None):
+        parsed = urlparse(url)
+        path = parsed.path + ("?" + parsed.query if parsed.query else "")
+        (connection, reused) = self._acquire()
+        self._set_timeout(connection, timeout)
+        try:
+            response = self._send(connection, method, path)
+        except socket.timeout, ex:
+            connection.close()
+            raise URLError(ex)
+        except (httplib.BadStatusLine, httplib.CannotSendRequest, socket.error), ex:
+            connection.close()
+            if not reused:
+                raise self._as_url_error(ex)
+            # the server has closed the idle keep-alive connection: retry once
+            logging.debug("Pooled connection to %s:%s is stale, reconnecting ...",
+                self._host, self._port)
+            connection = self._new_connection()
+            self._set_timeout(connection, timeout)
+            try:
+                response = self._send(connection, method, path)
+            except (httplib.BadStatusLine, httplib.CannotSendRequest, socket.error), ex:
+                connection.close()
+                raise self._as_url_error(ex)
+        try:
+            body = response.read()
+        except socket.error, ex:
+            connection.close()
+            raise URLError(ex)
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+        if response.status < 200 or response.status >= 300:
+            raise HTTPError(url, response.status, response.reason, response.msg,
+                StringIO(body))
+        return addinfourl(StringIO(body), response.msg, url, response.status)
+
+    def close(self):
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except Queue.Empty:
+                return
+
+    def _set_timeout(self, connection, timeout):
+        connection.timeout = timeout
+        if connection.sock:
+            connection.sock.settimeout(timeout)
+
+    def _send(self, connection, method, path):
+        connection.request(method, path, headers={"Connection": "keep-alive"})
+        return connection.getresponse()
+
+    def _acquire(self):
+        try:
+            connection = self._connections.get_nowait()
+        except Queue.Empty:
+            return (self._new_connection(), False)
+        with self._lock:
+            self._reused_connections += 1
+        return (connection, True)
+
+    def _new_connection(self):
+        with self._lock:
+            self._new_connections += 1
+        logging.debug("Opening new connection to %s:%s ...", self._host, self._port)
+        return httplib.HTTPConnection(self._host, self._port)
+
+    def _release(self, connection):
+        try:
+            self._connections.put_nowait(connection)
+        except Queue.Full:
+            connection.close()
+
+    def _as_url_error(self, ex):
+        if isinstance(ex, socket.error):
+            return URLError(ex)
+        return ex
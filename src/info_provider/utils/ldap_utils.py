@@ -1,12 +1,50 @@
+import base64
+import hashlib
 import logging
+import re
+from StringIO import StringIO
 
-from ldif import LDIFWriter
+from info_provider.utils.file_utils import write_file_if_changed, read_file
+
+
+# values matching this pattern are base64 encoded, as python-ldap does
+SAFE_STRING_RE = re.compile('(^(\000|\n|\r| |:|<)|[\000\n\r\200-\377]+|[ ]+$)')
+
+
+def as_values(value):
+    # the list of strings stored as the values of an entry
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    if isinstance(value, basestring):
+        return [value]
+    return [str(value)]
+
+
+class LDIFNodeTemplate:
+
+    # The parts shared by all the nodes of a class, prepared once: the DN
+    # pattern and the constant entries, already normalized as LDIFNode.add
+    # does. Only the variable entries are filled in per node.
+
+    def __init__(self, dn_pattern, constant_entries):
+        self.dn_pattern = dn_pattern
+        self.constant_entries = dict((name, as_values(value))
+            for name, value in constant_entries.iteritems())
+
+    def get_dn(self, *ids):
+        return self.dn_pattern % ids
+
+    def get_entries(self):
+        # the values lists are shared: LDIFNode.add replaces them, never
+        # changes them in place
+        return dict(self.constant_entries)
 
 
 class LDIFNode:
 
-    def __init__(self, dn, default_entries):
+    def __init__(self, dn, default_entries, template=None):
         self.default_entries = default_entries
+        self.template = template
         self.dn = dn
         self.entries = {}
         return
@@ -14,18 +52,14 @@ class LDIFNode:
     def add(self, entries):
         # add/update entries
         for entry_name in entries:
-            if isinstance(entries[entry_name], list):
-                self.entries[entry_name] = []
-                for item in entries[entry_name]:
-                    self.entries[entry_name].append(str(item))
-            elif isinstance(entries[entry_name], basestring):
-                self.entries[entry_name] = [entries[entry_name]]
-            else:
-                self.entries[entry_name] = [str(entries[entry_name])]
+            self.entries[entry_name] = as_values(entries[entry_name])
         return self
 
     def init(self):
-        self.entries = {}
+        if self.template is None:
+            self.entries = {}
+        else:
+            self.entries = self.template.get_entries()
         self.add(self.default_entries)
         return self
 
@@ -40,29 +74,119 @@ class LDIFNode:
         return out 
 
 
+class LDIFStreamWriter:
+
+    # Writes LDIF records with the same output of python-ldap's LDIFWriter
+    # (no base64 forced attributes, '\n' line separator), buffering lines
+    # and writing them in large chunks
+
+    def __init__(self, stream, cols=76, buffer_size=65536):
+        self._stream = stream
+        self._cols = cols
+        self._buffer_size = buffer_size
+        self._buffer = []
+        self._buffered = 0
+        # attribute names are few and repeated for every node
+        self._prefixes = {}
+        self.records_written = 0
+
+    def unparse(self, dn, entries):
+        self._write_value("dn", dn)
+        for attr_type, values in entries.items():
+            for value in values:
+                self._write_value(attr_type, value)
+        self._buffer.append("\n")
+        self._buffered += 1
+        self.records_written += 1
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        self._stream.write("".join(self._buffer))
+        self._buffer = []
+        self._buffered = 0
+
+    def _get_prefixes(self, attr_type):
+        prefixes = self._prefixes.get(attr_type)
+        if prefixes is None:
+            prefixes = (attr_type + ": ", attr_type + ":: ")
+            self._prefixes[attr_type] = prefixes
+        return prefixes
+
+    def _write_value(self, attr_type, value):
+        if isinstance(value, unicode):
+            value = value.encode("utf-8")
+        (plain, encoded) = self._get_prefixes(attr_type)
+        if SAFE_STRING_RE.search(value) is None:
+            line = plain + value
+        else:
+            line = encoded + base64.b64encode(value)
+        cols = self._cols
+        if len(line) <= cols:
+            self._buffer.append(line + "\n")
+            self._buffered += len(line) + 1
+            return
+        # fold the line: continuation lines start with a space
+        parts = [line[:cols]]
+        for pos in xrange(cols, len(line), cols - 1):
+            parts.append(" " + line[pos:pos + cols - 1])
+        folded = "\n".join(parts) + "\n"
+        self._buffer.append(folded)
+        self._buffered += len(folded)
+
+
 class LDIFExporter:
 
-    def __init__(self):
+    def __init__(self, stream=None, published=None):
+        # nodes are written as soon as they are added when a stream is given,
+        # otherwise they are kept until print_nodes or save_to_file
         self.nodes = []
+        self._writer = None
+        if stream is not None:
+            self._writer = LDIFStreamWriter(stream, cols=512)
+        # {dn: digest} of the nodes published last time, if given: unchanged
+        # nodes are skipped (an empty dict writes and tracks all the nodes)
+        self._published = published
+        self._digests = {}
+        self.skipped = 0
         return
 
     def add_node(self, node):
         if not isinstance(node, LDIFNode):
             raise Exception("LDIFExporter.add_node error: Invalid node type")
-        self.nodes.append(node.get_info())
+        if self._published is not None:
+            digest = get_node_digest(node.dn, node.entries)
+            self._digests[node.dn] = digest
+            if self._published.get(node.dn) == digest:
+                self.skipped += 1
+                return self
+        if self._writer:
+            self._writer.unparse(node.dn, node.entries)
+        else:
+            self.nodes.append(node.get_info())
         logging.debug("LDIFExporter - Added %s node:\n%s",
             node.__class__.__name__, node)
         return self
 
+    def get_digests(self):
+        # {dn: digest} of all the nodes added in delta mode, written or not
+        return self._digests
+
     def add_nodes(self, nodes):
         for node in nodes:
             self.add_node(node)
         return self
 
+    def flush(self):
+        if self._writer:
+            self._writer.flush()
+        return self
+
     def print_nodes(self, stream):
-        ldif_writer = LDIFWriter(stream, cols=512)
+        ldif_writer = LDIFStreamWriter(stream, cols=512)
         for node in self.nodes:
             ldif_writer.unparse(node["dn"], node["entries"])
+        ldif_writer.flush()
         return self
 
     def save_to_file(self, fname):
@@ -71,3 +195,40 @@ class LDIFExporter:
         self.print_nodes(f)
         f.close()
         return
+
+
+def get_node_digest(dn, entries):
+    # attributes are sorted, so the digest doesn't depend on the dict order
+    digest = hashlib.sha1(_as_bytes(dn))
+    for name in sorted(entries):
+        digest.update("\n" + name)
+        for value in entries[name]:
+            digest.update("\0" + _as_bytes(value))
+    return digest.hexdigest()
+
+def _as_bytes(value):
+    if isinstance(value, unicode):
+        return value.encode("utf-8")
+    return value
+
+def save_nodes_to_file(nodes, fname, volatile_attributes=()):
+    # returns False if the file already had the same content, apart from the
+    # values of the volatile attributes (like creation times)
+    logging.debug("Saving nodes to file %s", fname)
+    stream = StringIO()
+    LDIFExporter(stream).add_nodes(nodes).flush()
+    content = stream.getvalue()
+    if volatile_attributes:
+        try:
+            current = read_file(fname)
+        except IOError:
+            current = None
+        if current is not None and _strip_attributes(current, volatile_attributes) \
+            == _strip_attributes(content, volatile_attributes):
+            # left as it is
+            content = current
+    return write_file_if_changed(fname, content)
+
+def _strip_attributes(content, attributes):
+    prefixes = tuple(attribute + ":" for attribute in attributes)
+    return [line for line in content.splitlines() if not line.startswith(prefixes)]
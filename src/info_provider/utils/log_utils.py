@@ -0,0 +1,23 @@
+import logging
+
+
+class LazyMessage:
+
+    # Defers an expensive message argument: function(*args) is evaluated
+    # only when the log record is actually formatted, that is only if its
+    # level is enabled
+
+    def __init__(self, function, *args):
+        self._function = function
+        self._args = args
+
+    def __str__(self):
+        return str(self._function(*self._args))
+
+
+def lazy(function, *args):
+    return LazyMessage(function, *args)
+
+def is_debug_enabled():
+    # guard for debug-only work that can't be deferred with lazy()
+    return logging.getLogger().isEnabledFor(logging.DEBUG)
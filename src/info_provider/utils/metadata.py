@@ -0,0 +1,60 @@
+import json
+import logging
+import os
+
+from info_provider.utils.file_utils import write_file_atomically, read_file
+
+
+class MetadataCache:
+
+    def __init__(self, metadata_file):
+        self._metadata_file = metadata_file
+        self._entries = {}
+        self._load()
+
+    def get(self, key, sources, compute):
+        # the value is recomputed only when the modification time of one of
+        # the files it depends on has changed
+        signature = dict((source, get_mtime(source)) for source in sources)
+        entry = self._entries.get(key)
+        if entry and entry.get("sources") == signature:
+            logging.debug("Using cached %s", key)
+            return entry["value"]
+        logging.debug("Computing %s ...", key)
+        value = compute()
+        self._entries[key] = {"sources": signature, "value": value}
+        self._save()
+        return value
+
+    def _load(self):
+        try:
+            entries = json.loads(read_file(self._metadata_file))
+        except IOError:
+            logging.debug("No metadata found in %s", self._metadata_file)
+            return
+        except ValueError, ex:
+            logging.warning("Ignoring invalid metadata %s: %s",
+                self._metadata_file, ex)
+            return
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def _save(self):
+        try:
+            write_file_atomically(self._metadata_file, json.dumps(self._entries))
+        except (IOError, OSError), ex:
+            logging.warning("Unable to save metadata to %s: %s",
+                self._metadata_file, ex)
+
+
+def get_mtime(path):
+    # the latest modification time of a file or of a directory and its
+    # entries, None if it doesn't exist
+    try:
+        mtime = os.stat(path).st_mtime
+        if os.path.isdir(path):
+            for name in os.listdir(path):
+                mtime = max(mtime, os.stat(os.path.join(path, name)).st_mtime)
+        return mtime
+    except OSError:
+        return None
@@ -0,0 +1,28 @@
+import calendar
+import time
+
+CREATION_TIME_FORMAT = '%Y-%m-%dT%T'
+
+
+def get_creation_time(now=None):
+    # local time, as published by GLUE2EntityCreationTime
+    return time.strftime(CREATION_TIME_FORMAT, time.localtime(now))
+
+
+class RunContext:
+
+    # The clock read once per run: all the nodes and records built with the
+    # same context share the same creation time and timestamp
+
+    def __init__(self, now=None):
+        if now is None:
+            now = time.time()
+        self.now = now
+        self.creation_time = get_creation_time(now)
+        self.timestamp = calendar.timegm(time.gmtime(now))
+
+    def get_creation_time(self):
+        return self.creation_time
+
+    def get_timestamp(self):
+        return self.timestamp
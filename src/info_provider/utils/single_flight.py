@@ -0,0 +1,87 @@
+import errno
+import fcntl
+import json
+import logging
+import os
+import time
+
+from info_provider.utils.file_utils import write_file_atomically, read_file, \
+    make_dirs
+
+
+class SingleFlight:
+
+    def __init__(self, lock_file, snapshot_file, timeout=60, poll_interval=0.05,
+        encode=None, decode=None):
+        self._lock_file = lock_file
+        self._snapshot_file = snapshot_file
+        self._timeout = timeout
+        self._poll_interval = poll_interval
+        # the result is published as JSON: encode returns it as JSON
+        # serializable data, decode builds it again
+        self._encode = encode or (lambda result: result)
+        self._decode = decode or (lambda data: data)
+
+    def run(self, function):
+        # the first process computes and publishes the result, the concurrent
+        # ones wait for it instead of computing it again
+        start = time.time()
+        try:
+            lock = self._open_lock()
+        except (IOError, OSError), ex:
+            logging.warning("Unable to open lock file %s: %s", self._lock_file, ex)
+            return function()
+        try:
+            while not self._try_lock(lock):
+                if time.time() - start > self._timeout:
+                    logging.warning("Timeout waiting for a concurrent process: "
+                        "computing the result on our own")
+                    return function()
+                time.sleep(self._poll_interval)
+            result = self._load_snapshot(start)
+            if result is not None:
+                logging.debug("Using result published by a concurrent process")
+                return result
+            result = function()
+            self._publish_snapshot(result)
+            return result
+        finally:
+            lock.close()
+
+    def _open_lock(self):
+        try:
+            return open(self._lock_file, 'a')
+        except IOError, ex:
+            if ex.errno != errno.ENOENT:
+                raise
+        make_dirs(os.path.dirname(self._lock_file))
+        return open(self._lock_file, 'a')
+
+    def _try_lock(self, lock):
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except IOError, ex:
+            if ex.errno in (errno.EAGAIN, errno.EACCES):
+                return False
+            raise
+
+    def _load_snapshot(self, not_before):
+        try:
+            snapshot = json.loads(read_file(self._snapshot_file))
+            # only results published while we were waiting are fresh enough
+            if snapshot["published_at"] < not_before:
+                return None
+            return self._decode(snapshot["result"])
+        except IOError:
+            return None
+        except Exception, ex:
+            logging.warning("Ignoring invalid snapshot %s: %s", self._snapshot_file, ex)
+            return None
+
+    def _publish_snapshot(self, result):
+        try:
+            snapshot = {"published_at": time.time(), "result": self._encode(result)}
+            write_file_atomically(self._snapshot_file, json.dumps(snapshot))
+        except (IOError, OSError, TypeError, ValueError), ex:
+            logging.warning("Unable to publish snapshot to %s: %s", self._snapshot_file, ex)
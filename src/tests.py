@@ -1,7 +1,22 @@
+from tests.test_cache import TestCache
+from tests.test_capacity import TestCapacityTable
+from tests.test_circuit_breaker import TestCircuitBreaker
 from tests.test_configuration import TestConfiguration
+from tests.test_daemon import TestDaemon
+from tests.test_delta import TestDelta
+from tests.test_file_utils import TestFileUtils
 from tests.test_gateway import TestGateway
 from tests.test_glue2 import TestGlue2
+from tests.test_http_utils import TestHttpUtils
+from tests.test_imports import TestImports
 from tests.test_info_provider import TestInfoProvider
+from tests.test_ldif import TestLDIFExporter, TestLDIFNodeTemplate, \
+    TestLDIFStreamWriter
+from tests.test_log_utils import TestLogUtils
+from tests.test_metadata import TestMetadata
+from tests.test_publication import TestPublication
+from tests.test_run_context import TestRunContext
+from tests.test_single_flight import TestSingleFlight
 from tests.test_space_info import TestSpaceInfo
 from tests.test_storage_service import TestStorageService
 try:
@@ -17,10 +32,26 @@ logging.config.fileConfig('resources/logging.ini')
 def create_suite():
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(TestCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestCapacityTable))
+    suite.addTests(loader.loadTestsFromTestCase(TestCircuitBreaker))
     suite.addTests(loader.loadTestsFromTestCase(TestConfiguration))
+    suite.addTests(loader.loadTestsFromTestCase(TestDaemon))
+    suite.addTests(loader.loadTestsFromTestCase(TestDelta))
+    suite.addTests(loader.loadTestsFromTestCase(TestFileUtils))
     suite.addTests(loader.loadTestsFromTestCase(TestGateway))
     suite.addTests(loader.loadTestsFromTestCase(TestGlue2))
+    suite.addTests(loader.loadTestsFromTestCase(TestHttpUtils))
+    suite.addTests(loader.loadTestsFromTestCase(TestImports))
     suite.addTests(loader.loadTestsFromTestCase(TestInfoProvider))
+    suite.addTests(loader.loadTestsFromTestCase(TestLDIFExporter))
+    suite.addTests(loader.loadTestsFromTestCase(TestLDIFNodeTemplate))
+    suite.addTests(loader.loadTestsFromTestCase(TestLDIFStreamWriter))
+    suite.addTests(loader.loadTestsFromTestCase(TestLogUtils))
+    suite.addTests(loader.loadTestsFromTestCase(TestMetadata))
+    suite.addTests(loader.loadTestsFromTestCase(TestPublication))
+    suite.addTests(loader.loadTestsFromTestCase(TestRunContext))
+    suite.addTests(loader.loadTestsFromTestCase(TestSingleFlight))
     suite.addTests(loader.loadTestsFromTestCase(TestSpaceInfo))
     suite.addTests(loader.loadTestsFromTestCase(TestStorageService))
     return suite
@@ -0,0 +1,110 @@
+import BaseHTTPServer
+import SocketServer
+import argparse
+import json
+import logging
+import threading
+import time
+
+from tests.utils import get_filepath, get_sa_status_filepath
+
+
+class MockBackendHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._reply(True)
+
+    def do_HEAD(self):
+        self._reply(False)
+
+    def _reply(self, with_body):
+        self.server.count_request(self.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = self._get_body()
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def _get_body(self):
+        if self.path.startswith("/configuration/") and self.path.endswith("/VirtualFSList"):
+            return self._read(get_filepath("resources/response.json"))
+        if self.path == "/info/status" and self.server.bulk:
+            return self._get_bulk_status()
+        if self.path.startswith("/info/status/"):
+            try:
+                return self._read(get_sa_status_filepath(self.path.split('/')[-1]))
+            except Exception:
+                return None
+        return None
+
+    def _get_bulk_status(self):
+        vfs_list = json.loads(self._read(get_filepath("resources/response.json")))
+        statuses = []
+        for data in vfs_list.values():
+            status = json.loads(self._read(get_sa_status_filepath(data["token"])))
+            statuses.append(status["sa-status"])
+        return json.dumps({"sa-status-list": statuses})
+
+    def _read(self, filepath):
+        f = open(filepath)
+        try:
+            return f.read()
+        finally:
+            f.close()
+
+    def log_message(self, fmt, *args):
+        logging.debug("MockBackend - " + fmt, *args)
+
+
+class MockBackend(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0, latency=0, bulk=False):
+        BaseHTTPServer.HTTPServer.__init__(self, ("localhost", port), MockBackendHandler)
+        self.latency = latency
+        self.bulk = bulk
+        self.requests = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def count_request(self, path):
+        with self._lock:
+            self.requests.append(path)
+
+    def get_endpoint(self):
+        return "http://localhost:%d" % self.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='StoRM Backend REST mock')
+    parser.add_argument('-p', action='store', dest='port', type=int, default=9998)
+    parser.add_argument('-l', action='store', dest='latency', type=float, default=0,
+        help='seconds of latency added to each response')
+    parser.add_argument('-b', action='store_true', dest='bulk', default=False,
+        help='serve the status of all the storage areas from /info/status')
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG)
+    MockBackend(arguments.port, arguments.latency, arguments.bulk).serve_forever()
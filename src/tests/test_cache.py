@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import time
+
+from info_provider.storm_gateway import StormGateway
+from info_provider.utils.cache import ResponseCache
+from tests.mock_backend import MockBackend
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def test_put_and_get(self):
+        cache = ResponseCache(self._tmpdir, 60, 60)
+        self.assertIsNone(cache.get("http://localhost/info/status/TOKEN"))
+        cache.put("http://localhost/info/status/TOKEN", {"sa-status": {"alias": "TOKEN"}})
+        entry = cache.get("http://localhost/info/status/TOKEN")
+        self.assertEqual(entry.get_data(), {"sa-status": {"alias": "TOKEN"}})
+        self.assertTrue(cache.is_fresh(entry))
+        self.assertFalse(cache.is_stale(entry))
+        # no temporary files are left behind
+        self.assertEqual(len(os.listdir(self._tmpdir)), 1)
+
+    def test_stale_and_expired_entries(self):
+        cache = ResponseCache(self._tmpdir, 0.1, 0.2)
+        cache.put("key", [1, 2, 3])
+        time.sleep(0.15)
+        entry = cache.get("key")
+        self.assertFalse(cache.is_fresh(entry))
+        self.assertTrue(cache.is_stale(entry))
+        time.sleep(0.2)
+        entry = cache.get("key")
+        self.assertFalse(cache.is_fresh(entry))
+        self.assertFalse(cache.is_stale(entry))
+
+    def test_invalid_entry(self):
+        cache = ResponseCache(self._tmpdir, 60)
+        cache.put("key", "value")
+        f = open(os.path.join(self._tmpdir, os.listdir(self._tmpdir)[0]), 'w')
+        f.write("{ invalid")
+        f.close()
+        self.assertIsNone(cache.get("key"))
+
+    def test_lock_is_exclusive(self):
+        cache = ResponseCache(self._tmpdir, 60)
+        lock = cache.try_lock("key")
+        self.assertIsNotNone(lock)
+        self.assertIsNone(cache.try_lock("key"))
+        cache.unlock(lock)
+        lock = cache.try_lock("key")
+        self.assertIsNotNone(lock)
+        cache.unlock(lock)
+
+    def test_gateway_with_fresh_cache(self):
+        backend = MockBackend().start()
+        try:
+            options = {"cache_dir": self._tmpdir, "cache_ttl": 60}
+            expected = StormGateway(backend.get_endpoint(), **options).get_vfs_list_with_status()
+            self.assertEqual(len(backend.requests), 8)
+            response = StormGateway(backend.get_endpoint(), **options).get_vfs_list_with_status()
+            self.assertEqual(response, expected)
+            self.assertEqual(len(backend.requests), 8)
+        finally:
+            backend.stop()
+
+    def test_gateway_with_stale_cache(self):
+        backend = MockBackend(latency=0.2).start()
+        try:
+            options = {"cache_dir": self._tmpdir, "cache_ttl": 0, "cache_stale_ttl": 60,
+                "max_workers": 4}
+            expected = StormGateway(backend.get_endpoint(), **options).get_vfs_list_with_status()
+            self.assertEqual(len(backend.requests), 8)
+            gateway = StormGateway(backend.get_endpoint(), **options)
+            start = time.time()
+            response = gateway.get_vfs_list_with_status()
+            self.assertTrue(time.time() - start < 0.2)
+            self.assertEqual(response, expected)
+            gateway.close()
+            # stale entries have been revalidated in background
+            self.assertEqual(len(backend.requests), 16)
+        finally:
+            backend.stop()
+
+    def _get_gateway_with_stale_cache(self, backend):
+        options = {"cache_dir": self._tmpdir, "cache_ttl": 0, "cache_stale_ttl": 60}
+        StormGateway(backend.get_endpoint(), **options).get_vfs_list()
+        return StormGateway(backend.get_endpoint(), **options)
+
+    def test_close_with_backend_down(self):
+        backend = MockBackend().start()
+        gateway = self._get_gateway_with_stale_cache(backend)
+        backend.stop()
+        start = time.time()
+        self.assertEqual(len(gateway.get_vfs_list()), 7)
+        gateway.close()
+        # a single attempt, no retries
+        self.assertTrue(time.time() - start < 1)
+
+    def test_close_with_slow_backend(self):
+        backend = MockBackend().start()
+        try:
+            gateway = self._get_gateway_with_stale_cache(backend)
+            backend.latency = 10
+            start = time.time()
+            self.assertEqual(len(gateway.get_vfs_list()), 7)
+            gateway.close()
+            self.assertTrue(time.time() - start < StormGateway.REVALIDATION_TIMEOUT + 1)
+        finally:
+            backend.latency = 0
+            backend.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+from info_provider.glue.utils import as_gigabytes, as_kilobytes
+from info_provider.model.capacity import CapacityTable, GIGABYTE, KILOBYTE, METRICS
+from info_provider.model.space import SpaceRecord, SpaceInfo, VirtualFileSystemRecord
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestCapacityTable(unittest.TestCase):
+
+    def _get_table(self):
+        table = CapacityTable()
+        table.add("A-FS", SpaceRecord(total=4000000000, used=1499999999, free=2500000001,
+            near_line=500000000))
+        table.add("B-FS", SpaceRecord(total=2000000000, available=0, used=0,
+            reserved=1000))
+        table.add("C-FS", SpaceRecord(total=9223372036854775000))
+        return table
+
+    def test_sum(self):
+        table = self._get_table()
+        summary = table.get_sum(["A-FS", "B-FS"])
+        expected = SpaceRecord(total=4000000000, used=1499999999, free=2500000001,
+            near_line=500000000)
+        expected.sum(SpaceRecord(total=2000000000, available=0, used=0, reserved=1000))
+        self.assertEqual(summary.to_dict(), expected.to_dict())
+        self.assertEqual(table.get_sum(["C-FS"]).get_total(), 9223372036854775000)
+        self.assertEqual(table.get_sum([]).to_dict(), dict((m, 0) for m in METRICS))
+        self.assertEqual(CapacityTable().get_sum().get_total(), 0)
+
+    def test_converted(self):
+        table = self._get_table()
+        for name in table.get_names():
+            space = table.get_sum([name])
+            gb = table.get_converted(name, GIGABYTE)
+            kb = table.get_converted(name, KILOBYTE)
+            for metric in METRICS:
+                self.assertEqual(gb[metric], as_gigabytes(getattr(space, metric)))
+                self.assertEqual(kb[metric], as_kilobytes(getattr(space, metric)))
+        self.assertEqual(table.get_converted("A-FS", GIGABYTE)["used"], 1)
+        self.assertEqual(table.get_converted("A-FS", GIGABYTE)["free"], 3)
+
+    def test_space_info_capacity(self):
+        vfs = {"A-FS": VirtualFileSystemRecord(name="A-FS", space=SpaceRecord(total=3000000000))}
+        capacity = SpaceInfo(vfs_list=vfs).get_capacity()
+        self.assertEqual(capacity.get_names(), ["A-FS"])
+        self.assertEqual(capacity.get_converted("A-FS", GIGABYTE)["total"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import time
+from urllib2 import URLError
+
+from mock.mock import MagicMock
+
+from info_provider.storm_gateway import StormGateway, StorageAreaStatusError
+from info_provider.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from tests.mock_backend import MockBackend
+from tests.utils import get_sa_status_as_json
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._state_file = os.path.join(self._tmpdir, "circuit-breaker.json")
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def test_open_after_threshold(self):
+        breaker = CircuitBreaker(self._state_file, 2, 60)
+        self.assertEqual(breaker.get_state(), CircuitBreaker.CLOSED)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.get_state(), CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+        # state is shared with the next invocations
+        breaker = CircuitBreaker(self._state_file, 2, 60)
+        self.assertEqual(breaker.get_state(), CircuitBreaker.OPEN)
+        self.assertEqual(breaker.get_failures(), 2)
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(self._state_file, 1, 0.1)
+        breaker.record_failure()
+        self.assertEqual(breaker.get_state(), CircuitBreaker.OPEN)
+        time.sleep(0.2)
+        self.assertEqual(breaker.get_state(), CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        # a failed probe opens the circuit again
+        breaker.record_failure()
+        self.assertEqual(breaker.get_state(), CircuitBreaker.OPEN)
+        time.sleep(0.2)
+        breaker.record_success()
+        self.assertEqual(CircuitBreaker(self._state_file, 1, 0.1).get_state(),
+            CircuitBreaker.CLOSED)
+
+    def test_invalid_state_file(self):
+        f = open(self._state_file, 'w')
+        f.write("not json")
+        f.close()
+        self.assertEqual(CircuitBreaker(self._state_file).get_state(),
+            CircuitBreaker.CLOSED)
+
+    def test_gateway_skips_network_when_open(self):
+        backend = MockBackend().start()
+        endpoint = backend.get_endpoint()
+        backend.stop()
+        options = {"circuit_breaker_file": self._state_file,
+            "circuit_breaker_threshold": 2, "circuit_breaker_reset_timeout": 0.3}
+        for _ in range(2):
+            self.assertFalse(StormGateway(endpoint, **options).is_online())
+        gateway = StormGateway(endpoint, **options)
+        self.assertEqual(gateway.get_circuit_breaker().get_state(), CircuitBreaker.OPEN)
+        self.assertFalse(gateway.is_online())
+        with self.assertRaises(CircuitOpenError):
+            gateway.get_vfs_list_with_status()
+        # backend recovers: the status retrieval after the half-open probe
+        # closes the circuit
+        time.sleep(0.4)
+        backend = MockBackend(port=int(endpoint.split(':')[-1])).start()
+        try:
+            gateway = StormGateway(endpoint, **options)
+            self.assertTrue(gateway.is_online())
+            self.assertEqual(gateway.get_circuit_breaker().get_state(), CircuitBreaker.HALF_OPEN)
+            self.assertEqual(len(gateway.get_vfs_list_with_status()), 7)
+            self.assertEqual(gateway.get_circuit_breaker().get_state(), CircuitBreaker.CLOSED)
+        finally:
+            backend.stop()
+
+    def test_open_when_probe_succeeds_but_retrieval_fails(self):
+        backend = MockBackend().start()
+        options = {"circuit_breaker_file": self._state_file,
+            "circuit_breaker_threshold": 2, "circuit_breaker_reset_timeout": 60}
+        try:
+            for _ in range(2):
+                gateway = StormGateway(backend.get_endpoint(), **options)
+                gateway.get_vfs_space_info = MagicMock(side_effect=URLError("failed"))
+                self.assertTrue(gateway.is_online())
+                with self.assertRaises(StorageAreaStatusError):
+                    gateway.get_vfs_list_with_status()
+            gateway = StormGateway(backend.get_endpoint(), **options)
+            self.assertEqual(gateway.get_circuit_breaker().get_state(), CircuitBreaker.OPEN)
+            self.assertFalse(gateway.is_online())
+        finally:
+            backend.stop()
+
+    def test_closed_when_a_single_storage_area_fails(self):
+        backend = MockBackend().start()
+        options = {"circuit_breaker_file": self._state_file,
+            "circuit_breaker_threshold": 2, "circuit_breaker_reset_timeout": 60}
+        def get_space_info(sa_token):
+            if sa_token == "TAPE_TOKEN":
+                raise URLError("failed")
+            return get_sa_status_as_json(sa_token)
+        try:
+            for _ in range(4):
+                gateway = StormGateway(backend.get_endpoint(), **options)
+                gateway.get_vfs_space_info = MagicMock(side_effect=get_space_info)
+                self.assertTrue(gateway.is_online())
+                with self.assertRaises(StorageAreaStatusError) as cm:
+                    gateway.get_vfs_list_with_status()
+                self.assertEqual(cm.exception.failures.keys(), ["TAPE-FS"])
+                self.assertEqual(gateway.get_circuit_breaker().get_state(),
+                    CircuitBreaker.CLOSED)
+        finally:
+            backend.stop()
+
+if __name__ == "__main__":
+    unittest.main()
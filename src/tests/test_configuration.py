@@ -1,4 +1,9 @@
 import logging
+import os
+import shutil
+import tempfile
+
+from mock.mock import patch
 
 from tests.utils import get_default_test_configuration,\
     get_default_test_configuration_filepath,\
@@ -57,5 +62,109 @@ class TestConfiguration(unittest.TestCase):
         configuration = get_default_test_configuration()
         configuration.print_configuration()
 
+    def test_storage_area_records(self):
+        configuration = get_default_test_configuration()
+        records = configuration.get_sa_records()
+        self.assertEqual([r.name for r in records], configuration.get_storage_area_list())
+        tape = records[configuration.get_storage_area_list().index("tape")]
+        self.assertEqual(tape.short, "TAPE")
+        self.assertEqual(tape.token, "TAPE_TOKEN")
+        self.assertEqual(tape.vos, ("test.vo.2",))
+        self.assertEqual(tape.storage_class, "T1D0")
+        self.assertEqual(tape.retention_policy, "custodial")
+        self.assertEqual(tape.access_latency, "nearline")
+        self.assertEqual(configuration.get_sa_accesspoints("nested"), ["/test.vo.2/nested", "/alias"])
+        self.assertEqual(configuration.get_sa_accesspoints("tape"), ["/tape"])
+        # records are immutable
+        with self.assertRaises(AttributeError):
+            tape.token = "OTHER_TOKEN"
+
+    def test_storage_area_records_are_updated_on_set(self):
+        configuration = get_default_test_configuration()
+        self.assertEqual(configuration.get_sa_class("tape"), "T1D0")
+        configuration.set("STORM_TAPE_STORAGECLASS", "T0D1")
+        self.assertEqual(configuration.get_sa_class("tape"), "T0D1")
+        self.assertEqual(configuration.get_sa_retention_policy("tape"), "replica")
+        self.assertEqual(configuration.get_sa_access_latency("tape"), "online")
+        configuration.set("STORM_STORAGEAREA_LIST", "tape")
+        self.assertEqual(configuration.get_storage_area_list(), ["tape"])
+        self.assertEqual(configuration.get_online_size(), 2000000000)
+
+    def test_sizes(self):
+        configuration = get_default_test_configuration()
+        self.assertEqual(configuration.get_online_size(), 26000000000)
+        self.assertEqual(configuration.get_nearline_size(), 8000000000)
+        self.assertEqual(configuration.get_online_size(sa="tape"), 2000000000)
+        self.assertEqual(configuration.get_nearline_size(sa="tape"), 8000000000)
+        self.assertEqual(configuration.get_online_size(sa="unknown"), 0)
+        # the storage areas serving the VO are excluded
+        for vo in configuration.get_supported_VOs():
+            online = 0
+            nearline = 0
+            for sa in configuration.get_storage_area_list():
+                if vo not in configuration.get_sa_vos(sa):
+                    online += configuration.get_online_size(sa=sa)
+                    nearline += configuration.get_nearline_size(sa=sa)
+            self.assertEqual(configuration.get_online_size(vo=vo), online)
+            self.assertEqual(configuration.get_nearline_size(vo=vo), nearline)
+        self.assertEqual(configuration.get_online_size(sa="tape", vo="test.vo.2"), 0)
+
+    def test_sizes_are_updated_on_set(self):
+        configuration = get_default_test_configuration()
+        self.assertEqual(configuration.get_online_size(sa="tape"), 2000000000)
+        configuration.set("STORM_TAPE_ONLINE_SIZE", "5")
+        self.assertEqual(configuration.get_online_size(sa="tape"), 5000000000)
+        self.assertEqual(configuration.get_online_size(), 29000000000)
+
+    def test_missing_online_size(self):
+        configuration = get_default_test_configuration()
+        configuration.set("STORM_STORAGEAREA_LIST", "tape other")
+        self.assertEqual(configuration.get_online_size(sa="tape"), 2000000000)
+        with self.assertRaises(KeyError):
+            configuration.get_online_size()
+        with self.assertRaises(KeyError):
+            configuration.get_online_size(sa="other")
+        self.assertEqual(configuration.get_nearline_size(), 8000000000)
+
+    def test_configuration_snapshot(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filepath = os.path.join(tmpdir, "storm.def")
+            shutil.copy(get_default_test_configuration_filepath(), filepath)
+            expected = Configuration(filepath, snapshot=True)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, ".storm.def.snapshot")))
+            with patch.object(Configuration, '_parse_configuration') as parse:
+                configuration = Configuration(filepath, snapshot=True)
+                self.assertFalse(parse.called)
+            self._check_is_test_configuration(configuration, filepath)
+            for (record, expected_record) in zip(configuration.get_sa_records(), expected.get_sa_records()):
+                self.assertEqual(record._replace(approachable_rules=None),
+                    expected_record._replace(approachable_rules=None))
+                self.assertEqual(map(str, record.approachable_rules),
+                    map(str, expected_record.approachable_rules))
+            self.assertEqual(configuration.get_online_size(), expected.get_online_size())
+            # a changed file is parsed again
+            f = open(filepath, 'a')
+            f.write("STORM_TAPE_ONLINE_SIZE=5\n")
+            f.close()
+            configuration = Configuration(filepath, snapshot=True)
+            self.assertEqual(configuration.get_online_size(sa="tape"), 5000000000)
+            # an invalid snapshot is ignored
+            f = open(os.path.join(tmpdir, ".storm.def.snapshot"), 'w')
+            f.write("invalid")
+            f.close()
+            configuration = Configuration(filepath, snapshot=True)
+            self.assertEqual(configuration.get_online_size(sa="tape"), 5000000000)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_set_runtime_variables_keeps_records(self):
+        configuration = get_default_test_configuration()
+        records = configuration.get_sa_records()
+        configuration.set("STORM_SERVING_STATE", "closed")
+        self.assertTrue(configuration.get_sa_records()[0] is records[0])
+        configuration.set("STORM_TAPE_ROOT", "/storage/tape")
+        self.assertEqual(configuration.get_sa_root("tape"), "/storage/tape")
+
 if __name__ == "__main__":
     unittest.main()
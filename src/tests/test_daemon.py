@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+from mock.mock import MagicMock
+
+from info_provider.daemon import InfoProviderDaemon, DaemonError, query_daemon
+from info_provider.storm_gateway import StormGateway
+from info_provider.storm_info_provider import StormInfoProvider
+from tests.mock_backend import MockBackend
+from tests.utils import get_default_test_configuration
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+OUTPUTS = {
+    "get-update-ldif glue13": "dn: GlueSEUniqueID=storm.example.org\n\n",
+    "get-update-ldif glue2": "dn: GLUE2ServiceID=storm.example.org/storage\n\n",
+    "get-report-json": "{}"
+}
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._socket_path = os.path.join(self._tmpdir, "daemon.sock")
+        self._info_provider = MagicMock()
+        self._info_provider.get_outputs = MagicMock(return_value=OUTPUTS)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def _start(self, daemon):
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        while not self._is_listening(self._socket_path):
+            time.sleep(0.01)
+        return thread
+
+    def _is_listening(self, path):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            s.connect(path)
+            return True
+        except socket.error:
+            return False
+        finally:
+            s.close()
+
+    def _stop(self, daemon, thread):
+        daemon.shutdown()
+        thread.join()
+
+    def test_serve_outputs(self):
+        daemon = InfoProviderDaemon(self._socket_path, self._info_provider, 60)
+        daemon.refresh()
+        thread = self._start(daemon)
+        try:
+            for request in OUTPUTS:
+                self.assertEqual(query_daemon(self._socket_path, request), OUTPUTS[request])
+            with self.assertRaises(DaemonError):
+                query_daemon(self._socket_path, "get-static-ldif glue2")
+        finally:
+            self._stop(daemon, thread)
+        self.assertFalse(os.path.exists(self._socket_path))
+
+    def test_periodic_refresh(self):
+        before_refresh = MagicMock()
+        daemon = InfoProviderDaemon(self._socket_path, self._info_provider, 0.1,
+            before_refresh)
+        thread = self._start(daemon)
+        try:
+            time.sleep(0.35)
+        finally:
+            self._stop(daemon, thread)
+        self.assertTrue(self._info_provider.get_outputs.call_count >= 3)
+        self.assertEqual(before_refresh.call_count, self._info_provider.get_outputs.call_count)
+
+    def test_refresh_after_time_budget(self):
+        configuration = get_default_test_configuration()
+        backend = MockBackend().start()
+        try:
+            gateway = StormGateway(backend.get_endpoint(), time_budget=0.5)
+            def before_refresh():
+                state = "production" if gateway.is_online() else "closed"
+                configuration.set("STORM_SERVING_STATE", state)
+            info_provider = StormInfoProvider(configuration=configuration,
+                gateway=gateway)
+            daemon = InfoProviderDaemon(self._socket_path, info_provider, 60,
+                before_refresh)
+            daemon.refresh()
+            expected = daemon.get_output("get-report-json")
+            # the time budget of the first refresh has elapsed
+            time.sleep(0.6)
+            backend.requests = []
+            daemon.refresh()
+            self.assertEqual(configuration.get("STORM_SERVING_STATE"), "production")
+            self.assertEqual(len(backend.requests), 9)
+            self.assertEqual(sorted(json.loads(daemon.get_output("get-report-json"))),
+                sorted(json.loads(expected)))
+            self.assertEqual(daemon.get_output("get-update-ldif glue13"),
+                info_provider.get_outputs()["get-update-ldif glue13"])
+        finally:
+            backend.stop()
+
+    def test_no_outputs_available(self):
+        daemon = InfoProviderDaemon(self._socket_path, self._info_provider, 60)
+        with self.assertRaises(DaemonError):
+            daemon.get_output("get-report-json")
+        daemon.refresh()
+        daemon._refreshed_at -= 3600
+        with self.assertRaises(DaemonError):
+            daemon.get_output("get-report-json")
+
+    def test_no_daemon_running(self):
+        with self.assertRaises(DaemonError):
+            query_daemon(self._socket_path, "get-report-json")
+
+    def test_stale_socket_is_replaced(self):
+        open(self._socket_path, 'w').close()
+        daemon = InfoProviderDaemon(self._socket_path, self._info_provider, 60)
+        daemon.refresh()
+        thread = self._start(daemon)
+        try:
+            self.assertEqual(query_daemon(self._socket_path, "get-report-json"), "{}")
+            with self.assertRaises(DaemonError):
+                InfoProviderDaemon(self._socket_path, self._info_provider).serve_forever()
+        finally:
+            self._stop(daemon, thread)
+
+if __name__ == "__main__":
+    unittest.main()
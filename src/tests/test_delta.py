@@ -0,0 +1,83 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from StringIO import StringIO
+
+from info_provider.utils.delta import DeltaState
+from info_provider.utils.ldap_utils import LDIFExporter, LDIFNode
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+def _get_node(i, used):
+    return LDIFNode("GLUE2ShareID=sa-%d,o=glue" % i, {}).add({
+        "GLUE2StorageShareCapacityUsedSize": used,
+        "GLUE2StorageShareCapacityTotalSize": 100})
+
+
+class TestDelta(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._state_file = os.path.join(self._tmpdir, "published-glue2.json")
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def _export(self, used_sizes, delta_state):
+        stream = StringIO()
+        published = delta_state.load()
+        exporter = LDIFExporter(stream, published if published is not None else {})
+        exporter.add_nodes(_get_node(i, used) for (i, used) in enumerate(used_sizes))
+        exporter.flush()
+        delta_state.save(exporter.get_digests())
+        return stream.getvalue()
+
+    def test_only_changed_nodes(self):
+        output = self._export([10, 20, 30], DeltaState(self._state_file))
+        self.assertEqual(output.count("dn: "), 3)
+        output = self._export([10, 20, 30], DeltaState(self._state_file))
+        self.assertEqual(output, "")
+        output = self._export([10, 25, 30], DeltaState(self._state_file))
+        self.assertEqual(output.count("dn: "), 1)
+        self.assertIn("dn: GLUE2ShareID=sa-1,o=glue\n", output)
+
+    def test_forced_refresh(self):
+        self._export([10, 20], DeltaState(self._state_file))
+        output = self._export([10, 20], DeltaState(self._state_file, force=True))
+        self.assertEqual(output.count("dn: "), 2)
+        # the state is recorded anyway
+        self.assertEqual(self._export([10, 20], DeltaState(self._state_file)), "")
+
+    def test_refresh_interval(self):
+        self._export([10, 20], DeltaState(self._state_file))
+        state = json.load(open(self._state_file))
+        state["published_at"] = time.time() - 120
+        json.dump(state, open(self._state_file, 'w'))
+        # a delta output doesn't move the time of the last complete output
+        self.assertEqual(self._export([10, 20], DeltaState(self._state_file, 300)), "")
+        output = self._export([10, 20], DeltaState(self._state_file, 60))
+        self.assertEqual(output.count("dn: "), 2)
+
+    def test_removed_nodes_are_forgotten(self):
+        self._export([10, 20], DeltaState(self._state_file))
+        self._export([10], DeltaState(self._state_file))
+        output = self._export([10, 20], DeltaState(self._state_file))
+        self.assertEqual(output, "dn: GLUE2ShareID=sa-1,o=glue\n"
+            "GLUE2StorageShareCapacityTotalSize: 100\n"
+            "GLUE2StorageShareCapacityUsedSize: 20\n\n")
+
+    def test_invalid_state_file(self):
+        f = open(self._state_file, 'w')
+        f.write("{ invalid")
+        f.close()
+        self.assertIsNone(DeltaState(self._state_file).load())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import shutil
+import stat
+import tempfile
+
+from info_provider.glue.utils import create_file_from_template, create_files
+from info_provider.utils.file_utils import write_file_if_changed, get_file_digest
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestFileUtils(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._filepath = os.path.join(self._tmpdir, "storm-glue2-plugin")
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def _set_old_mtime(self):
+        os.utime(self._filepath, (0, 0))
+
+    def test_write_file_if_changed(self):
+        self.assertTrue(write_file_if_changed(self._filepath, "#!/bin/sh\n", 0755))
+        self._set_old_mtime()
+        self.assertFalse(write_file_if_changed(self._filepath, "#!/bin/sh\n", 0755))
+        self.assertEqual(os.stat(self._filepath).st_mtime, 0)
+        self.assertTrue(write_file_if_changed(self._filepath, "#!/bin/bash\n", 0755))
+        self.assertNotEqual(os.stat(self._filepath).st_mtime, 0)
+        self.assertEqual(open(self._filepath).read(), "#!/bin/bash\n")
+
+    def test_mode_of_unchanged_file(self):
+        write_file_if_changed(self._filepath, "#!/bin/sh\n")
+        self.assertFalse(write_file_if_changed(self._filepath, "#!/bin/sh\n", 0755))
+        self.assertEqual(stat.S_IMODE(os.stat(self._filepath).st_mode), 0755)
+
+    def test_file_digest(self):
+        self.assertIsNone(get_file_digest(self._filepath))
+        write_file_if_changed(self._filepath, "")
+        self.assertEqual(get_file_digest(self._filepath),
+            "da39a3ee5e6b4b0d3255bfef95601890afd80709")
+
+    def test_create_file_from_template(self):
+        template = os.path.join(self._tmpdir, "service.conf.template")
+        open(template, 'w').write("ENDPOINT=$ENDPOINT\n")
+        self.assertTrue(create_file_from_template(self._filepath, template,
+            {"ENDPOINT": "srm://storm.example.org:8444"}))
+        self.assertFalse(create_file_from_template(self._filepath, template,
+            {"ENDPOINT": "srm://storm.example.org:8444"}))
+        self.assertEqual(open(self._filepath).read(),
+            "ENDPOINT=srm://storm.example.org:8444\n")
+
+    def test_create_files(self):
+        skipped = create_files([("a", lambda: True), ("b", lambda: False)])
+        self.assertEqual(skipped, ["b"])
+
+if __name__ == "__main__":
+    unittest.main()
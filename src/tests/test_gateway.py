@@ -1,11 +1,18 @@
 from httplib import HTTPException
 from urllib2 import HTTPError, URLError
 
-from info_provider.storm_gateway import StormGateway
+from info_provider.storm_gateway import StormGateway, StorageAreaStatusError
+from info_provider.utils.deadline import Deadline, DeadlineExceeded
+from tests.mock_backend import MockBackend
 from tests.utils import *
 from mock.mock import patch, MagicMock
 
 import logging
+import os
+import shutil
+import socket
+import tempfile
+import time
 
 try:
     import unittest2 as unittest
@@ -83,6 +90,151 @@ class TestGateway(unittest.TestCase):
             logging.debug("Received HTTPException: %s" % (ex))
             self.assertTrue("HTTPException on getting URL: " in ex.message)
 
+    @patch('info_provider.storm_gateway.urllib2')
+    def test_concurrent_remote_call(self, mock_urllib2):
+        logging.debug("Testing gateway with concurrent status retrieval ...")
+        mock_urllib2.urlopen = MagicMock(side_effect=get_response_from_url)
+        expected = self._gateway.get_vfs_list_with_status()
+        gateway = StormGateway(self._gateway.get_endpoint(), max_workers=4)
+        response = gateway.get_vfs_list_with_status()
+        self.assertEqual(response, expected)
+
+    def test_concurrent_remote_call_failures(self):
+        logging.debug("Testing gateway concurrent status retrieval failures ...")
+        gateway = StormGateway(self._gateway.get_endpoint(), max_workers=4)
+        content = json.load(open(get_filepath("resources/response.json")))
+        gateway.get_vfs_list = MagicMock(return_value=content)
+        def get_space_info(sa_token):
+            if sa_token in ["TAPE_TOKEN", "IGI_TOKEN"]:
+                raise URLError("Unable to reach backend")
+            return get_sa_status_as_json(sa_token)
+        gateway.get_vfs_space_info = MagicMock(side_effect=get_space_info)
+        try:
+            gateway.get_vfs_list_with_status()
+            self.fail("StorageAreaStatusError expected")
+        except StorageAreaStatusError as ex:
+            self.assertEqual(sorted(ex.failures.keys()), ["IGI-FS", "TAPE-FS"])
+            self.assertTrue(isinstance(ex.failures["TAPE-FS"], URLError))
+            self.assertFalse("space" in ex.vfs_list["TAPE-FS"])
+            self.assertEqual(ex.vfs_list["TESTVO-FS"]["space"],
+                get_sa_status_as_json("TESTVO_TOKEN"))
+        self.assertEqual(gateway.get_vfs_space_info.call_count, 7)
+
+    def test_sequential_remote_call_failures(self):
+        logging.debug("Testing gateway sequential status retrieval failures ...")
+        gateway = StormGateway(self._gateway.get_endpoint())
+        content = json.load(open(get_filepath("resources/response.json")))
+        gateway.get_vfs_list = MagicMock(return_value=content)
+        def get_space_info(sa_token):
+            if sa_token == "TAPE_TOKEN":
+                raise URLError("Unable to reach backend")
+            return get_sa_status_as_json(sa_token)
+        gateway.get_vfs_space_info = MagicMock(side_effect=get_space_info)
+        try:
+            gateway.get_vfs_list_with_status()
+            self.fail("StorageAreaStatusError expected")
+        except StorageAreaStatusError as ex:
+            self.assertEqual(ex.failures.keys(), ["TAPE-FS"])
+            for name, data in ex.vfs_list.items():
+                if name != "TAPE-FS":
+                    self.assertEqual(data["space"], get_sa_status_as_json(data["token"]))
+        self.assertEqual(gateway.get_vfs_space_info.call_count, 7)
+
+    def test_bulk_status(self):
+        logging.debug("Testing gateway bulk status retrieval ...")
+        backend = MockBackend(bulk=True).start()
+        try:
+            gateway = StormGateway(backend.get_endpoint(), bulk_status=True)
+            response = gateway.get_vfs_list_with_status()
+            self.assertTrue(gateway.has_bulk_status_support())
+            self.assertEqual(backend.requests, ["/configuration/1.4/VirtualFSList", "/info/status"])
+            for name, data in response.items():
+                self.assertEqual(data["space"], get_sa_status_as_json(data["token"]))
+        finally:
+            backend.stop()
+
+    def test_bulk_status_not_supported(self):
+        logging.debug("Testing gateway bulk status fallback ...")
+        backend = MockBackend(bulk=False).start()
+        try:
+            gateway = StormGateway(backend.get_endpoint(), bulk_status=True)
+            response = gateway.get_vfs_list_with_status()
+            self.assertFalse(gateway.has_bulk_status_support())
+            self.assertEqual(len(backend.requests), 9)
+            for name, data in response.items():
+                self.assertEqual(data["space"], get_sa_status_as_json(data["token"]))
+            # support is detected only once
+            gateway.get_vfs_list_with_status()
+            self.assertEqual(len(backend.requests), 17)
+        finally:
+            backend.stop()
+
+    def test_bulk_status_support_shared_by_subsequent_runs(self):
+        logging.debug("Testing gateway bulk status detection state ...")
+        tmpdir = tempfile.mkdtemp()
+        state_file = os.path.join(tmpdir, "bulk-status.json")
+        backend = MockBackend(bulk=False).start()
+        try:
+            gateway = StormGateway(backend.get_endpoint(), bulk_status=True,
+                bulk_status_file=state_file)
+            gateway.get_vfs_list_with_status()
+            self.assertTrue("/info/status" in backend.requests)
+            backend.requests = []
+            # a later run doesn't detect support again
+            gateway = StormGateway(backend.get_endpoint(), bulk_status=True,
+                bulk_status_file=state_file)
+            gateway.get_vfs_list_with_status()
+            self.assertFalse("/info/status" in backend.requests)
+            self.assertEqual(len(backend.requests), 8)
+            # until the recheck interval has elapsed
+            with patch('info_provider.storm_gateway.time.time',
+                return_value=time.time() + StormGateway.BULK_STATUS_RECHECK_INTERVAL):
+                gateway = StormGateway(backend.get_endpoint(), bulk_status=True,
+                    bulk_status_file=state_file)
+            backend.requests = []
+            gateway.get_vfs_list_with_status()
+            self.assertTrue("/info/status" in backend.requests)
+        finally:
+            backend.stop()
+            shutil.rmtree(tmpdir)
+
+    def test_deadline(self):
+        deadline = Deadline(2)
+        self.assertFalse(deadline.expired())
+        self.assertTrue(deadline.get_timeout(10, 4) <= 0.5)
+        self.assertEqual(deadline.get_timeout(0.1, 4), 0.1)
+        unlimited = Deadline()
+        self.assertIsNone(unlimited.remaining())
+        self.assertEqual(unlimited.get_timeout(10, 4), 10)
+        expired = Deadline(0)
+        self.assertTrue(expired.expired())
+        with self.assertRaises(DeadlineExceeded):
+            expired.check("testing")
+
+    def test_slow_backend_within_time_budget(self):
+        logging.debug("Testing gateway with a slow backend ...")
+        backend = MockBackend(latency=1).start()
+        try:
+            gateway = StormGateway(backend.get_endpoint(), timeout=0.2, time_budget=1.5)
+            start = time.time()
+            self.assertFalse(gateway.is_online())
+            with self.assertRaises((URLError, DeadlineExceeded, socket.error)):
+                gateway.get_vfs_list_with_status()
+            self.assertTrue(time.time() - start < 2)
+        finally:
+            backend.stop()
+
+    def test_exhausted_time_budget(self):
+        backend = MockBackend().start()
+        try:
+            gateway = StormGateway(backend.get_endpoint(), time_budget=0)
+            self.assertFalse(gateway.is_online())
+            with self.assertRaises(DeadlineExceeded):
+                gateway.get_vfs_list_with_status()
+            self.assertEqual(backend.requests, [])
+        finally:
+            backend.stop()
+
     @staticmethod
     def raise_http_error(url):
         raise HTTPError(url=url, code=500, msg="Bad Gateway", hdrs=None, fp=None)
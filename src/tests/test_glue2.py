@@ -1,9 +1,20 @@
+import os
+import shutil
+import tempfile
+import time
+
+from mock.mock import patch, MagicMock
+
 from tests.utils import get_default_test_configuration,\
     get_default_storm_gateway
 from info_provider.storm_space_info_builder import SpaceInfoBuilder
 from info_provider.glue.glue2_constants import GLUE2_BASEDN
 from info_provider.glue.glue2 import Glue2
 from info_provider.glue.utils import as_gigabytes
+from info_provider.utils.run_context import RunContext
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..",
+    "config", "templates")
 
 
 try:
@@ -45,9 +56,42 @@ class TestGlue2(unittest.TestCase):
         gateway = get_default_storm_gateway()
         spaceinfo = SpaceInfoBuilder(configuration, gateway).build()
         glue2 = Glue2(configuration)
-        nodes = glue2.get_static_ldif_nodes(spaceinfo)
+        nodes = list(glue2.get_static_ldif_nodes(spaceinfo))
         self._check_generated_storage_service(nodes[0].get_info(), configuration)
         self._check_generated_storage_service_capacity(nodes[1].get_info(), configuration, spaceinfo)
 
+    def test_configure_leaves_unchanged_static_ldif(self):
+        configuration = get_default_test_configuration()
+        gateway = get_default_storm_gateway()
+        spaceinfo = SpaceInfoBuilder(configuration, gateway).build()
+        tmpdir = tempfile.mkdtemp()
+        static_ldif_file = os.path.join(tmpdir, "storm-glue2-static.ldif")
+        files = {
+            "GLUE2_INFO_SERVICE_CONFIG_FILE": os.path.join(tmpdir, "service.conf"),
+            "GLUE2_INFO_SERVICE_SRM_CONFIG_FILE": os.path.join(tmpdir, "srm.conf"),
+            "GLUE2_INFO_PROVIDER_FILE": os.path.join(tmpdir, "storm-glue2-provider"),
+            "GLUE2_INFO_PLUGIN_FILE": os.path.join(tmpdir, "storm-glue2-plugin"),
+            "GLUE2_INFO_STATIC_LDIF_FILE": static_ldif_file,
+            "GLUE2_INFO_SERVICE_CONFIG_FILE_TEMPLATE": os.path.join(TEMPLATES_DIR,
+                "glite-info-glue2-service-storm.conf.template"),
+            "GLUE2_INFO_SERVICE_SRM_CONFIG_FILE_TEMPLATE": os.path.join(TEMPLATES_DIR,
+                "glite-info-glue2-service-storm-endpoint-srm.conf.template"),
+            "set_owner": MagicMock()
+        }
+        try:
+            with patch.multiple('info_provider.glue.glue2', **files):
+                glue2 = Glue2(configuration)
+                self.assertEqual(glue2.configure(spaceinfo, RunContext()), [])
+                content = open(static_ldif_file).read()
+                mtime = os.stat(static_ldif_file).st_mtime
+                # a later run, with a different creation time
+                skipped = glue2.configure(spaceinfo, RunContext(time.time() + 3600))
+                self.assertTrue(static_ldif_file in skipped)
+                self.assertEqual(len(skipped), 5)
+                self.assertEqual(open(static_ldif_file).read(), content)
+                self.assertEqual(os.stat(static_ldif_file).st_mtime, mtime)
+        finally:
+            shutil.rmtree(tmpdir)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
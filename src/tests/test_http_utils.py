@@ -0,0 +1,74 @@
+import json
+import logging
+
+from urllib2 import HTTPError, URLError
+
+from info_provider.storm_gateway import StormGateway
+from info_provider.utils.http_utils import HTTPConnectionPool
+from tests.mock_backend import MockBackend
+from tests.utils import get_response_from_url
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestHttpUtils(unittest.TestCase):
+
+    def setUp(self):
+        self._backend = MockBackend().start()
+        self._endpoint = self._backend.get_endpoint()
+
+    def tearDown(self):
+        self._backend.stop()
+
+    def test_connection_is_reused(self):
+        pool = HTTPConnectionPool(self._endpoint, 2)
+        for _ in range(5):
+            response = pool.urlopen(self._endpoint + "/info/status/TAPE_TOKEN")
+            self.assertEqual(response.code, 200)
+            self.assertEqual(json.load(response)["sa-status"]["alias"], "TAPE_TOKEN")
+        self.assertEqual(pool.get_stats(), {"new_connections": 1, "reused_connections": 4})
+        pool.close()
+
+    def test_head_request(self):
+        pool = HTTPConnectionPool(self._endpoint, 1)
+        response = pool.urlopen(self._endpoint + "/configuration/1.3/VirtualFSList", "HEAD")
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.read(), "")
+        response = pool.urlopen(self._endpoint + "/configuration/1.3/VirtualFSList")
+        self.assertTrue(len(response.read()) > 0)
+        self.assertEqual(pool.get_stats()["reused_connections"], 1)
+        pool.close()
+
+    def test_http_error(self):
+        pool = HTTPConnectionPool(self._endpoint, 1)
+        with self.assertRaises(HTTPError) as cm:
+            pool.urlopen(self._endpoint + "/unknown")
+        self.assertEqual(cm.exception.code, 404)
+        pool.close()
+
+    def test_url_error(self):
+        self._backend.stop()
+        pool = HTTPConnectionPool(self._endpoint, 1)
+        with self.assertRaises(URLError):
+            pool.urlopen(self._endpoint + "/info/status/TAPE_TOKEN")
+        self._backend = MockBackend().start()
+
+    def test_gateway_with_pool(self):
+        logging.debug("Testing gateway with a pool of connections ...")
+        gateway = StormGateway(self._endpoint, pool_size=4, max_workers=4)
+        self.assertTrue(gateway.is_online())
+        response = gateway.get_vfs_list_with_status()
+        self.assertEqual(len(response), 7)
+        for name, data in response.items():
+            expected = json.load(get_response_from_url(data["token"]))["sa-status"]
+            self.assertEqual(data["space"], expected)
+        stats = gateway.get_connection_stats()
+        self.assertEqual(stats["new_connections"] + stats["reused_connections"], 9)
+        self.assertTrue(stats["new_connections"] <= 4)
+        gateway.close()
+
+if __name__ == "__main__":
+    unittest.main()
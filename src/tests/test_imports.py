@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "storm-info-provider")
+
+class TestImports(unittest.TestCase):
+
+    def _get_loaded_modules(self, code):
+        # run the code in a fresh interpreter and list the modules it loaded
+        code += "\nimport sys\nprint ' '.join(sorted(sys.modules.keys()))"
+        output = subprocess.check_output([sys.executable, "-c", code],
+            cwd=os.path.dirname(SCRIPT))
+        return output.split()
+
+    def test_script_imports(self):
+        modules = self._get_loaded_modules(
+            "import imp\nimp.load_source('storm_info_provider_script', '%s')" % SCRIPT)
+        for module in ["symbol", "info_provider.configuration",
+            "info_provider.storm_gateway", "info_provider.storm_info_provider",
+            "info_provider.daemon", "ldif"]:
+            self.assertNotIn(module, modules)
+
+    def test_update_ldif_imports(self):
+        modules = self._get_loaded_modules("""
+from info_provider.storm_info_provider import StormInfoProvider
+from tests.utils import get_default_test_configuration, get_default_storm_gateway
+StormInfoProvider(configuration=get_default_test_configuration(),
+    gateway=get_default_storm_gateway()).get_update_ldif('glue2')
+""")
+        self.assertIn("info_provider.glue.glue2", modules)
+        for module in ["info_provider.glue.glue13", "info_provider.report",
+            "info_provider.storm_storage_service_builder"]:
+            self.assertNotIn(module, modules)
+
+    def test_report_json_imports(self):
+        modules = self._get_loaded_modules("""
+import tempfile
+from info_provider.storm_info_provider import StormInfoProvider
+from tests.utils import get_default_test_configuration, get_default_storm_gateway
+StormInfoProvider(configuration=get_default_test_configuration(),
+    gateway=get_default_storm_gateway()).get_report_json(tempfile.mktemp())
+""")
+        for module in ["info_provider.glue.glue13", "info_provider.glue.glue2", "ldif"]:
+            self.assertNotIn(module, modules)
+
+if __name__ == "__main__":
+    unittest.main()
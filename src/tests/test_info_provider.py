@@ -1,6 +1,15 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from StringIO import StringIO
+
 from mock.mock import patch
 
 from info_provider.storm_info_provider import StormInfoProvider
+from info_provider.utils.delta import DeltaState
 from tests.utils import get_default_test_configuration,\
     get_default_storm_gateway
 
@@ -38,11 +47,91 @@ class TestInfoProvider(unittest.TestCase):
         ip.get_update_ldif("glue13")
         ip.get_update_ldif("glue2")
 
+    def test_get_update_ldif_all(self):
+        configuration = get_default_test_configuration()
+        gateway = get_default_storm_gateway()
+        ip = StormInfoProvider(configuration=configuration, gateway=gateway)
+        outputs = {}
+        for glue_protocol in ["glue13", "glue2", "all"]:
+            with patch('sys.stdout', new_callable=StringIO):
+                ip.get_update_ldif(glue_protocol)
+                outputs[glue_protocol] = sys.stdout.getvalue()
+        self.assertEqual(outputs["all"], outputs["glue13"] + outputs["glue2"])
+
+    def test_get_update_ldif_failure_writes_nothing(self):
+        configuration = get_default_test_configuration()
+        gateway = get_default_storm_gateway()
+        ip = StormInfoProvider(configuration=configuration, gateway=gateway)
+        def get_update_ldif_spaceinfo(*args):
+            # fails after the endpoints have been rendered
+            raise KeyError("STORM_TAPE_ACCESSPOINT")
+        with patch('sys.stdout', new_callable=StringIO):
+            with patch('info_provider.glue.glue2.Glue2.get_update_ldif_spaceinfo',
+                side_effect=get_update_ldif_spaceinfo):
+                with self.assertRaises(KeyError):
+                    ip.get_update_ldif("glue2")
+            self.assertEqual(sys.stdout.getvalue(), "")
+
+    def test_get_update_ldif_delta(self):
+        configuration = get_default_test_configuration()
+        gateway = get_default_storm_gateway()
+        ip = StormInfoProvider(configuration=configuration, gateway=gateway)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for glue_protocol in ["glue13", "glue2"]:
+                state_file = os.path.join(tmpdir, glue_protocol + ".json")
+                outputs = []
+                for force in [False, False, True]:
+                    with patch('sys.stdout', new_callable=StringIO):
+                        ip.get_update_ldif(glue_protocol, DeltaState(state_file, force=force))
+                        outputs.append(sys.stdout.getvalue())
+                self.assertTrue(outputs[0].startswith("dn: "))
+                self.assertEqual(outputs[1], "")
+                self.assertEqual(outputs[2], outputs[0])
+        finally:
+            shutil.rmtree(tmpdir)
+
     def test_get_report_json(self):
         configuration = get_default_test_configuration()
         gateway = get_default_storm_gateway()
         ip = StormInfoProvider(configuration=configuration, gateway=gateway)
         ip.get_report_json("/tmp/report.json")
 
+    def test_publish(self):
+        configuration = get_default_test_configuration()
+        gateway = get_default_storm_gateway()
+        ip = StormInfoProvider(configuration=configuration, gateway=gateway)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            output_dir = os.path.join(tmpdir, "publish")
+            report = os.path.join(tmpdir, "report.json")
+            published = ip.publish(output_dir, report)
+            self.assertEqual(published, [
+                os.path.join(output_dir, "storm-glue13-update.ldif"),
+                os.path.join(output_dir, "storm-glue2-update.ldif"), report])
+            outputs = ip.get_outputs()
+            self.assertEqual(open(published[0]).read(), outputs["get-update-ldif glue13"])
+            self.assertEqual(open(published[1]).read(), outputs["get-update-ldif glue2"])
+            # the report timestamps may differ
+            self.assertEqual(sorted(json.load(open(report)).keys()),
+                sorted(json.loads(outputs["get-report-json"]).keys()))
+            # no temporary files are left
+            self.assertEqual(sorted(os.listdir(output_dir)),
+                ["storm-glue13-update.ldif", "storm-glue2-update.ldif"])
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_get_outputs(self):
+        configuration = get_default_test_configuration()
+        gateway = get_default_storm_gateway()
+        ip = StormInfoProvider(configuration=configuration, gateway=gateway)
+        outputs = ip.get_outputs()
+        self.assertEqual(sorted(outputs.keys()), ["get-report-json",
+            "get-update-ldif all", "get-update-ldif glue13", "get-update-ldif glue2"])
+        self.assertTrue(outputs["get-update-ldif glue13"].startswith("dn: "))
+        self.assertTrue(outputs["get-update-ldif glue2"].startswith("dn: "))
+        self.assertEqual(outputs["get-update-ldif all"],
+            outputs["get-update-ldif glue13"] + outputs["get-update-ldif glue2"])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,187 @@
+import os
+import shutil
+import tempfile
+
+from StringIO import StringIO
+
+from info_provider.utils.ldap_utils import LDIFStreamWriter, LDIFExporter, LDIFNode, \
+    LDIFNodeTemplate, save_nodes_to_file
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+def _generate_nodes(count, generated):
+    for i in range(count):
+        generated.append(i)
+        yield LDIFNode("GlueSALocalID=sa-%d,o=grid" % i, {}).add({"GlueSAName": "sa-%d" % i})
+
+
+class TestLDIFStreamWriter(unittest.TestCase):
+
+    def _unparse(self, dn, entries, cols=76):
+        stream = StringIO()
+        writer = LDIFStreamWriter(stream, cols=cols)
+        writer.unparse(dn, entries)
+        writer.flush()
+        return stream.getvalue()
+
+    def test_plain_values(self):
+        output = self._unparse("GlueSEUniqueID=host,mds-vo-name=resource,o=grid",
+            {"GlueSEName": ["host:storm"]})
+        self.assertEqual(output, "dn: GlueSEUniqueID=host,mds-vo-name=resource,o=grid\n"
+            "GlueSEName: host:storm\n\n")
+
+    def test_multiple_values(self):
+        output = self._unparse("o=grid", {"objectClass": ["GlueTop", "GlueSE"]})
+        self.assertEqual(output, "dn: o=grid\nobjectClass: GlueTop\nobjectClass: GlueSE\n\n")
+
+    def test_base64_values(self):
+        for value in [" leading", ":colon", "<less", "trailing ", "new\nline",
+            "\xc3\xa8", "nul\000"]:
+            output = self._unparse("o=grid", {"GlueSEName": [value]})
+            self.assertEqual(output, "dn: o=grid\nGlueSEName:: %s\n\n" %
+                value.encode("base64").replace("\n", ""))
+
+    def test_unicode_values(self):
+        output = self._unparse(u"o=grid", {"GlueSEName": [u"storm"]})
+        self.assertEqual(output, "dn: o=grid\nGlueSEName: storm\n\n")
+        self.assertIsInstance(output, str)
+
+    def test_folded_lines(self):
+        output = self._unparse("o=grid", {"GlueSEName": ["abcdefghijklmnopqrstuvwxyz"]},
+            cols=10)
+        self.assertEqual(output, "dn: o=grid\nGlueSEName\n : abcdefg\n hijklmnop\n"
+            " qrstuvwxy\n z\n\n")
+
+    def test_buffered_writes(self):
+        stream = StringIO()
+        writer = LDIFStreamWriter(stream, buffer_size=100)
+        writer.unparse("o=grid", {"GlueSEName": ["storm"]})
+        self.assertEqual(stream.getvalue(), "")
+        for _ in range(10):
+            writer.unparse("o=grid", {"GlueSEName": ["storm"]})
+        self.assertNotEqual(stream.getvalue(), "")
+        writer.flush()
+        self.assertEqual(stream.getvalue(), "dn: o=grid\nGlueSEName: storm\n\n" * 11)
+        self.assertEqual(writer.records_written, 11)
+
+    def test_same_output_of_python_ldap(self):
+        try:
+            from ldif import LDIFWriter
+        except ImportError:
+            self.skipTest("python-ldap not available")
+        exporter = LDIFExporter()
+        for i in range(20):
+            node = LDIFNode("GlueSALocalID=sa-%d,o=grid" % i, {
+                "objectClass": ["GlueTop", "GlueSA"],
+                "GlueSAName": ["sa-%d" % i],
+                "GlueSAPath": [" /storage/sa-%d" % i],
+                "GlueChunkKey": ["GlueSEUniqueID=" + "x" * 600]})
+            node.add({"GlueSATotalOnlineSize": i * 1000})
+            exporter.add_node(node)
+        expected = StringIO()
+        writer = LDIFWriter(expected, cols=512)
+        for node in exporter.nodes:
+            writer.unparse(node["dn"], node["entries"])
+        output = StringIO()
+        exporter.print_nodes(output)
+        # recent python-ldap releases sort the attributes of each record
+        self.assertEqual(_get_records(output.getvalue()), _get_records(expected.getvalue()))
+
+
+class TestLDIFExporter(unittest.TestCase):
+
+    def test_streamed_nodes(self):
+        stream = StringIO()
+        generated = []
+        exporter = LDIFExporter(stream)
+        exporter.add_nodes(_generate_nodes(3, generated)).flush()
+        self.assertEqual(generated, [0, 1, 2])
+        # streamed nodes are not kept
+        self.assertEqual(exporter.nodes, [])
+        self.assertEqual(stream.getvalue(), "".join(
+            "dn: GlueSALocalID=sa-%d,o=grid\nGlueSAName: sa-%d\n\n" % (i, i)
+            for i in range(3)))
+
+    def test_same_output_of_collected_nodes(self):
+        collected = StringIO()
+        LDIFExporter().add_nodes(_generate_nodes(10, [])).print_nodes(collected)
+        streamed = StringIO()
+        LDIFExporter(streamed).add_nodes(_generate_nodes(10, [])).flush()
+        self.assertEqual(streamed.getvalue(), collected.getvalue())
+
+    def test_save_nodes_to_file(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmpdir, "static.ldif")
+            save_nodes_to_file(_generate_nodes(2, []), fname)
+            self.assertEqual(open(fname).read(),
+                "dn: GlueSALocalID=sa-0,o=grid\nGlueSAName: sa-0\n\n"
+                "dn: GlueSALocalID=sa-1,o=grid\nGlueSAName: sa-1\n\n")
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_save_nodes_to_file_with_volatile_attributes(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fname = os.path.join(tmpdir, "static.ldif")
+            def nodes(count, creation_time):
+                for node in _generate_nodes(count, []):
+                    yield node.add({"GLUE2EntityCreationTime": creation_time})
+            self.assertTrue(save_nodes_to_file(nodes(2, "2020-01-01T00:00:00"), fname,
+                ["GLUE2EntityCreationTime"]))
+            self.assertFalse(save_nodes_to_file(nodes(2, "2020-01-02T00:00:00"), fname,
+                ["GLUE2EntityCreationTime"]))
+            self.assertTrue("2020-01-01T00:00:00" in open(fname).read())
+            # other changes are still written, with the new values
+            self.assertTrue(save_nodes_to_file(nodes(3, "2020-01-02T00:00:00"), fname,
+                ["GLUE2EntityCreationTime"]))
+            self.assertFalse("2020-01-01T00:00:00" in open(fname).read())
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+class TestLDIFNodeTemplate(unittest.TestCase):
+
+    TEMPLATE = LDIFNodeTemplate("GlueSALocalID=%s,GlueSEUniqueID=%s,o=grid", {
+        "objectClass": ["GlueSATop", "GlueSA"],
+        "GlueSATotalOnlineSize": 0,
+        "GlueSAType": "permanent"})
+
+    def _create_node(self, sa, se):
+        return LDIFNode(self.TEMPLATE.get_dn(sa, se), {"GlueSALocalID": sa},
+            self.TEMPLATE)
+
+    def test_same_entries_of_default_entries(self):
+        node = self._create_node("sa", "host").init()
+        expected = LDIFNode("GlueSALocalID=sa,GlueSEUniqueID=host,o=grid", {
+            "objectClass": ["GlueSATop", "GlueSA"],
+            "GlueSATotalOnlineSize": 0,
+            "GlueSAType": "permanent",
+            "GlueSALocalID": "sa"}).init()
+        self.assertEqual(node.get_info(), expected.get_info())
+
+    def test_constant_entries_not_changed(self):
+        node = self._create_node("sa-1", "host").init()
+        node.add({"GlueSATotalOnlineSize": 100, "objectClass": ["GlueSATop"]})
+        self.assertEqual(node.entries["GlueSATotalOnlineSize"], ["100"])
+        other = self._create_node("sa-2", "host").init()
+        self.assertEqual(other.entries["GlueSATotalOnlineSize"], ["0"])
+        self.assertEqual(other.entries["objectClass"], ["GlueSATop", "GlueSA"])
+
+    def test_update_nodes_without_defaults(self):
+        # nodes not initialized only have the added entries
+        node = self._create_node("sa", "host").add({"GlueSAFreeOnlineSize": 1})
+        self.assertEqual(node.entries, {"GlueSAFreeOnlineSize": ["1"]})
+
+
+def _get_records(output):
+    # the folding of a line doesn't depend on the attribute order
+    records = output.replace("\n ", "").split("\n\n")
+    return [sorted(record.split("\n")) for record in records]
+
+if __name__ == "__main__":
+    unittest.main()
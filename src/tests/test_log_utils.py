@@ -0,0 +1,46 @@
+import logging
+
+from StringIO import StringIO
+
+from mock.mock import MagicMock
+
+from info_provider.utils.log_utils import lazy, is_debug_enabled
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestLogUtils(unittest.TestCase):
+
+    def setUp(self):
+        self._logger = logging.getLogger()
+        self._level = self._logger.level
+        self._stream = StringIO()
+        self._handler = logging.StreamHandler(self._stream)
+        self._logger.addHandler(self._handler)
+
+    def tearDown(self):
+        self._logger.removeHandler(self._handler)
+        self._logger.setLevel(self._level)
+
+    def test_lazy_message_not_evaluated(self):
+        self._logger.setLevel(logging.INFO)
+        function = MagicMock(return_value="expensive")
+        logging.debug("%s", lazy(function, 1, 2))
+        self.assertFalse(function.called)
+        self.assertFalse(is_debug_enabled())
+        self.assertEqual(self._stream.getvalue(), "")
+
+    def test_lazy_message_evaluated(self):
+        self._logger.setLevel(logging.DEBUG)
+        function = MagicMock(return_value="expensive")
+        logging.debug("message: %s", lazy(function, 1, 2))
+        # evaluated by each handler formatting the record
+        function.assert_called_with(1, 2)
+        self.assertTrue(is_debug_enabled())
+        self.assertEqual(self._stream.getvalue(), "message: expensive\n")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+
+from mock.mock import MagicMock
+
+from info_provider.utils.metadata import MetadataCache
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._metadata_file = os.path.join(self._tmpdir, "metadata.json")
+        self._certificate = os.path.join(self._tmpdir, "hostcert.pem")
+        self._rpmdb = os.path.join(self._tmpdir, "rpm")
+        open(self._certificate, 'w').close()
+        os.mkdir(self._rpmdb)
+        open(os.path.join(self._rpmdb, "Packages"), 'w').close()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def _touch(self, filepath, delta):
+        mtime = os.stat(filepath).st_mtime + delta
+        os.utime(filepath, (mtime, mtime))
+
+    def test_value_is_cached(self):
+        compute = MagicMock(return_value="1.11.15")
+        self.assertEqual(MetadataCache(self._metadata_file).get("version", [self._rpmdb], compute), "1.11.15")
+        self.assertEqual(MetadataCache(self._metadata_file).get("version", [self._rpmdb], compute), "1.11.15")
+        self.assertEqual(compute.call_count, 1)
+
+    def test_value_is_recomputed_on_changes(self):
+        compute_version = MagicMock(return_value="1.11.15")
+        compute_issuer = MagicMock(return_value="/C=IT/O=INFN/CN=INFN CA")
+        metadata = MetadataCache(self._metadata_file)
+        metadata.get("version", [self._rpmdb], compute_version)
+        metadata.get("issuer", [self._certificate], compute_issuer)
+        # the rpm database is updated
+        self._touch(os.path.join(self._rpmdb, "Packages"), 10)
+        metadata = MetadataCache(self._metadata_file)
+        metadata.get("version", [self._rpmdb], compute_version)
+        metadata.get("issuer", [self._certificate], compute_issuer)
+        self.assertEqual(compute_version.call_count, 2)
+        self.assertEqual(compute_issuer.call_count, 1)
+        # the host certificate is renewed
+        self._touch(self._certificate, 10)
+        metadata = MetadataCache(self._metadata_file)
+        metadata.get("version", [self._rpmdb], compute_version)
+        metadata.get("issuer", [self._certificate], compute_issuer)
+        self.assertEqual(compute_version.call_count, 2)
+        self.assertEqual(compute_issuer.call_count, 2)
+
+    def test_missing_source(self):
+        compute = MagicMock(return_value="")
+        missing = os.path.join(self._tmpdir, "missing.pem")
+        MetadataCache(self._metadata_file).get("issuer", [missing], compute)
+        MetadataCache(self._metadata_file).get("issuer", [missing], compute)
+        self.assertEqual(compute.call_count, 1)
+        open(missing, 'w').close()
+        MetadataCache(self._metadata_file).get("issuer", [missing], compute)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_invalid_metadata_file(self):
+        f = open(self._metadata_file, 'w')
+        f.write("{ invalid")
+        f.close()
+        compute = MagicMock(return_value="1.11.15")
+        self.assertEqual(MetadataCache(self._metadata_file).get("version", [self._rpmdb], compute), "1.11.15")
+        self.assertEqual(compute.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
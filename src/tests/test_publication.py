@@ -0,0 +1,79 @@
+from tests.utils import get_default_test_configuration,\
+    get_default_storm_gateway
+from info_provider.storm_space_info_builder import SpaceInfoBuilder
+from info_provider.glue.utils import as_gigabytes, as_kilobytes
+from info_provider.model.capacity import build_capacity_table
+from info_provider.model.publication import get_publication, PublishedShare
+from info_provider.model.space import ApproachableRule, VirtualFileSystemRecord
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestPublication(unittest.TestCase):
+
+    def _build_space_info(self, configuration):
+        return SpaceInfoBuilder(configuration, get_default_storm_gateway()).build()
+
+    def test_shares(self):
+        configuration = get_default_test_configuration()
+        spaceinfo = self._build_space_info(configuration)
+        publication = get_publication(configuration, spaceinfo)
+        shares = publication.get_shares()
+        self.assertEqual([share.get_name() for share in shares],
+            list(spaceinfo.get_vfs().keys()))
+        for share in shares:
+            vfs = share.get_vfs()
+            self.assertIs(vfs, spaceinfo.get_vfs()[share.get_name()])
+            self.assertEqual(share.get_gigabytes()["total"],
+                as_gigabytes(vfs.get_space().get_total()))
+            self.assertEqual(share.get_kilobytes()["used"],
+                as_kilobytes(vfs.get_space().get_used()))
+            self.assertEqual(share.get_retention_policy(),
+                vfs.get_retentionpolicy().lower())
+            self.assertEqual(share.get_access_latency(),
+                vfs.get_accesslatency().lower())
+            self.assertEqual(share.get_access_control_rule(),
+                "VO:" + ",VO:".join(vfs.get_vos()))
+            self.assertEqual(share.has_custom_token(),
+                configuration.vfs_has_custom_token(share.get_name()))
+
+    def test_summary(self):
+        configuration = get_default_test_configuration()
+        spaceinfo = self._build_space_info(configuration)
+        summary = get_publication(configuration, spaceinfo).get_summary_gigabytes()
+        self.assertEqual(summary["total"], as_gigabytes(spaceinfo.get_summary().get_total()))
+        self.assertEqual(summary["free"], as_gigabytes(spaceinfo.get_summary().get_free()))
+        self.assertEqual(summary["nearline"],
+            as_gigabytes(spaceinfo.get_summary().get_nearline()))
+
+    def test_built_once(self):
+        configuration = get_default_test_configuration()
+        spaceinfo = self._build_space_info(configuration)
+        publication = get_publication(configuration, spaceinfo)
+        self.assertIs(get_publication(configuration, spaceinfo), publication)
+        self.assertIsNot(get_publication(configuration,
+            self._build_space_info(configuration)), publication)
+
+    def _get_policy_rules(self, approachable_rules):
+        vfs = VirtualFileSystemRecord(name="TESTVO-FS", vos=["test.vo"],
+            approachable_rules=approachable_rules)
+        capacity = build_capacity_table({"TESTVO-FS": vfs})
+        return PublishedShare("TESTVO-FS", vfs, capacity).get_policy_rules()
+
+    def test_policy_rules_of_backend_response(self):
+        self.assertEqual(self._get_policy_rules([
+            {"dn": "*", "vo": "test.vo"},
+            {"dn": "/C=IT/O=INFN", "vo": "test.vo"}]),
+            (["/C=IT/O=INFN"], ["test.vo"]))
+
+    def test_policy_rules_of_configuration(self):
+        self.assertEqual(self._get_policy_rules([
+            ApproachableRule(dn=["/C=IT", "/O=INFN"], vo="test.vo"),
+            ApproachableRule(dn="*", vo="test.vo.2")]),
+            (["/C=IT/O=INFN"], ["test.vo", "test.vo.2"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import time
+
+from tests.utils import get_default_test_configuration,\
+    get_default_storm_gateway
+from info_provider.storm_space_info_builder import SpaceInfoBuilder
+from info_provider.storm_storage_service_builder import StorageServiceBuilder
+from info_provider.glue.glue2 import Glue2
+from info_provider.utils.run_context import RunContext
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestRunContext(unittest.TestCase):
+
+    def test_clock_read_once(self):
+        now = 1500000000.5
+        context = RunContext(now)
+        self.assertEqual(context.get_timestamp(), 1500000000)
+        self.assertEqual(context.get_creation_time(),
+            time.strftime('%Y-%m-%dT%T', time.localtime(now)))
+
+    def test_shared_creation_time(self):
+        configuration = get_default_test_configuration()
+        spaceinfo = SpaceInfoBuilder(configuration, get_default_storm_gateway()).build()
+        context = RunContext(0)
+        glue2 = Glue2(configuration)
+        nodes = list(glue2.get_update_ldif_endpoints("production", context)) + \
+            list(glue2.get_update_ldif_spaceinfo(spaceinfo, "production", context))
+        self.assertTrue(len(nodes) > 1)
+        for node in nodes:
+            self.assertEqual(node.init().get_info()["entries"]["GLUE2EntityCreationTime"],
+                [context.get_creation_time()])
+
+    def test_shared_timestamp(self):
+        configuration = get_default_test_configuration()
+        spaceinfo = SpaceInfoBuilder(configuration, get_default_storm_gateway()).build()
+        context = RunContext(1000)
+        service = StorageServiceBuilder(configuration, spaceinfo, context).build()
+        self.assertEqual(service.get_latest_update(), 1000)
+        self.assertTrue(len(service.get_storage_shares()) > 0)
+        for share in service.get_storage_shares():
+            self.assertEqual(share.get_timestamp(), 1000)
+
+if __name__ == "__main__":
+    unittest.main()
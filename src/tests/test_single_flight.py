@@ -0,0 +1,121 @@
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from info_provider.glue.glue13 import Glue13
+from info_provider.glue.glue2 import Glue2
+from info_provider.model.space import space_info_to_dict, space_info_from_dict
+from info_provider.storm_space_info_builder import SpaceInfoBuilder
+from info_provider.utils.run_context import RunContext
+from info_provider.utils.single_flight import SingleFlight
+from tests.utils import get_default_test_configuration,\
+    get_default_storm_gateway, get_default_space_info_summary
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.mkdtemp()
+        self._calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self._tmpdir)
+
+    def _create_single_flight(self, timeout=5):
+        return SingleFlight(os.path.join(self._tmpdir, "space-info.lock"),
+            os.path.join(self._tmpdir, "space-info.json"), timeout)
+
+    def _slow_build(self):
+        self._calls.append(time.time())
+        result = {"calls": len(self._calls)}
+        time.sleep(0.3)
+        return result
+
+    def _run_concurrently(self, single_flights):
+        results = [None] * len(single_flights)
+        def run(i):
+            results[i] = single_flights[i].run(self._slow_build)
+        threads = []
+        for i in range(len(single_flights)):
+            threads.append(threading.Thread(target=run, args=(i,)))
+            threads[i].start()
+            time.sleep(0.05)
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_runs_share_the_result(self):
+        results = self._run_concurrently([self._create_single_flight() for _ in range(3)])
+        self.assertEqual(len(self._calls), 1)
+        self.assertEqual(results, [{"calls": 1}] * 3)
+
+    def test_old_snapshot_is_not_reused(self):
+        self._create_single_flight().run(self._slow_build)
+        result = self._create_single_flight().run(self._slow_build)
+        self.assertEqual(len(self._calls), 2)
+        self.assertEqual(result, {"calls": 2})
+
+    def test_wait_timeout(self):
+        results = self._run_concurrently([self._create_single_flight(),
+            self._create_single_flight(0.1)])
+        self.assertEqual(len(self._calls), 2)
+        self.assertEqual(results[0], {"calls": 1})
+        self.assertEqual(results[1], {"calls": 2})
+
+    def test_invalid_snapshot_is_ignored(self):
+        f = open(os.path.join(self._tmpdir, "space-info.json"), 'w')
+        f.write("invalid")
+        f.close()
+        result = self._create_single_flight().run(self._slow_build)
+        self.assertEqual(result, {"calls": 1})
+
+    def _create_space_info_single_flight(self):
+        return SingleFlight(os.path.join(self._tmpdir, "space-info.lock"),
+            os.path.join(self._tmpdir, "space-info.json"), 5,
+            encode=space_info_to_dict, decode=space_info_from_dict)
+
+    def _render(self, configuration, spaceinfo):
+        # the nodes by DN, whatever the order of the VFS, with the same clock
+        context = RunContext(0)
+        return dict((node.dn, node.entries) for node in itertools.chain(
+            Glue13(configuration).get_update_ldif_nodes(spaceinfo),
+            Glue2(configuration).get_static_ldif_nodes(spaceinfo, context)))
+
+    def test_space_info_snapshot(self):
+        configuration = get_default_test_configuration()
+        builder = SpaceInfoBuilder(configuration, get_default_storm_gateway())
+        expected = self._create_space_info_single_flight().run(builder.build)
+        # published as plain JSON
+        json.loads(open(os.path.join(self._tmpdir, "space-info.json")).read())
+        spaceinfo = self._create_space_info_single_flight()._load_snapshot(0)
+        self.assertEqual(self._render(configuration, spaceinfo),
+            self._render(configuration, expected))
+        expected_summary = get_default_space_info_summary()
+        self.assertEqual(spaceinfo.get_summary().get_total(), expected_summary.get_total())
+        self.assertEqual(spaceinfo.get_summary().get_used(), expected_summary.get_used())
+        self.assertEqual(spaceinfo.get_summary().get_nearline(), expected_summary.get_nearline())
+        self.assertEqual(len(spaceinfo.get_vfs()), 7)
+
+    def test_space_info_snapshot_from_configuration(self):
+        configuration = get_default_test_configuration()
+        configuration.set("STORM_SERVING_STATE", "closed")
+        builder = SpaceInfoBuilder(configuration, get_default_storm_gateway())
+        expected = self._create_space_info_single_flight().run(builder.build)
+        spaceinfo = self._create_space_info_single_flight()._load_snapshot(0)
+        configuration.set("STORM_SERVING_STATE", "production")
+        self.assertEqual(self._render(configuration, spaceinfo),
+            self._render(configuration, expected))
+        for name, vfs in spaceinfo.get_vfs().items():
+            self.assertEqual(vfs.get_source(), expected.get_vfs()[name].get_source())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,18 @@
+import json
 import logging
 
+from mock.mock import MagicMock
+from urllib2 import URLError
+
+from info_provider.model.record import to_json
+from info_provider.model.space import SpaceRecord, VirtualFileSystemRecord, \
+    ApproachableRule, SOURCE_BACKEND, SOURCE_LAST_KNOWN, SOURCE_CONFIGURATION
+from info_provider.storm_gateway import StormGateway
 from info_provider.storm_space_info_builder import SpaceInfoBuilder
+from tests.mock_backend import MockBackend
 from tests.utils import get_default_test_configuration,\
     get_default_storm_gateway, get_default_space_info_summary,\
-    get_default_space_info_summary_from_configuration
+    get_default_space_info_summary_from_configuration, get_sa_status_as_json
 
 try:
     import unittest2 as unittest
@@ -14,6 +23,25 @@ logger = logging.getLogger(__name__)
 
 class TestSpaceInfo(unittest.TestCase):
 
+    def test_space_record_defaults(self):
+        space = SpaceRecord(total=100, used=40)
+        self.assertFalse(hasattr(space, "__dict__"))
+        self.assertEqual(space.to_dict(), {"total": 100, "available": 100,
+            "used": 40, "free": 100, "unavailable": 0, "reserved": 0, "busy": 0,
+            "nearline": 0})
+
+    def test_records_to_json(self):
+        vfs = VirtualFileSystemRecord(name="TESTVO_FS", vos=["test.vo"],
+            approachable_rules=[ApproachableRule(vo="test.vo")],
+            space=SpaceRecord(total=100, near_line=10))
+        data = json.loads(to_json(vfs))
+        self.assertEqual(sorted(data.keys()), ["accesslatency", "approachablerules",
+            "name", "protocols", "retentionpolicy", "root", "source", "space",
+            "stfnroot", "storageclass", "token", "vos"])
+        self.assertEqual(data["approachablerules"], [{"dn": "", "vo": "test.vo"}])
+        self.assertEqual(data["space"]["nearline"], 10)
+        self.assertRaises(TypeError, to_json, object())
+
     def test_space_info_builder_with_default_configuration(self):
         configuration = get_default_test_configuration()
         gateway = get_default_storm_gateway()
@@ -42,3 +70,61 @@ class TestSpaceInfo(unittest.TestCase):
         self.assertEqual(spaceinfo.get_summary().get_reserved(), expected_summary.get_reserved())
         self.assertEqual(spaceinfo.get_summary().get_busy(), expected_summary.get_busy())
         self.assertEqual(spaceinfo.get_summary().get_nearline(), expected_summary.get_nearline())
+
+    def test_space_info_builder_with_slow_backend(self):
+        configuration = get_default_test_configuration()
+        backend = MockBackend(latency=1).start()
+        try:
+            gateway = StormGateway(backend.get_endpoint(), timeout=0.2, time_budget=0.5)
+            spaceinfo = SpaceInfoBuilder(configuration, gateway).build()
+        finally:
+            backend.stop()
+        expected_summary = get_default_space_info_summary_from_configuration()
+        self.assertEqual(spaceinfo.get_summary().get_total(), expected_summary.get_total())
+        self.assertEqual(spaceinfo.get_summary().get_used(), expected_summary.get_used())
+        self.assertEqual(spaceinfo.get_summary().get_nearline(), expected_summary.get_nearline())
+
+    def _get_gateway_failing_for(self, sa_token):
+        gateway = get_default_storm_gateway()
+        def get_space_info(token):
+            if token == sa_token:
+                raise URLError("Unable to reach backend")
+            return get_sa_status_as_json(token)
+        gateway.get_vfs_space_info = MagicMock(side_effect=get_space_info)
+        gateway.get_last_known_vfs_space_info = MagicMock(return_value=None)
+        return gateway
+
+    def test_space_info_builder_with_failed_storage_area(self):
+        configuration = get_default_test_configuration()
+        gateway = self._get_gateway_failing_for("TAPE_TOKEN")
+        spaceinfo = SpaceInfoBuilder(configuration, gateway).build()
+        tape = spaceinfo.get_vfs()["TAPE-FS"]
+        self.assertEqual(tape.get_source(), SOURCE_CONFIGURATION)
+        self.assertEqual(tape.get_space().get_total(), configuration.get_online_size(sa="tape"))
+        self.assertEqual(tape.get_space().get_nearline(), configuration.get_nearline_size(sa="tape"))
+        testvo = spaceinfo.get_vfs()["TESTVO-FS"]
+        self.assertEqual(testvo.get_source(), SOURCE_BACKEND)
+        self.assertEqual(testvo.get_space().get_total(),
+            long(get_sa_status_as_json("TESTVO_TOKEN")["total-space"]))
+
+    def test_space_info_builder_with_last_known_storage_area_status(self):
+        configuration = get_default_test_configuration()
+        gateway = self._get_gateway_failing_for("TAPE_TOKEN")
+        gateway.get_last_known_vfs_space_info = MagicMock(
+            return_value=get_sa_status_as_json("TAPE_TOKEN"))
+        spaceinfo = SpaceInfoBuilder(configuration, gateway).build()
+        tape = spaceinfo.get_vfs()["TAPE-FS"]
+        self.assertEqual(tape.get_source(), SOURCE_LAST_KNOWN)
+        self.assertEqual(tape.get_space().get_total(),
+            long(get_sa_status_as_json("TAPE_TOKEN")["total-space"]))
+        gateway.get_last_known_vfs_space_info.assert_called_once_with("TAPE_TOKEN")
+
+    def test_space_info_builder_with_site_fallback(self):
+        configuration = get_default_test_configuration()
+        configuration.set("STORM_INFO_PROVIDER_FALLBACK", "site")
+        gateway = self._get_gateway_failing_for("TAPE_TOKEN")
+        spaceinfo = SpaceInfoBuilder(configuration, gateway).build()
+        expected_summary = get_default_space_info_summary_from_configuration()
+        self.assertEqual(spaceinfo.get_summary().get_total(), expected_summary.get_total())
+        for vfs in spaceinfo.get_vfs().values():
+            self.assertEqual(vfs.get_source(), SOURCE_CONFIGURATION)
@@ -1,12 +1,13 @@
 import json
 import logging
 
-from mock.mock import patch
+from mock.mock import patch, MagicMock
+from urllib2 import URLError
 
 from info_provider.storm_storage_service_builder import StorageServiceBuilder
 from tests.utils import get_default_test_configuration,\
     get_default_space_info_summary_from_configuration,\
-    get_default_storm_gateway, get_test_configuration
+    get_default_storm_gateway, get_test_configuration, get_sa_status_as_json
 from info_provider.storm_gateway import StormGateway
 from tests.test_gateway import TestGateway
 from info_provider.storm_space_info_builder import SpaceInfoBuilder
@@ -142,5 +143,31 @@ class TestStorageService(unittest.TestCase):
         json.loads(report.to_json())
         logging.debug(report.to_json())
 
+    def test_report_shares_source(self):
+        configuration = get_default_test_configuration()
+        storm_gateway = get_default_storm_gateway()
+        def get_space_info(sa_token):
+            if sa_token in ["TAPE_TOKEN", "IGI_TOKEN"]:
+                raise URLError("Unable to reach backend")
+            return get_sa_status_as_json(sa_token)
+        def get_last_known_space_info(sa_token):
+            if sa_token == "IGI_TOKEN":
+                return get_sa_status_as_json(sa_token)
+            return None
+        storm_gateway.get_vfs_space_info = MagicMock(side_effect=get_space_info)
+        storm_gateway.get_last_known_vfs_space_info = MagicMock(
+            side_effect=get_last_known_space_info)
+        space_info = SpaceInfoBuilder(configuration, storm_gateway).build()
+        service = StorageServiceBuilder(configuration, space_info).build()
+        # the source is kept by the space info, the report schema is unchanged
+        sources = dict((vfs.get_token(), vfs.get_source())
+            for vfs in space_info.get_vfs().values())
+        self.assertEqual(sources["TAPE_TOKEN"], "configuration")
+        self.assertEqual(sources["IGI_TOKEN"], "last-known")
+        self.assertEqual(sources["TESTVO_TOKEN"], "backend")
+        report = json.loads(Report(storage_service=service).to_json())
+        for share in report["storageservice"]["storageshares"]:
+            self.assertFalse("source" in share)
+
 if __name__ == '__main__':
     unittest.main()